@@ -3,61 +3,591 @@
 # Standard Python libraries
 import json
 import io
+import re
+import codecs
+import mmap
+import sys
+import pickle
+import multiprocessing
 from pathlib import Path
 from copy import deepcopy
-from collections import OrderedDict
-from typing import Union, Optional, Any, Generator
+from functools import partial, lru_cache
+from itertools import chain
+from collections import OrderedDict, deque
+from typing import Union, Optional, Any, Generator, Iterable, Callable, Tuple
+from xml.parsers import expat
 
 # https://github.com/martinblech/xmltodict
 import xmltodict
 
 # Local imports
-from .uber_open_rmode import uber_open_rmode
+from .uber_open_rmode import uber_open_rmode, read_buffer
+from .parsepath import parsepath
+from .PathCursor import PathCursor
+from .KeyPath import KeyPath, compile_path
+from .Selector import Selector, compile_selector
+from .walk import walk_values, walk_items
+from .KeyIndex import INDEXES, KeyIndex, mark_modified, resolve_parent
+from .Query import Query
+from .flatpickle import flatten, unflatten, gc_paused
+from .DiskCache import DiskCache
+from . import json_backends
+from . import columns
 
-class DataModelDict(OrderedDict):
-    """Class for handling json/xml equivalent data structures."""
+# Patterns used to scan JSON content
+JSON_NONSPACE = re.compile(r'[^ \t\n\r]')
+JSON_STRUCTURE = re.compile(r'[{}\[\]"]')
+JSON_STRING_STOP = re.compile(r'["\\]')
+JSON_DELIMITERS = ' \t\n\r,:]}'
+
+# Pattern used to classify XML values.  Group 1 matches the ints that convert
+# back to the same str, group 2 matches floats written with digits, and the
+# empty last alternative matches text that int() and float() cannot parse by
+# its first characters.  Other values are left to int() and float().
+XML_VALUE = re.compile(r'(0|-?[1-9][0-9]*)\Z'
+                       r'|([-+]?(?:(?:[0-9]+\.[0-9]*|\.[0-9]+)(?:[eE][-+]?[0-9]+)?'
+                       r'|[0-9]+[eE][-+]?[0-9]+))\Z'
+                       r'|(?=[^\d\s+\-.iInN]|[iI](?![nN][fF])|[nN](?![aA][nN]))')
+
+def xml_postprocessor(convert_NaN:bool=True,
+                      types:Union[dict, Callable, None]=None):
+    """
+    Defines the xmltodict postprocessor function that converts XML values
+    when loading content.
+    
+    Parameters
+    ----------
+    convert_NaN : bool, optional
+        If True (default), the NaN, Infinity and -Infinity values written by
+        xml() are converted back to floats.
+    types : dict, callable or None, optional
+        Converters to use instead of inferring the types of values.  If a
+        callable, it is used for all values, and str leaves all values as
+        strings.  If a dict, its keys are element keys that match anywhere,
+        or paths given as tuples or dotted strings (without list indices)
+        from the top-level key, and its values are the converters.  Paths
+        take precedence over keys, and unmatched values are inferred.  The
+        converter bool accepts 'true', 'True', 'false' and 'False'.  If None
+        (default), all types are inferred.
+    
+    Returns
+    -------
+    function
+        The postprocessor function.
+    """
+    if convert_NaN is True:
+        parse_constant = {'': None,
+                          'True': True,
+                          'False': False,
+                          'true': True,
+                          'false': False,
+                          '-Infinity': float('-Inf'),
+                          'Infinity': float('Inf'),
+                          'NaN': float('NaN')}
+                          
+    elif convert_NaN is False:
+        parse_constant = {'': None,
+                          'True': True,
+                          'False': False}
+    
+    classify = XML_VALUE.match
+    
+    def postprocessor(path, key, value):
+        
+        # Return non-string terms
+        if not isinstance(value, str):
+            return key, value
+        
+        # Decode string contents
+        if '\\' in value:
+            value = value.replace('\\n', '\n')
+            value = value.replace('\\t', '\t')
+            value = value.replace('\\r', '\r')
+        
+        # Convert identified constants
+        if value in parse_constant:
+            return key, parse_constant[value]
+        
+        # Convert unsigned ints directly
+        if value.isdecimal() and value.isascii() and (value[0] != '0' or len(value) == 1):
+            try:
+                return key, int(value)
+            except ValueError:
+                # Too many digits for int()
+                pass
+        
+        # Return text as str and convert plainly written numbers directly
+        match = classify(value)
+        if match is not None:
+            if match.lastindex is None:
+                return key, value
+            elif match.lastindex == 2:
+                return key, float(value)
+            try:
+                return key, int(value)
+            except ValueError:
+                # Too many digits for int()
+                pass
+        
+        try:
+            # Try to convert to integer
+            intval = int(value)
+        except ValueError:
+            try:
+                # Try to return as float
+                return key, float(value)
+            except ValueError:
+                # Return unchanged as str
+                return key, value
+        else:
+            # Check if int of value is reversable back to str
+            if str(intval) == value:
+                # Return as int
+                return key, intval
+            else:
+                # Return unchanged as str
+                return key, value
+    
+    if types is None:
+        return postprocessor
+    
+    # Use one converter for all values
+    elif not isinstance(types, dict):
+        convert = xml_converter(types)
+        
+        def typed_postprocessor(path, key, value):
+            if not isinstance(value, str):
+                return key, value
+            value = xml_unescape(value)
+            if convert is None:
+                return key, value
+            return key, convert(value)
+        
+        return typed_postprocessor
+    
+    # Split converters into those for keys and those for paths
+    keytypes = {}
+    pathtypes = {}
+    for key, convert in types.items():
+        if isinstance(key, str) and '.' in key:
+            key = parsepath(key)
+        if isinstance(key, (tuple, list)):
+            pathtypes[tuple(key)] = xml_converter(convert)
+        else:
+            keytypes[key] = xml_converter(convert)
+    
+    missing = object()
+    
+    def mapped_postprocessor(path, key, value):
+        if not isinstance(value, str):
+            return key, value
+        
+        # Find the converter for the value's path, then its key
+        convert = missing
+        if len(pathtypes) > 0:
+            names = [name for name, attrs in path]
+            
+            # Elements are in their own path, but attributes and text are not
+            if len(names) == 0 or names[-1] != key:
+                names.append(key)
+            convert = pathtypes.get(tuple(names), missing)
+        if convert is missing:
+            convert = keytypes.get(key, missing)
+        
+        # Infer unmatched values
+        if convert is missing:
+            return postprocessor(path, key, value)
+        
+        value = xml_unescape(value)
+        if convert is None:
+            return key, value
+        return key, convert(value)
+    
+    return mapped_postprocessor
+
+def xml_unescape(value:str) -> str:
+    """Decodes the newlines, tabs and carriage returns escaped by xml()."""
+    if '\\' in value:
+        value = value.replace('\\n', '\n')
+        value = value.replace('\\t', '\t')
+        value = value.replace('\\r', '\r')
+    return value
+
+def xml_converter(convert:Callable) -> Optional[Callable]:
+    """
+    Gives the function that xml_postprocessor() uses for a converter: None
+    for str, as values are already strings, and parse_bool() for bool.
+    """
+    if convert is str:
+        return None
+    elif convert is bool:
+        return parse_bool
+    elif not callable(convert):
+        raise TypeError(f'converter {convert!r} is not callable')
+    return convert
+
+def converter_names(types:Union[tuple, Callable]) -> Optional[tuple]:
+    """
+    Gives the XML converters given to load() as module and qualified names,
+    which identify them in DiskCache keys the same way in every process.
+    
+    Parameters
+    ----------
+    types : tuple or callable
+        A converter, or the (key, converter) items of a dict of them.
+    
+    Returns
+    -------
+    tuple or None
+        The names in place of each converter, or None if a converter cannot
+        be found by its names, such as a lambda or a local function.
+    """
+    def name(convert):
+        module = getattr(convert, '__module__', None)
+        qualname = getattr(convert, '__qualname__', None)
+        if module is None or qualname is None or '<' in qualname:
+            return None
+        found = sys.modules.get(module)
+        for attr in qualname.split('.'):
+            found = getattr(found, attr, None)
+        if found is not convert:
+            return None
+        return (module, qualname)
+    
+    if callable(types):
+        return name(types)
+    names = tuple((key, name(convert)) for key, convert in types)
+    if any(convert is None for key, convert in names):
+        return None
+    return names
+
+def cache_options(cls:type, format:Optional[str]=None, types:Any=None) -> tuple:
+    """
+    Gives the options that load() keys cache entries with.  Loads of a
+    DataModelDict without format or types use no options, like
+    MemoryCache.load() does for the files it loads itself, so that both
+    share entries.
+    
+    Parameters
+    ----------
+    cls : type
+        The DataModelDict class loaded.
+    format : str or None, optional
+        The format given to load().
+    types : any, optional
+        The converters given to load(), as a hashable value.
+    
+    Returns
+    -------
+    tuple
+        The options.
+    """
+    if cls is DataModelDict and format is None and types is None:
+        return ()
+    return (cls.__module__, cls.__qualname__, format, types)
+
+def parse_bool(value:str) -> bool:
+    """Converts the bool values written by xml() and JSON."""
+    if value == 'true' or value == 'True':
+        return True
+    elif value == 'false' or value == 'False':
+        return False
+    raise ValueError(f'invalid bool value {value!r}')
+
+def parse_model(model:Union[str, bytes, Path, io.IOBase],
+                dict_constructor:type, format:Optional[str]=None,
+                use_mmap:bool=False, backend:Optional[str]=None,
+                types:Union[dict, Callable, None]=None) -> dict:
+    """
+    Parses XML or JSON content into a tree.  See DataModelDict.load().
+    
+    Parameters
+    ----------
+    model : str, bytes, Path or file-like object
+        The XML or JSON content to read.  Any input supported by
+        uber_open_rmode is allowed.
+    dict_constructor : type
+        The dict or OrderedDict subclass to build the tree's elements with.
+    format : str or None, optional
+        The format of the content ('xml' or 'json').  If None (default), it
+        is identified from the first character of the content.
+    use_mmap : bool, optional
+        If True and model is a file path, the file is memory-mapped.
+        Default value is False.
+    backend : str or None, optional
+        The library to decode JSON content with.
+    types : dict, callable or None, optional
+        Converters for XML values.  See xml_postprocessor().
+    
+    Returns
+    -------
+    dict
+        The top-level element, built with dict_constructor.
+    
+    Raises
+    ------
+    ValueError
+        If format is None and unable to identify XML/JSON content, or if
+        format is not equal to 'xml' or 'json'.
+    """
+    # Read contents
+    with uber_open_rmode(model, use_mmap=use_mmap, peekable=True) as model:
+        
+        # If format is not specified, identify from first character
+        if format is None:
+            
+            # Peek at buffered content, only reading past leading whitespace
+            test = b''
+            while test == b'':
+                head = model.peek(1)
+                if head == b'':
+                    break
+                stripped = head.lstrip()
+                model.read(len(head) - len(stripped))
+                test = stripped[:1]
+            if test == b'{':
+                format = 'json'
+            elif test == b'<':
+                format = 'xml'
+            else:
+                raise ValueError('could not identify content - give path as pathlib.Path and/or specify format')
+        
+        # Load json using the selected backend, decoding buffers in place
+        if format.lower() == 'json':
+            with read_buffer(model) as content:
+                return json_backends.loads(content,
+                                           dict_constructor = dict_constructor,
+                                           backend = backend)
+        
+        # Load xml using xmltodict package
+        elif format.lower() == 'xml':
+            
+            # xmltodict reads keys back while building elements, so path
+            # strings are turned off until the tree is built
+            if getattr(dict_constructor, 'string_paths', False):
+                tree = xmltodict.parse(model,
+                                       postprocessor = xml_postprocessor(types=types),
+                                       dict_constructor = keys_only(dict_constructor))
+                return restore_class(tree, dict_constructor)
+            
+            return xmltodict.parse(model,
+                                   postprocessor = xml_postprocessor(types=types),
+                                   dict_constructor = dict_constructor)
+        
+        else:
+            raise ValueError(f"invalid format '{format}'")
+
+@lru_cache(maxsize=None)
+def keys_only(cls:type) -> type:
+    """
+    Gives a subclass of a DataModelDict class with string_paths turned off
+    and the same instance layout, so that its elements can be converted to
+    cls with restore_class().
+    """
+    return type(cls.__name__, (cls,), {'__slots__': (), 'string_paths': False})
+
+def restore_class(tree:Any, cls:type) -> Any:
+    """
+    Changes the class of the elements of a tree built with keys_only(cls) to
+    cls in place.
+    
+    Parameters
+    ----------
+    tree : any
+        The tree, or a value.
+    cls : type
+        The class to give the elements.
+    
+    Returns
+    -------
+    any
+        The tree.
+    """
+    loader = keys_only(cls)
+    stack = [tree]
+    while len(stack) > 0:
+        value = stack.pop()
+        if isinstance(value, dict):
+            if type(value) is loader:
+                value.__class__ = cls
+            stack.extend(dict.values(value))
+        elif isinstance(value, list):
+            stack.extend(value)
+    return tree
+
+def load_plain(path:Union[str, Path], format:Optional[str]=None,
+               backend:Optional[str]=None) -> tuple:
+    """
+    Parses a file into plain dicts and lists for load_many().  Any error is
+    returned rather than raised so that one bad file does not stop the rest.
+    
+    Returns
+    -------
+    path : str or Path
+        The path, for matching results that arrive out of order.
+    tree : dict or None
+        The parsed content, or None if it could not be loaded.
+    error : Exception or None
+        The error raised while loading, or None if successful.
+    """
+    try:
+        return path, parse_model(path, dict, format=format, backend=backend), None
+    except Exception as err:
+        
+        # Errors that cannot be sent between processes are replaced
+        try:
+            pickle.dumps(err)
+        except Exception:
+            err = RuntimeError(f'{type(err).__name__}: {err}')
+        return path, None, err
+
+class ChunkedWriter(io.TextIOBase):
+    """
+    Text stream that collects written str content and passes it on to
+    another stream in large chunks.  Binary streams are given the content
+    encoded.
+    """
+    
+    def __init__(self, fp:Any, encoding:str='utf-8', chunksize:int=65536):
+        """
+        Parameters
+        ----------
+        fp : file-like object
+            The text or binary stream to write to.
+        encoding : str, optional
+            The encoding used for binary streams.  Default value is 'utf-8'.
+        chunksize : int, optional
+            The number of characters collected before writing to fp.
+            Default value is 65536.
+        """
+        self.__fp = fp
+        self.__binary = not isinstance(fp, (io.TextIOBase, codecs.StreamWriter,
+                                            codecs.StreamReaderWriter))
+        self.__encoding = encoding
+        self.__chunksize = chunksize
+        self.__chunk = []
+        self.__size = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, content:str) -> int:
+        self.__chunk.append(content)
+        self.__size += len(content)
+        if self.__size >= self.__chunksize:
+            self.__write_chunk()
+        return len(content)
+    
+    def flush(self):
+        """Writes any collected content and flushes fp."""
+        self.__write_chunk()
+        if hasattr(self.__fp, 'flush'):
+            self.__fp.flush()
+    
+    def __write_chunk(self):
+        """Writes the collected content to fp."""
+        if self.__size > 0:
+            content = ''.join(self.__chunk)
+            if self.__binary:
+                content = content.encode(self.__encoding, 'xmlcharrefreplace')
+            self.__fp.write(content)
+            self.__chunk = []
+            self.__size = 0
+
+class BaseDataModelDict():
+    """
+    Methods for handling json/xml equivalent data structures, which are
+    combined with a dict type by DataModelDict and CompactDataModelDict.
+    """
+    __slots__ = ()
+    
+    # If True, str keys containing '.' or '[' that are not keys of an element
+    # are parsed as path strings when reading with [] and get(), e.g.
+    # model['a.b[2].c'].  Keys are always set and deleted as given, so that
+    # parsers building elements keep dotted names as keys.  Set on a class to
+    # enable it for all its elements.
+    string_paths = False
     
     def __init__(self, *args, **kwargs):
         """
         Initializes a DataModelDict.
         If one args is given and it is a str or file-like object, then load()
         is called.
-        Otherwise, the OrderedDict initializer is called.
+        Otherwise, the dict type's initializer is called.
         
         Parameters
         ----------
         args
             If one args is given which is a str or file-like object, then
             self.load(args[0], **kwargs) is called.  Otherwise, the
-            DataModelDict is initialized like an OrderedDict.
+            DataModelDict is initialized like its dict type.
         kwargs
             Variable keyword arguments. Passed on to either self.load() or
-            self.update(), which is inherited from OrderedDict.
+            self.update().
         
         Returns
         -------
         DataModelDict
         """
-        # Initialize self as OrderedDict
-        OrderedDict.__init__(self)
+        # Initialize self as the dict type
+        super().__init__()
         
         # Call load for supported types
-        if len(args) == 1 and isinstance(args[0], (str, bytes, Path, io.IOBase)):
+        if len(args) == 1 and isinstance(args[0], (str, bytes, bytearray, memoryview,
+                                                  mmap.mmap, Path, io.IOBase)):
             self.load(args[0], **kwargs)
         
-        # Otherwise, call update (from OrderedDict)
+        # Otherwise, call update
         else:
             self.update(*args, **kwargs)
     
-    def __getitem__(self, key:Union[str, list]) -> Any:
+    def __reduce_ex__(self, protocol:int) -> tuple:
         """
-        Extends OrderedDict.__getitem__() to handle path lists as keys.
+        Pickles the tree as a few flat buffers rather than element by element.
+        See flatten().
+        """
+        args = flatten(self)
+        if args is None:
+            return super().__reduce_ex__(protocol)
+        return unflatten, args, getattr(self, '__dict__', None) or None
+    
+    def __copy__(self) -> 'BaseDataModelDict':
+        """Makes a shallow copy, which would otherwise use __reduce_ex__()."""
+        new = self.copy()
+        state = getattr(self, '__dict__', None)
+        if state:
+            new.__dict__.update(state)
+        return new
+    
+    def __deepcopy__(self, memo:dict) -> 'BaseDataModelDict':
+        """
+        Makes a deep copy element by element, which would otherwise use
+        __reduce_ex__().  The memo is used for every element and list, so
+        values that are also referred to from outside the tree keep their
+        identity.
+        """
+        cls = type(self)
+        new = cls.__new__(cls)
+        memo[id(self)] = new
+        setitem = json_backends.base_setitem(cls)
+        for key, value in self.items():
+            setitem(new, deepcopy(key, memo), deepcopy(value, memo))
+        
+        state = getattr(self, '__dict__', None)
+        if state:
+            new.__dict__.update(deepcopy(state, memo))
+        return new
+    
+    def __getitem__(self, key:Union[str, list, KeyPath]) -> Any:
+        """
+        Extends dict.__getitem__() to handle path lists, KeyPaths and, if
+        string_paths is enabled, path strings as keys.
         
         Parameters
         ----------
-        key : str or list
-            Dictionary key.  If key is a list, then subsequent keys down the
-            structure are accessed.
+        key : str, list or KeyPath
+            Dictionary key.  If key is a list or KeyPath, then subsequent keys
+            down the structure are accessed.
         
         Returns
         -------
@@ -65,38 +595,111 @@ class DataModelDict(OrderedDict):
             The value of the element associated with key or the path list.
         """
         # Handle path keys
-        if isinstance(key, list):
+        if isinstance(key, (list, KeyPath)):
             value = self
-            keys = deepcopy(key)
-            while len(keys) > 0:
-                value = value[keys.pop(0)]
+            for k in key:
+                value = value[k]
             return value
         
-        else:
-            return OrderedDict.__getitem__(self, key)
+        try:
+            return dict.__getitem__(self, key)
+        except KeyError:
+            path = self.__string_path(key) if self.string_paths else None
+            if path is None:
+                raise
+            return self[path]
     
-    def __setitem__(self, key:Union[str, list], value:Any):
+    def __setitem__(self, key:Union[str, list, KeyPath], value:Any):
         """
-        Extends OrderedDict.__setitem__() to handle path lists as keys.
+        Extends __setitem__() to handle path lists and KeyPaths as keys.
         
         Parameters
         ----------
-        key : str or list
-            Dictionary key.  If key is a list, then subsequent keys down the
-            structure are accessed.
+        key : str, list or KeyPath
+            Dictionary key.  If key is a list or KeyPath, then subsequent keys
+            down the structure are accessed.
         value : any
             The value to set.
         """
         # Handle path keys
-        if isinstance(key, list):
-            term = self
-            keys = deepcopy(key)
-            while len(keys) > 1:
-                term = term[keys.pop(0)]
-            term[keys[0]] = value
+        if not isinstance(key, (list, KeyPath)):
+            mark_modified(self)
+            return super().__setitem__(key, value)
         
-        else:
-            return OrderedDict.__setitem__(self, key, value)
+        term, holder = resolve_parent(self, key)
+        if isinstance(term, list):
+            mark_modified(holder)
+        term[key[-1]] = value
+    
+    def __delitem__(self, key:Union[str, list, KeyPath]):
+        """
+        Extends __delitem__() to handle path lists and KeyPaths as keys.
+        
+        Parameters
+        ----------
+        key : str, list or KeyPath
+            Dictionary key.  If key is a list or KeyPath, then subsequent keys
+            down the structure are accessed.
+        """
+        # Handle path keys
+        if not isinstance(key, (list, KeyPath)):
+            mark_modified(self)
+            return super().__delitem__(key)
+        
+        term, holder = resolve_parent(self, key)
+        if isinstance(term, list):
+            mark_modified(holder)
+        del term[key[-1]]
+    
+    def get(self, key:Union[str, list, KeyPath], default:Any=None) -> Any:
+        """
+        Extends get() to handle path lists, KeyPaths and, if string_paths is
+        enabled, path strings as keys.
+        
+        Parameters
+        ----------
+        key : str, list or KeyPath
+            Dictionary key.  If key is a list or KeyPath, then subsequent keys
+            down the structure are accessed.
+        default : any, optional
+            The value returned if there is no value for key.  Default value
+            is None.
+        
+        Returns
+        -------
+        any
+            The value of the element associated with key or the path list, or
+            default.
+        """
+        if isinstance(key, (list, KeyPath)) or (self.string_paths and
+                                                 self.__string_path(key) is not None):
+            try:
+                return self[key]
+            except (KeyError, IndexError, TypeError):
+                return default
+        return super().get(key, default)
+    
+    def __string_path(self, key:Any) -> Optional[KeyPath]:
+        """
+        Internal method that gives the KeyPath for a key that is a path
+        string, or None for other keys.  Keys are path strings if they are str
+        containing '.' or '[' and are not keys of self.  Only used when
+        string_paths is enabled.
+        """
+        if (isinstance(key, str) and ('.' in key or '[' in key)
+            and not dict.__contains__(self, key)):
+            return compile_path(key)
+        return None
+    
+    def pop(self, *args):
+        """Extends pop() to keep any key index current."""
+        mark_modified(self)
+        return super().pop(*args)
+    
+    def clear(self):
+        """Extends clear() to keep any key index current."""
+        mark_modified(self)
+        super().clear()
     
     def append(self, key:str, value:Any):
         """
@@ -114,6 +717,7 @@ class DataModelDict(OrderedDict):
         if key in self:            
             if isinstance(self[key], list):
                 # Append new value to existing list
+                mark_modified(self)
                 self[key].append(value)
             else:
                 # Convert existing value to list and append new value
@@ -123,15 +727,102 @@ class DataModelDict(OrderedDict):
             # Set new value
             self[key] = value
     
-    def find(self, key:str, yes:dict={}, no:dict={}) ->Any:
+    def extend(self, key:str, values:Iterable):
+        """
+        Adds multiple values for element key, giving the same result as
+        calling append() for each value but attaching them all at once.
+        
+        Parameters
+        ----------
+        key : str
+            The dictionary key.
+        values : iterable
+            The values to add to the dictionary key.
+        """
+        values = list(values)
+        if len(values) == 0:
+            return
+        
+        if key not in self:
+            # A single value, or a first value that is a list, is set as is
+            if len(values) == 1 or isinstance(values[0], list):
+                self[key] = values[0]
+                values = values[1:]
+            else:
+                self[key] = values
+                return
+        
+        current = dict.__getitem__(self, key)
+        if isinstance(current, list):
+            # Extend the existing list
+            mark_modified(self)
+            current.extend(values)
+        elif len(values) > 0:
+            # Convert existing value to list and add the new values
+            values.insert(0, current)
+            self[key] = values
+    
+    def from_columns(self, key:str, fields:dict):
+        """
+        Builds one subelement for each row of columns of values and adds
+        them for element key as with extend().  The subelements are built
+        together rather than one at a time.
+        
+        Parameters
+        ----------
+        key : str
+            The dictionary key.
+        fields : dict
+            Maps the path of each field within the subelements, as a tuple of
+            keys or a path string that is parsed using parsepath(), to a list
+            or array of its values.  NumPy arrays are converted to Python
+            values.
+        
+        Raises
+        ------
+        ValueError
+            If the columns differ in length, a path is empty or has list
+            indices, or a path is given twice or inside another field.
+        """
+        with gc_paused():
+            records = columns.build_records(type(self), fields)
+        self.extend(key, records)
+    
+    def build_index(self):
+        """
+        Builds an index of the paths and values for all keys at any level so
+        that the find, finds, path, paths, iterfinds and iterpaths methods
+        look up their matching subelements rather than searching the whole
+        structure.  Changes made through DataModelDict methods, such as
+        item assignment, append and del, mark the index as outdated and it is
+        rebuilt on its next use.  Changes made directly to list values or to
+        other dict types are not detected: call build_index() again after
+        making them.
+        """
+        index = INDEXES.get(id(self))
+        if index is None or index.root() is not self:
+            index = INDEXES[id(self)] = KeyIndex(self)
+        index.build()
+    
+    def drop_index(self):
+        """
+        Removes the index created by build_index(), if any.
+        """
+        index = INDEXES.get(id(self))
+        if index is not None and index.root() is self:
+            index.invalidate()
+            del INDEXES[id(self)]
+    
+    def find(self, key:Union[str, Query], yes:dict={}, no:dict={}) ->Any:
         """
         Return the value of a subelement at any level uniquely identified by
         the specified conditions.
         
         Parameters
         ----------
-        key : str
-            Dictionary key to search for.
+        key : str or Query
+            Dictionary key to search for, or a query from compile_query() in
+            which case yes and no must be empty.
         yes : dict
             Key-value terms which the subelement must have to be considered a
             match.
@@ -177,7 +868,7 @@ class DataModelDict(OrderedDict):
         """
         return [val for val in self.iteraslist(key)]
     
-    def path(self, key:str, yes:dict={}, no:dict={})->list:
+    def path(self, key:Union[str, Query], yes:dict={}, no:dict={})->list:
         """
         Return the path list of a subelement at any level uniquely identified
         by the specified conditions. Issues an error if either no match, or
@@ -185,8 +876,9 @@ class DataModelDict(OrderedDict):
         
         Parameters
         ----------
-        key : str
-            Dictionary key to search for.
+        key : str or Query
+            Dictionary key to search for, or a query from compile_query() in
+            which case yes and no must be empty.
         yes : dict
             Key-value terms which the subelement must have to be considered a
             match.
@@ -196,7 +888,7 @@ class DataModelDict(OrderedDict):
             
         Returns
         -------
-        list of str
+        PathCursor
             The subelement path list to the uniquely identified subelement.
         
         Raises
@@ -214,15 +906,16 @@ class DataModelDict(OrderedDict):
         else:
             raise ValueError('Multiple matching subelements found for key (and kwargs).')
     
-    def finds(self, key:str, yes:dict={}, no:dict={})->list:
+    def finds(self, key:Union[str, Query], yes:dict={}, no:dict={})->list:
         """
         Finds the values of all subelements at any level identified by the
         specified conditions.
         
         Parameters
         ----------
-        key : str
-            Dictionary key to search for.
+        key : str or Query
+            Dictionary key to search for, or a query from compile_query() in
+            which case yes and no must be empty.
         yes : dict
             Key-value terms which the subelement must have to be considered a
             match.
@@ -237,15 +930,16 @@ class DataModelDict(OrderedDict):
         """
         return [val for val in self.iterfinds(key, yes, no)] 
     
-    def paths(self, key:str, yes:dict={}, no:dict={})->list:
+    def paths(self, key:Union[str, Query], yes:dict={}, no:dict={})->list:
         """
         Return a list of all path lists of all elements at any level
         identified by the specified conditions.
                
         Parameters
         ----------
-        key : str
-            Dictionary key to search for.
+        key : str or Query
+            Dictionary key to search for, or a query from compile_query() in
+            which case yes and no must be empty.
         yes : dict
             Key-value terms which the subelement must have to be considered a
             match.
@@ -255,7 +949,7 @@ class DataModelDict(OrderedDict):
         
         Returns
         -------
-        list 
+        list of PathCursor
             The path lists for any matching subelements.
         """
         return [val for val in self.iterpaths(key, yes, no)]
@@ -283,15 +977,17 @@ class DataModelDict(OrderedDict):
             else:
                 yield self[key]
     
-    def iterfinds(self, key:str, yes:dict={}, no:dict={}) -> Generator[Any, None, None]:
+    def iterfinds(self, key:Union[str, Query], yes:dict={}, no:dict={}
+                  ) -> Generator[Any, None, None]:
         """
         Iterates over the values of all subelements at any level identified by
         the specified conditions.
         
         Parameters
         ----------
-        key : str
-            Dictionary key to search for.
+        key : str or Query
+            Dictionary key to search for, or a query from compile_query() in
+            which case yes and no must be empty.
         yes : dict
             Key-value terms which the subelement must have to be considered a
             match.
@@ -304,59 +1000,34 @@ class DataModelDict(OrderedDict):
         any
             The values of any matching subelements.
         """
+        query = self.__as_query(key, yes, no)
+        
+        # Searches without an index only need the values
+        if id(self) not in INDEXES:
+            if len(query.yes) == 0 and len(query.no) == 0:
+                yield from walk_values(self, query.key)
+            else:
+                yield from filter(query.match, walk_values(self, query.key))
+            return
         
         # Iterate over list of all subelements given by key
-        for subelement in self.__gen_dict_value(key, self):
-            match = True
-            
-            # Iterate over all key, value pairs in yes
-            for yes_key, yes_value in yes.items():
-                key_match = False
-                
-                # Iterate over list of all values associated with kwarg_key
-                # in the subelement
-                for value in self.__gen_dict_value(yes_key, subelement):
-                    if value == yes_value:
-                        key_match = True
-                        break
-                
-                # If a kwarg_key-kwarg_value match is not found, then the
-                # subelement is not a match
-                if not key_match:
-                    match = False
-                    break
-            
-            # Iterate over all key, value pairs in no
-            if match:
-                for no_key, no_value in no.items():
-                    key_match = True
-                    
-                    # Iterate over list of all values associated with
-                    # kwarg_key in the subelement
-                    for value in self.__gen_dict_value(no_key, subelement):
-                        if value == no_value:
-                            key_match = False
-                            break
-                    
-                    # If a kwarg_key-kwarg_value match is not found, then the
-                    # subelement is not a match
-                    if not key_match:
-                        match = False
-                        break
+        for k, path, parent, subelement in self.__gen_keys_matches((query.key,), False):
             
-            # If match is still true, yield subelement
-            if match:
+            # If the conditions are met, yield subelement
+            if query.match(subelement):
                 yield subelement
     
-    def iterpaths(self, key:str, yes:dict={}, no:dict={})-> Generator[list, None, None]:
+    def iterpaths(self, key:Union[str, Query], yes:dict={}, no:dict={}
+                  ) -> Generator[list, None, None]:
         """
         Iterates over the path lists to all elements at any level identified
         by the specified conditions.
         
         Parameters
         ----------
-        key : str
-            Dictionary key to search for.
+        key : str or Query
+            Dictionary key to search for, or a query from compile_query() in
+            which case yes and no must be empty.
         yes : dict
             Key-value terms which the subelement must have to be considered a
             match.
@@ -366,53 +1037,240 @@ class DataModelDict(OrderedDict):
         
         Yields
         ------
-        list of str
-            The path lists to any matching subelements.
+        PathCursor
+            The path lists to any matching subelements.  Each is a list that
+            also refers directly to the container of the subelement.
         """
+        query = self.__as_query(key, yes, no)
         
         # Iterate over list of all subelements given by key
-        for path in self.__gen_dict_path(key, self):
-            subelement = self[path]
-            match = True
-            
-            # Iterate over all key, value pairs in yes
-            for yes_key, yes_value in yes.items():
-                key_match = False
-                
-                # Iterate over list of all values associated with kwarg_key in
-                # the subelement
-                for value in self.__gen_dict_value(yes_key, subelement):
-                    if value == yes_value:
-                        key_match = True
-                        break
-                
-                # If a kwarg_key-kwarg_value match is not found, then the
-                # subelement is not a match
-                if not key_match:
-                    match = False
-                    break
+        for k, path, parent, subelement in self.__gen_keys_matches((query.key,), True):
             
-            # Iterate over all key, value pairs in no
-            if match:
-                for no_key, no_value in no.items():
-                    key_match = True
-                    
-                    # Iterate over list of all values associated with
-                    # kwarg_key in the subelement
-                    for value in self.__gen_dict_value(no_key, subelement):
-                        if value == no_value:
-                            key_match = False
-                            break
-                    
-                    # If a kwarg_key-kwarg_value match is not found, then the
-                    # subelement is not a match
-                    if not key_match:
-                        match = False
-                        break
-           
-            # If match is still true, yield path
-            if match:
-                yield path
+            # If the conditions are met, yield path
+            if query.match(subelement):
+                yield PathCursor(self, path, parent)
+    
+    def finds_many(self, queries:dict) -> dict:
+        """
+        Finds the values of all subelements at any level for multiple keys
+        with a single search through the structure.
+        
+        Parameters
+        ----------
+        queries : dict
+            Maps each dictionary key to search for to its conditions, given as
+            a (yes, no) tuple of dicts, a Query from compile_query(), or None
+            for no conditions.
+        
+        Returns
+        -------
+        dict
+            Maps each key in queries to the list of values of its matching
+            subelements.
+        """
+        queries = self.__as_queries(queries)
+        results = {key: [] for key in queries}
+        for key, path, parent, subelement in self.__gen_keys_matches(queries, False):
+            if queries[key].match(subelement):
+                results[key].append(subelement)
+        return results
+    
+    def paths_many(self, queries:dict) -> dict:
+        """
+        Finds the path lists of all subelements at any level for multiple
+        keys with a single search through the structure.
+        
+        Parameters
+        ----------
+        queries : dict
+            Maps each dictionary key to search for to its conditions, given as
+            a (yes, no) tuple of dicts, a Query from compile_query(), or None
+            for no conditions.
+        
+        Returns
+        -------
+        dict
+            Maps each key in queries to the list of PathCursors of its
+            matching subelements.
+        """
+        queries = self.__as_queries(queries)
+        results = {key: [] for key in queries}
+        for key, path, parent, subelement in self.__gen_keys_matches(queries, True):
+            if queries[key].match(subelement):
+                results[key].append(PathCursor(self, path, parent))
+        return results
+    
+    def to_columns(self, key:Union[str, Query], fields:dict,
+                   dtypes:Optional[dict]=None, fill:Optional[dict]=None,
+                   yes:dict={}, no:dict={}, structured:bool=False
+                   ) -> Union[dict, 'numpy.ndarray']:
+        """
+        Collects values from all subelements at any level identified by the
+        specified conditions into NumPy arrays, with one column per field.
+        Requires NumPy.
+        
+        Parameters
+        ----------
+        key : str or Query
+            Dictionary key to search for, or a query from compile_query() in
+            which case yes and no must be empty.
+        fields : dict
+            Maps column names to the paths of values within each subelement,
+            as path lists or path strings that are parsed using parsepath().
+        dtypes : dict or None, optional
+            Maps column names to dtypes.  Columns not given are bool, int,
+            float or str if all values have that type, float if they are
+            ints and floats, and object otherwise.
+        fill : dict or None, optional
+            Maps column names to the values used for subelements that are
+            missing the field.  Columns not given use NaN if all other values
+            are numbers and the dtype is not given, and None otherwise.
+        yes : dict
+            Key-value terms which the subelement must have to be considered a
+            match.
+        no : dict
+            Key-value terms which the subelement must not have to be
+            considered a match.
+        structured : bool, optional
+            If True, a structured array is returned rather than a dict of
+            arrays.  Default value is False.
+        
+        Returns
+        -------
+        dict or numpy.ndarray
+            Maps column names to arrays, or the structured array.
+        
+        Raises
+        ------
+        ImportError
+            If NumPy is not installed.
+        """
+        columns.require_numpy()
+        paths = columns.field_paths(fields)
+        dtypes = {} if dtypes is None else dtypes
+        fill = {} if fill is None else fill
+        
+        # Find the subelements, then collect each field level by level
+        elements = list(self.iterfinds(key, yes, no))
+        results = {}
+        for name, path in paths.items():
+            values = columns.column_values(elements, path)
+            results[name] = columns.column_array(values, dtypes.get(name),
+                                                 fill.get(name, columns.MISSING))
+        
+        if structured:
+            return columns.structured_array(results)
+        return results
+    
+    def iterrows(self, key:Union[str, Query], fields:Union[list, dict],
+                 yes:dict={}, no:dict={}, fill:Any=None
+                 ) -> Generator[tuple, None, None]:
+        """
+        Iterates over all subelements at any level identified by the
+        specified conditions, yielding a tuple of field values for each.
+        Subelements are handled one at a time as they are found, so rows can
+        be streamed to a writer without collecting them first.
+        
+        Parameters
+        ----------
+        key : str or Query
+            Dictionary key to search for, or a query from compile_query() in
+            which case yes and no must be empty.
+        fields : list or dict
+            The paths of the values within each subelement, as path lists or
+            path strings that are parsed using parsepath().  If a dict, its
+            values are the paths.
+        yes : dict
+            Key-value terms which the subelement must have to be considered a
+            match.
+        no : dict
+            Key-value terms which the subelement must not have to be
+            considered a match.
+        fill : any, optional
+            The value given for fields that a subelement is missing.  Default
+            value is None.
+        
+        Yields
+        ------
+        tuple
+            The field values of a matching subelement, in the order of fields.
+        """
+        if isinstance(fields, dict):
+            fields = list(fields.values())
+        getters = [columns.field_getter(path, fill)
+                   for path in columns.field_paths(dict(enumerate(fields))).values()]
+        
+        for subelement in self.iterfinds(key, yes, no):
+            yield tuple([get(subelement) for get in getters])
+    
+    @staticmethod
+    def compile_query(key:str, yes:dict={}, no:dict={}) -> Query:
+        """
+        Compiles search conditions into a reusable Query.  Each candidate
+        subelement is then checked in a single pass that stops as soon as
+        the outcome is known, rather than once for each condition.
+        
+        Parameters
+        ----------
+        key : str
+            Dictionary key to search for.
+        yes : dict
+            Key-value terms which the subelement must have to be considered a
+            match.
+        no : dict
+            Key-value terms which the subelement must not have to be
+            considered a match.
+        
+        Returns
+        -------
+        Query
+            The compiled query, which can be run on any DataModelDict or
+            given as the key to the find, finds, path, paths, iterfinds and
+            iterpaths methods.
+        """
+        return Query(key, yes, no)
+    
+    def select(self, pattern:Union[str, Selector]
+               ) -> Generator[Tuple[KeyPath, Any], None, None]:
+        """
+        Iterates over the values at the paths matching a wildcard pattern.
+        Unlike finds(), only the branches that can match the pattern are
+        walked.
+        
+        Parameters
+        ----------
+        pattern : str or Selector
+            A path string that can use the wildcards '*' for any key, '[*]'
+            for every item of a list (or a value that is not a list), and
+            '**' for any number of levels, e.g.
+            'my-data-model.measurement[*].temperature.value'.  Compiled
+            patterns are cached.  See Selector.
+        
+        Yields
+        ------
+        tuple
+            The KeyPath of each matching value and the value, in the order
+            they appear in the structure.
+        """
+        if not isinstance(pattern, Selector):
+            pattern = compile_selector(pattern)
+        yield from pattern.iterrun(self)
+    
+    def cursor(self, path:Union[str, list]) -> PathCursor:
+        """
+        Creates a PathCursor for repeated access to the element at path.
+        
+        Parameters
+        ----------
+        path : str or list
+            The path list, or a path string that is parsed using parsepath().
+        
+        Returns
+        -------
+        PathCursor
+            The path list with a direct reference to the element's container.
+        """
+        return PathCursor(self, path)
     
     def itervaluepaths(self):
         """
@@ -423,12 +1281,12 @@ class DataModelDict(OrderedDict):
         list
             The path lists to all value subelements.
         """
-        
-        # Iterate over list of all subelements given by key
-        for path in self.__gen_dict_valuepath(self):
-            yield path
+        return self.__gen_dict_valuepath(self)
     
-    def load(self, model:Union[str, io.IOBase], format:Optional[str]=None):
+    def load(self, model:Union[str, io.IOBase], format:Optional[str]=None,
+             use_mmap:bool=False, backend:Optional[str]=None,
+             cache:Union[str, Path, DiskCache, 'MemoryCache', None]=None,
+             types:Union[dict, Callable, None]=None):
         """
         Read in values from a json/xml string or file-like object.
         
@@ -436,58 +1294,223 @@ class DataModelDict(OrderedDict):
         ----------
         model : str or file-like object
             The XML or JSON content to read.  This is allowed to be either a
-            file path, a string representation, or an open file-like object in
-            byte mode.
+            file path, a string representation, a bytes-like buffer, or an
+            open file-like object in byte mode.  File-like objects do not
+            need to be seekable, so pipes and sockets can be read from.
         format : str or None, optional
             Allows for the format of the content to be explicitly stated
             ('xml' or 'json').  If None (default), will try to determine which
             format based on if the first character of model is '<' or '{'.
+        use_mmap : bool, optional
+            If True and model is a file path, the file is memory-mapped rather
+            than read into a buffer.  Default value is False.
+        backend : str or None, optional
+            The library to decode JSON content with: 'json' or 'orjson'.  If
+            None (default), the backend set with set_json_backend() is used.
+            All backends give the same values.
+        cache : str, Path, DiskCache, MemoryCache or None, optional
+            A DiskCache, or the directory of one, or a MemoryCache to keep a
+            snapshot of the parsed content in when model is a file path.
+            Later loads of the unchanged file with the same options use the
+            snapshot rather than parsing the file again.  A DiskCache is not
+            used if types has converters that cannot be imported by name, such
+            as lambdas.  A MemoryCache gives load() an independent copy, as
+            the content is added to this DataModelDict.  For read-only views
+            that avoid copying, use MemoryCache.load(model, readonly=True),
+            which shares entries with loads of the same file without format
+            or types.  If None (default), no cache is used.
+        types : dict, callable or None, optional
+            Converters for XML values that skip inferring their types, for
+            values such as IDs that look like numbers, or for faster loading
+            of known content.  A dict maps element keys, or paths given as
+            tuples or dotted strings without list indices, to converters
+            such as int, float, str, bool or any callable taking a str.
+            Unmapped values are inferred as usual.  A single converter is
+            used for all values, so str leaves all values as strings.  JSON
+            values are typed by the content and are not affected.  If None
+            (default), all types are inferred.
         
         Raises
         ------
         ValueError
             If format is None and unable to identify XML/JON content, or if
-            format is not equal to 'xml' or 'json'.
+            format is not equal to 'xml' or 'json', or if a converter fails.
+        """
+        
+        parse = partial(parse_model, model, type(self), format=format,
+                        use_mmap=use_mmap, backend=backend, types=types)
+        
+        # Check if model is a file path that can be cached
+        if cache is not None:
+            try:
+                is_file = isinstance(model, (str, Path)) and Path(model).is_file()
+            except (OSError, ValueError):
+                is_file = False
+            if is_file:
+                if isinstance(cache, (str, Path)):
+                    cache = DiskCache(cache)
+                if isinstance(types, dict):
+                    types = tuple(types.items())
+                
+                # Converters are named in disk cache keys, as their reprs
+                # change between processes.  Unnamed converters are not cached
+                if isinstance(cache, DiskCache) and types is not None:
+                    types = converter_names(types)
+                    if types is None:
+                        cache = None
+                if cache is not None:
+                    options = cache_options(type(self), format, types)
+                    self.update(cache.load(model, parse, options))
+                    return
+        
+        self.update(parse())
+    
+    @classmethod
+    def iterload(cls, model:Union[str, bytes, Path, io.IOBase],
+                 path:Union[str, list], format:Optional[str]=None,
+                 chunksize:int=65536, use_mmap:bool=False
+                 ) -> Generator[Any, None, None]:
         """
+        Iterates over the repeated elements at path within JSON or XML
+        content without building the full tree.  The content is read in
+        fixed-size chunks and each record is yielded as soon as it has been
+        completely read, then discarded.  Records are converted the same way
+        as with load().
+        
+        Parameters
+        ----------
+        model : str, bytes, Path or file-like object
+            The XML or JSON content to read.  Any input supported by
+            uber_open_rmode is allowed.
+        path : str or list
+            The path to the repeated element, starting with the root element,
+            i.e. ['my-data-model', 'measurement'].  A str path is parsed
+            using parsepath().  For JSON, the path may contain list indices
+            and may be empty to iterate over a top-level array.
+        format : str or None, optional
+            Allows for the format of the content to be explicitly stated
+            ('xml' or 'json').  If None (default), will try to determine which
+            format based on if the first character of model is '<', or '{' or
+            '['.
+        chunksize : int, optional
+            The number of bytes read from model at a time.  Default value is
+            65536.
+        use_mmap : bool, optional
+            If True and model is a file path, the file is memory-mapped rather
+            than read through a buffered file.  Default value is False.
+        
+        Yields
+        ------
+        DataModelDict or any
+            The value of each element found at path.  If the value at path is
+            a list, each item is yielded separately.
         
-        # Read contents
-        with uber_open_rmode(model) as model:
+        Raises
+        ------
+        ValueError
+            If the path is not valid for the format, if format is None and
+            unable to identify XML/JSON content, or if format is not equal to
+            'xml' or 'json'.
+        """
+        if isinstance(path, str):
+            path = parsepath(path)
+        path = list(path)
+        
+        with uber_open_rmode(model, use_mmap=use_mmap) as model:
+            chunks = iter(partial(model.read, chunksize), b'')
             
             # If format is not specified, identify from first character
+            head = b''
             if format is None:
-                test = ''
-                while test == '':
-                    test = model.readline().strip()
-                try:
-                    test = chr(test[0])
-                except:
-                    test = test[0]
-                if test == '{':
+                for chunk in chunks:
+                    head += chunk
+                    if head.strip() != b'':
+                        break
+                test = head.lstrip()[:1]
+                if test in (b'{', b'['):
                     format = 'json'
-                elif test == '<':
+                elif test == b'<':
                     format = 'xml'
                 else:
-                    raise ValueError('could not identify content - give path as pathlib.Path and/or specify format')
-                
-                model.seek(0)
+                    raise ValueError('could not identify content - specify format')
+            chunks = chain([head], chunks)
             
-            # Load json using json package
             if format.lower() == 'json':
-                self.update(json.load(model,
-                                      object_pairs_hook = DataModelDict,
-                                      parse_int = int,
-                                      parse_float = float))
+                yield from cls.__iterload_json(chunks, path)
             
-            # Load xml using xmltodict package
             elif format.lower() == 'xml':
-                self.update(xmltodict.parse(model,
-                                            postprocessor = self.__xml_postprocessor(),
-                                            dict_constructor = DataModelDict))
+                yield from cls.__iterload_xml(chunks, path)
             
             else:
                 raise ValueError(f"invalid format '{format}'")
     
-    def json(self, fp:Optional[io.IOBase]=None, *args, **kwargs) -> Optional[str]:
+    @classmethod
+    def load_many(cls, paths:Iterable[Union[str, Path]], workers:Optional[int]=None,
+                  ordered:bool=True, chunksize:int=16, format:Optional[str]=None,
+                  backend:Optional[str]=None) -> Generator[tuple, None, None]:
+        """
+        Loads many files in parallel using a pool of processes.  Each worker
+        parses files into plain dicts and lists, which are quick to send
+        back, and the trees are then built with this class in the calling
+        process.  An error loading one file does not stop the others.
+        
+        Parameters
+        ----------
+        paths : iterable of str or Path
+            The paths of the XML and/or JSON files to load.
+        workers : int or None, optional
+            The number of worker processes.  If None (default), the number
+            of CPUs is used.  If 1, the files are loaded in this process.
+        ordered : bool, optional
+            If True (default), results are yielded in the same order as
+            paths.  If False, results are yielded as soon as they are ready.
+        chunksize : int, optional
+            The number of files sent to a worker at a time.  Larger values
+            lower the communication overhead for many small files.  Default
+            value is 16.
+        format : str or None, optional
+            The format of all of the files ('xml' or 'json').  If None
+            (default), each file's format is identified from its content.
+        backend : str or None, optional
+            The library to decode JSON content with.  See load().
+        
+        Yields
+        ------
+        path : str or Path
+            A path as given in paths.
+        model : DataModelDict or Exception
+            The loaded content, or the error raised while loading the file.
+        """
+        load = partial(load_plain, format=format,
+                       backend=json_backends.resolve_backend(backend))
+        new = partial(cls.__new__, cls)
+        setitem = json_backends.base_setitem(cls)
+        
+        def build(path, tree, error):
+            """Builds the model from a worker's result"""
+            if error is not None:
+                return path, error
+            model = cls()
+            model.update(json_backends.from_plain(tree, new, setitem))
+            return path, model
+        
+        # Load in this process
+        if workers == 1:
+            for path in paths:
+                yield build(*load(path))
+            return
+        
+        # Load in a pool of processes
+        with multiprocessing.Pool(workers) as pool:
+            if ordered:
+                results = pool.imap(load, paths, chunksize)
+            else:
+                results = pool.imap_unordered(load, paths, chunksize)
+            for result in results:
+                yield build(*result)
+    
+    def json(self, fp:Optional[io.IOBase]=None, *args,
+             backend:Optional[str]=None, **kwargs) -> Optional[str]:
         """
         Converts the DataModelDict to JSON content.
         
@@ -498,6 +1521,12 @@ class DataModelDict(OrderedDict):
             the content is returned as a str.
         *args : any
             Any other positional arguments accepted by json.dump(s)
+        backend : str or None, optional
+            The library to encode with: 'json' or 'orjson'.  If None
+            (default), the backend set with set_json_backend() is used.
+            orjson is only used when no args are given and kwargs are limited
+            to sort_keys and indent=2.  Its output differs in whitespace and
+            escaping, but decodes to the same content.
         **kwargs : any
             Any other keyword arguments accepted by json.dump(s)
         
@@ -508,9 +1537,9 @@ class DataModelDict(OrderedDict):
         """
         
         if fp is None:
-            return json.dumps(self, *args, **kwargs)
+            return json_backends.dumps(self, *args, backend=backend, **kwargs)
         else:
-            json.dump(self, fp=fp, *args, **kwargs)
+            json_backends.dump(self, fp, *args, backend=backend, **kwargs)
     
     def xml(self, fp:Optional[io.IOBase]=None, indent:Union[int, str, None]=None, **kwargs) -> Optional[str]:
         """
@@ -546,70 +1575,30 @@ class DataModelDict(OrderedDict):
         elif isinstance(indent, str):
             kwargs['indent'] = indent
         
-        return xmltodict.unparse(deepcopy(self),
-                                 output = fp,
-                                 preprocessor = self.__xml_preprocessor(),
-                                 **kwargs)
-    
-    def __xml_postprocessor(self, convert_NaN:bool=True):
-        """
-        Internal method that defines the xmltodict postprocessor function.
-        """
-        if convert_NaN is True:
-            parse_constant = {'': None,
-                              'True': True,
-                              'False': False,
-                              'true': True,
-                              'false': False,
-                              '-Infinity': float('-Inf'),
-                              'Infinity': float('Inf'),
-                              'NaN': float('NaN')}
-                              
-        elif convert_NaN is False:
-            parse_constant = {'': None,
-                              'True': True,
-                              'False': False}
+        content, preprocessor = self.__xml_preprocessor(
+            attr_prefix = kwargs.get('attr_prefix', '@'),
+            cdata_key = kwargs.get('cdata_key', '#text'),
+            comment_key = kwargs.get('comment_key', '#comment'))
         
-        def postprocessor(path, key, value):
-            
-            # Return non-string terms
-            if not isinstance(value, str):
-                return key, value
-            
-            # Decode string contents
-            else:
-                value = value.replace('\\n', '\n')
-                value = value.replace('\\t', '\t')
-                value = value.replace('\\r', '\r')
-            
-            # Convert identified constants
-            if value in parse_constant:
-                return key, parse_constant[value]
-            
-            try:
-                # Try to convert to integer
-                intval = int(value)
-            except ValueError:
-                try:
-                    # Try to return as float
-                    return key, float(value)
-                except ValueError:
-                    # Return unchanged as str
-                    return key, value
-            else:
-                # Check if int of value is reversable back to str
-                if str(intval) == value:
-                    # Return as int
-                    return key, intval
-                else:
-                    # Return unchanged as str
-                    return key, value
+        if fp is None:
+            return xmltodict.unparse(content,
+                                     preprocessor = preprocessor,
+                                     **kwargs)
         
-        return postprocessor
+        # Collect the many small writes into chunks
+        writer = ChunkedWriter(fp, encoding=kwargs.get('encoding', 'utf-8'))
+        xmltodict.unparse(content,
+                          output = writer,
+                          preprocessor = preprocessor,
+                          **kwargs)
+        writer.flush()
     
-    def __xml_preprocessor(self, convert_NaN:bool=True):
+    def __xml_preprocessor(self, convert_NaN:bool=True, attr_prefix:str='@',
+                           cdata_key:str='#text', comment_key:str='#comment'):
         """
-        Internal method that defines the xmltodict preprocessor function.
+        Internal method that defines the xmltodict preprocessor function and
+        the top-level content to pass with it.  Values are converted into new
+        containers so that self is neither copied nor changed.
         """
         if convert_NaN is True:
             allow_NaN = {'None': '',
@@ -624,104 +1613,481 @@ class DataModelDict(OrderedDict):
                          'True': 'true',
                          'False': 'false'}
         
-        def preprocessor(key, value):
+        def convert(value):
+            """Converts a value and any values it contains to str"""
             
             # Iterate through dictionary keys
             if isinstance(value, dict):
-                for k, v in value.items():
-                    value[k] = preprocessor(k,v)[1]
-                return key, value
+                return {k: convert(v) for k, v in value.items()}
             
             # Iterate through list/tuple values
-            elif isinstance(value, (list,tuple)):
-                for i in range(len(value)):
-                    value[i] = preprocessor(key, value[i])[1]
-                return key, value
+            elif isinstance(value, (list, tuple)):
+                return [convert(v) for v in value]
             
             # Convert ints and floats to strings
             elif isinstance(value, (int, float)) or value is None:
-                value = str(repr(value)).strip("""L""")
-                return key, value
+                return str(repr(value)).strip("""L""")
             
             # Parse and convert strings
             elif isinstance(value, (str, bytes)):
                 if value in allow_NaN:
-                    return key, allow_NaN[value]
+                    return allow_NaN[value]
                 else:
                     value = value.replace('\n', '\\n')
                     value = value.replace('\t', '\\t')
                     value = value.replace('\r', '\\r')
-                    return key, str(value)
+                    return str(value)
             else:
                 raise TypeError('unknown value type ' + repr(value))
         
-        return preprocessor
+        # Values below the top-level elements have always been converted a
+        # second time, which maps the 'None', 'True', 'nan', etc. from the
+        # first conversion.  This is kept so that the output is unchanged.
+        def convert_nested(value):
+            """Converts a value that is not part of a top-level element"""
+            if isinstance(value, (dict, list, tuple)):
+                return convert(convert(value))
+            value = convert(value)
+            return allow_NaN.get(value, value)
+        
+        def is_content(k):
+            """Tests if a dict key is for an attribute or text value"""
+            return k == cdata_key or (isinstance(k, str) and k.startswith(attr_prefix))
+        
+        def element(value, toplevel):
+            """Converts an element's value, leaving child elements for their own preprocessor calls"""
+            if toplevel:
+                convert_value = convert
+            else:
+                convert_value = convert_nested
+            
+            # Only copy dicts with attribute or text values to convert
+            if isinstance(value, dict):
+                if not any(is_content(k) for k in value):
+                    return value
+                return {k: convert_value(v) if is_content(k) else v
+                        for k, v in value.items()}
+            
+            # Convert each list/tuple value
+            elif isinstance(value, (list, tuple)):
+                return [element(v, toplevel) if isinstance(v, dict) else convert_value(v)
+                        for v in value]
+            
+            else:
+                return convert_value(value)
+        
+        # Tag the top-level elements so the preprocessor can identify them
+        class TopLevel():
+            __slots__ = ['value']
+            def __init__(self, value):
+                self.value = value
+        
+        content = OrderedDict()
+        for key, value in self.items():
+            if key == comment_key:
+                content[key] = value
+            else:
+                content[key] = TopLevel(value)
+        
+        def preprocessor(key, value):
+            if isinstance(value, TopLevel):
+                return key, element(value.value, True)
+            return key, element(value, False)
+        
+        return content, preprocessor
 
-    def __gen_dict_value(self, key, var):
+    @classmethod
+    def __iterload_xml(cls, chunks, path):
         """
-        Internal method that recursively searches and yields values for all
-        elements with key matching key.
+        Internal method that parses XML byte chunks with expat and yields the
+        values of the elements at path.  Only elements inside of a matching
+        record are built, following the same rules as xmltodict.parse.
         """
+        if len(path) == 0 or not all(isinstance(k, str) for k in path):
+            raise ValueError('XML path must be a non-empty list of element names')
+        depth = len(path)
         
-        if isinstance(var, dict):
-            for k, v in var.items():
-                if k == key:
-                    if isinstance(v, list):
-                        for d in v:
-                            yield d
-                    else:
-                        yield v
-                if isinstance(v, dict):
-                    for result in self.__gen_dict_value(key, v):
-                        yield result
-                elif isinstance(v, list):
-                    for d in v:
-                        for result in self.__gen_dict_value(key, d):
-                            yield result
-
-    def __gen_dict_path(self, key, var):
+        postprocessor = xml_postprocessor()
+        records = deque()
+        names = []
+        stack = []
+        item = None
+        data = []
+        active = False
+        
+        def push_data(item, key, data):
+            """Adds a child to item following xmltodict's rules"""
+            key, data = postprocessor(names, key, data)
+            if item is None:
+                item = cls()
+            if key in item:
+                if isinstance(item[key], list):
+                    item[key].append(data)
+                else:
+                    item[key] = [item[key], data]
+            else:
+                item[key] = data
+            return item
+        
+        def start_element(name, attrs):
+            nonlocal item, data, active
+            names.append(name)
+            if len(names) == depth:
+                active = names == path
+            
+            # Only build elements that are inside of a record
+            if active:
+                stack.append((item, data))
+                item = None
+                data = []
+                for i in range(0, len(attrs), 2):
+                    item = push_data(item, '@' + attrs[i], attrs[i+1])
+        
+        def end_element(name):
+            nonlocal item, data, active
+            if active:
+                text = ''.join(data) if len(data) > 0 else None
+                child = item
+                item, data = stack.pop()
+                if text:
+                    text = text.strip() or None
+                if child is not None:
+                    if text:
+                        push_data(child, '#text', text)
+                    value = child
+                else:
+                    value = text
+                
+                # Finished records are queued rather than added to a parent
+                if len(names) == depth:
+                    records.append(push_data(None, name, value)[name])
+                    active = False
+                else:
+                    item = push_data(item, name, value)
+            names.pop()
+        
+        def character_data(text):
+            if active:
+                data.append(text)
+        
+        def forbid_entities(*args, **kwargs):
+            raise ValueError('entities are disabled')
+        
+        parser = expat.ParserCreate()
+        parser.ordered_attributes = True
+        parser.buffer_text = True
+        parser.StartElementHandler = start_element
+        parser.EndElementHandler = end_element
+        parser.CharacterDataHandler = character_data
+        parser.EntityDeclHandler = forbid_entities
+        
+        for chunk in chunks:
+            parser.Parse(chunk, False)
+            while len(records) > 0:
+                yield records.popleft()
+        parser.Parse(b'', True)
+        while len(records) > 0:
+            yield records.popleft()
+    
+    @classmethod
+    def __iterload_json(cls, chunks, path):
         """
-        Internal method that recursively searches and yields path lists for
-        all elements with key matching key.
+        Internal method that scans JSON byte chunks and yields the values
+        found at path.  Values not on path are skipped without being built,
+        and each yielded value is decoded on its own with json.
         """
+        decoder = json.JSONDecoder(object_pairs_hook = cls,
+                                   parse_int = int,
+                                   parse_float = float)
+        textdecoder = codecs.getincrementaldecoder('utf-8-sig')()
+        buf = ''
+        pos = 0
+        eof = False
         
-        if isinstance(var, dict):
-            for k, v in var.items():
-                if k == key:
-                    if isinstance(v, list):
-                        for i in range(len(v)):
-                            yield [k, i]
-                    else:
-                        yield [k]
-                if isinstance(v, dict):
-                    for result in self.__gen_dict_path(key, v):
-                        if result is not None:
-                            yield [k] + result
-                elif isinstance(v, list):
-                    for i in range(len(v)):
-                        for result in self.__gen_dict_path(key, v[i]):
-                            if result is not None:
-                                yield [k, i] + result
+        def fill():
+            """Drops consumed text and decodes the next chunk into buf"""
+            nonlocal buf, pos, eof
+            if eof:
+                raise ValueError('unexpected end of JSON content')
+            buf = buf[pos:]
+            pos = 0
+            try:
+                buf += textdecoder.decode(next(chunks))
+            except StopIteration:
+                buf += textdecoder.decode(b'', True)
+                eof = True
+        
+        def next_char():
+            """Skips whitespace and returns the next char without consuming it"""
+            nonlocal pos
+            while True:
+                match = JSON_NONSPACE.search(buf, pos)
+                if match is not None:
+                    pos = match.start()
+                    return buf[pos]
+                pos = len(buf)
+                if eof:
+                    return ''
+                fill()
+        
+        def expect(chars):
+            """Consumes the next char and checks that it is one of chars"""
+            nonlocal pos
+            char = next_char()
+            if char == '' or char not in chars:
+                raise ValueError(f'invalid JSON content: expected one of {chars!r} at {char!r}')
+            pos += 1
+            return char
+        
+        def read_value():
+            """Decodes and consumes the next complete value"""
+            nonlocal pos
+            next_char()
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                else:
+                    # Numbers are only complete once a delimiter follows
+                    if eof or (end < len(buf) and buf[end] in JSON_DELIMITERS):
+                        pos = end
+                        return value
+                
+                # Grow buf geometrically to keep retries linear
+                need = 2 * (len(buf) - pos)
+                while len(buf) - pos < need and not eof:
+                    fill()
+        
+        def skip_value():
+            """Consumes the next value without building it"""
+            nonlocal pos
+            if next_char() not in '{[':
+                read_value()
+                return
+            depth = 0
+            in_string = False
+            while True:
+                if in_string:
+                    match = JSON_STRING_STOP.search(buf, pos)
+                else:
+                    match = JSON_STRUCTURE.search(buf, pos)
+                
+                # Read more content if no stop was found or an escape is split
+                if match is None or (match.group() == '\\' and match.end() == len(buf)):
+                    pos = len(buf) if match is None else match.start()
+                    fill()
+                    continue
+                
+                char = match.group()
+                pos = match.end()
+                if char == '\\':
+                    pos += 1
+                elif char == '"':
+                    in_string = not in_string
+                elif char in '{[':
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        return
+        
+        # Move to the value at path
+        for key in path:
+            if isinstance(key, str):
+                if next_char() != '{':
+                    return
+                pos += 1
+                if next_char() == '}':
+                    return
+                while True:
+                    if next_char() != '"':
+                        raise ValueError('invalid JSON content: expected object key')
+                    name = read_value()
+                    expect(':')
+                    if name == key:
+                        break
+                    skip_value()
+                    if expect(',}') == '}':
+                        return
+            
+            elif isinstance(key, int):
+                if next_char() != '[':
+                    return
+                pos += 1
+                if next_char() == ']':
+                    return
+                for i in range(key):
+                    skip_value()
+                    if expect(',]') == ']':
+                        return
+            
+            else:
+                raise ValueError('path fields limited to str names or int indices')
+        
+        # Yield list items or the single value at path
+        if next_char() != '[':
+            yield read_value()
+            return
+        pos += 1
+        if next_char() == ']':
+            return
+        while True:
+            yield read_value()
+            if expect(',]') == ']':
+                return
+    
+    @staticmethod
+    def __as_query(key, yes, no):
+        """
+        Internal method that compiles search terms into a Query, or passes
+        through a given Query.
+        """
+        if isinstance(key, Query):
+            if len(yes) > 0 or len(no) > 0:
+                raise ValueError('yes and no cannot be given with a compiled query')
+            return key
+        return Query(key, yes, no)
+    
+    @staticmethod
+    def __as_queries(queries):
+        """
+        Internal method that compiles the conditions given for each key to
+        finds_many() and paths_many() into Queries.
+        """
+        compiled = {}
+        for key, terms in queries.items():
+            if isinstance(terms, Query):
+                if terms.key != key:
+                    raise ValueError(f'query for {terms.key!r} given for key {key!r}')
+                compiled[key] = terms
+            elif terms is None:
+                compiled[key] = Query(key)
+            else:
+                yes, no = terms
+                compiled[key] = Query(key, yes, no)
+        return compiled
+    
+    def __gen_keys_matches(self, keys, paths):
+        """
+        Internal method that yields the key, path list (if paths is True),
+        container and value for all elements with keys matching any of keys,
+        using the index from build_index() if there is one.  Without an
+        index, the structure is walked once.
+        """
+        index = INDEXES.get(id(self))
+        if index is not None and index.root() is self:
+            if index.entries is None:
+                index.build()
+            for key in keys:
+                for path, parent, value in index.entries.get(key, []):
+                    yield key, path, parent, value
+            return
+        
+        for path, parent, k, v in walk_items(self, keys):
+            if isinstance(v, list):
+                for i in range(len(v)):
+                    yield k, path + [k, i] if paths else None, v, v[i]
+            else:
+                yield k, path + [k] if paths else None, parent, v
     
     def __gen_dict_valuepath(self, var):
         """
-        Internal method that recursively searches and yields path lists for
-        all elements with key matching key.
+        Internal method that searches and yields path lists for all value
+        elements, i.e. elements that are not dicts or lists of dicts.  A
+        list is given as a value at its first item that is not a dict,
+        after the values of the dicts before it.  Uses an explicit stack
+        rather than recursion.
         """
+        if not isinstance(var, dict):
+            return
         
-        if isinstance(var, dict):
-            for k, v in var.items():
+        # Frames are iterators over dict items, or enumerate objects over lists
+        path = []
+        stack = [iter(var.items())]
+        while len(stack) > 0:
+            items = stack[-1]
+            
+            # Descend into the next dict in a list, or end at a value
+            if items.__class__ is enumerate:
+                for i, v in items:
+                    if isinstance(v, dict):
+                        path.append(i)
+                        stack.append(iter(v.items()))
+                        break
+                    yield list(path)
+                    stack.pop()
+                    path.pop()
+                    break
+                else:
+                    stack.pop()
+                    path.pop()
+                continue
+            
+            # Yield values and descend into dict and list values
+            for k, v in items:
                 if isinstance(v, dict):
-                    for result in self.__gen_dict_valuepath(v):
-                        yield [k] + result
+                    path.append(k)
+                    stack.append(iter(v.items()))
+                    break
                 elif isinstance(v, list):
-                    for i in range(len(v)):
-                        if isinstance(v[i], dict):
-                            for result in self.__gen_dict_valuepath(v[i]):
-                                yield [k, i] + result
-                        else:
-                            yield [k]
-                            break
-                else:
-                    yield [k]
+                    path.append(k)
+                    stack.append(enumerate(v))
+                    break
+                yield path + [k]
+            else:
+                stack.pop()
+                if len(stack) > 0:
+                    path.pop()
+
+class DataModelDict(BaseDataModelDict, OrderedDict):
+    """Class for handling json/xml equivalent data structures."""
+    
+    def popitem(self, last:bool=True):
+        """Extends OrderedDict.popitem() to keep any key index current."""
+        mark_modified(self)
+        return OrderedDict.popitem(self, last)
+    
+    def move_to_end(self, key:str, last:bool=True):
+        """Extends OrderedDict.move_to_end() to keep any key index current."""
+        mark_modified(self)
+        OrderedDict.move_to_end(self, key, last)
 
+class CompactDataModelDict(BaseDataModelDict, dict):
+    """
+    Class for handling json/xml equivalent data structures that is based on
+    dict rather than OrderedDict.  Keys keep their insertion order, but each
+    element takes about half the memory of a DataModelDict.  It has the same
+    methods except for move_to_end() and popitem(last), and equality tests
+    ignore the order of keys as for dict.  Loading content with
+    CompactDataModelDict creates CompactDataModelDict elements.
+    """
+    __slots__ = ('__weakref__',)
+    
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({dict.__repr__(self)})'
+    
+    def copy(self) -> 'CompactDataModelDict':
+        """Extends dict.copy() to return a CompactDataModelDict."""
+        return type(self)(self)
+    
+    def popitem(self) -> tuple:
+        """Extends dict.popitem() to keep any key index current."""
+        mark_modified(self)
+        return dict.popitem(self)
+    
+    def setdefault(self, key:str, default:Any=None) -> Any:
+        """Extends dict.setdefault() to keep any key index current."""
+        if key not in self:
+            mark_modified(self)
+        return dict.setdefault(self, key, default)
+    
+    def update(self, *args, **kwargs):
+        """Extends dict.update() to keep any key index current."""
+        mark_modified(self)
+        dict.update(self, *args, **kwargs)
+    
+    def __ior__(self, other:dict) -> 'CompactDataModelDict':
+        self.update(other)
+        return self
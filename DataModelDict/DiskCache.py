@@ -0,0 +1,223 @@
+"""DiskCache class for keeping parsed files on disk between runs."""
+
+# Standard Python libraries
+import os
+import time
+import pickle
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Union, Any, Callable
+
+# Changing this invalidates all existing cache entries
+CACHE_VERSION = 1
+
+class DiskCache():
+    """
+    A directory of pickled snapshots of parsed files, so that later loads of
+    an unchanged file skip parsing.  Each entry is keyed by the file's path
+    and the options it was parsed with, and records the file's size,
+    modification time and content hash.  A file whose size and modification
+    time match is used without reading it, and one that was only touched is
+    recognized by its hash.  The least recently used entries are removed
+    when the cache is created and whenever an entry is written, once the
+    directory grows beyond max_size.
+
+    Entries are written to temporary files that are then renamed into place,
+    so processes sharing the directory never read partial entries, and
+    entries that cannot be read are treated as missing.  Entries are
+    unpickled when read, so the directory must only be writable by trusted
+    users.
+    """
+
+    def __init__(self, directory:Union[str, Path], max_size:int=2**30):
+        """
+        Initializes a DiskCache, creating directory if needed and removing
+        the least recently used entries if it is already over max_size.
+
+        Parameters
+        ----------
+        directory : str or Path
+            The directory to keep entries in.
+        max_size : int, optional
+            The total size in bytes of the entries to keep.  Default value is
+            1 GiB.
+        """
+        self.__directory = Path(directory)
+        self.__directory.mkdir(parents=True, exist_ok=True)
+        self.__max_size = max_size
+        self.__evict()
+
+    def __repr__(self) -> str:
+        return f'DiskCache({str(self.directory)!r}, max_size={self.max_size})'
+
+    @property
+    def directory(self) -> Path:
+        """Path: The directory that entries are kept in."""
+        return self.__directory
+
+    @property
+    def max_size(self) -> int:
+        """int: The total size in bytes of the entries to keep."""
+        return self.__max_size
+
+    @property
+    def size(self) -> int:
+        """int: The current total size in bytes of the entries."""
+        return sum(stat.st_size for entry, stat in self.__entries())
+
+    def load(self, path:Union[str, Path], parse:Callable[[], Any],
+             options:tuple=()) -> Any:
+        """
+        Returns the cached value for a file, or calls parse and caches the
+        value if there is no valid entry.
+
+        Parameters
+        ----------
+        path : str or Path
+            The file that parse reads.
+        parse : callable
+            Called with no arguments to parse the file.
+        options : tuple, optional
+            Any options that parse depends on.  Values parsed with different
+            options are cached separately.
+
+        Returns
+        -------
+        any
+            The parsed value.
+        """
+        path = Path(path).resolve()
+        entry = self.__entry_path(path, options)
+        stat = path.stat()
+
+        # Use the entry if it matches the file
+        digest = None
+        try:
+            with open(entry, 'rb') as f:
+                version, size, mtime, entry_digest = pickle.load(f)
+                if version == CACHE_VERSION and size == stat.st_size:
+                    if mtime == stat.st_mtime_ns:
+                        value = pickle.load(f)
+                        self.__touch(entry)
+                        return value
+
+                    # Files that were only touched get their new mtime
+                    # recorded, so they are not hashed again
+                    digest = file_digest(path)
+                    if digest == entry_digest:
+                        data = f.read()
+                        value = pickle.loads(data)
+                        f.close()
+                        self.__write(entry, (CACHE_VERSION, stat.st_size, stat.st_mtime_ns, digest),
+                                     data, pickled=True)
+                        return value
+        except FileNotFoundError:
+            pass
+        except Exception:
+            remove(entry)
+
+        # Hash the content before parsing, so a file changed while being
+        # parsed does not match its entry later
+        if digest is None:
+            digest = file_digest(path)
+        value = parse()
+        self.__write(entry, (CACHE_VERSION, stat.st_size, stat.st_mtime_ns, digest), value)
+        return value
+
+    def clear(self):
+        """Removes all entries."""
+        for entry, stat in self.__entries():
+            remove(entry)
+
+    def __entry_path(self, path:Path, options:tuple) -> Path:
+        """Internal method that gives the entry file for a file and options."""
+        key = repr((str(path), options)).encode('UTF-8', 'surrogatepass')
+        return self.directory / f'{hashlib.blake2b(key, digest_size=16).hexdigest()}.pkl'
+
+    def __entries(self) -> list:
+        """Internal method that lists the entry files and their stats."""
+        entries = []
+        for entry in self.directory.glob('*.pkl'):
+            try:
+                entries.append((entry, entry.stat()))
+            except FileNotFoundError:
+                pass
+        return entries
+
+    def __touch(self, entry:Path):
+        """Internal method that marks an entry as recently used."""
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+
+    def __write(self, entry:Path, header:tuple, value:Any, pickled:bool=False):
+        """
+        Internal method that writes an entry through a temporary file, then
+        evicts the least recently used entries if needed.  If pickled is
+        True, value is the already pickled bytes of the value.
+        """
+        with tempfile.NamedTemporaryFile(dir=self.directory, suffix='.tmp',
+                                         delete=False) as f:
+            try:
+                pickle.dump(header, f, pickle.HIGHEST_PROTOCOL)
+                if pickled:
+                    f.write(value)
+                else:
+                    pickle.dump(value, f, pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                f.close()
+                remove(Path(f.name))
+                raise
+            size = f.tell()
+
+        # Values larger than the cache are not kept
+        if size > self.max_size:
+            remove(Path(f.name))
+            return
+        
+        # Entries open in other processes cannot be replaced on some systems
+        try:
+            os.replace(f.name, entry)
+        except OSError:
+            remove(Path(f.name))
+            return
+        self.__evict()
+
+    def __evict(self):
+        """
+        Internal method that removes the least recently used entries while
+        the total size exceeds max_size, and any temporary files left by
+        interrupted writes.
+        """
+        for tmp in self.directory.glob('*.tmp'):
+            try:
+                if time.time() - tmp.stat().st_mtime > 3600:
+                    remove(tmp)
+            except FileNotFoundError:
+                pass
+
+        entries = self.__entries()
+        total = sum(stat.st_size for entry, stat in entries)
+        entries.sort(key=lambda entry: entry[1].st_mtime_ns)
+        for entry, stat in entries:
+            if total <= self.max_size:
+                break
+            remove(entry)
+            total -= stat.st_size
+
+def file_digest(path:Path, chunksize:int=1048576) -> str:
+    """Returns the blake2b hash of a file's content."""
+    digest = hashlib.blake2b()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunksize), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def remove(path:Path):
+    """Removes a file if it still exists."""
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
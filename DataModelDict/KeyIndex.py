@@ -0,0 +1,116 @@
+"""KeyIndex class for finding the subelements of a DataModelDict by key."""
+
+# Standard Python libraries
+import weakref
+
+# Local imports
+from .walk import walk_items
+
+# Key indexes by the id of the indexed DataModelDict, and the sets of key
+# indexes by the id of every dict element in the indexed trees, as an element
+# can be shared by more than one tree
+INDEXES = {}
+INDEXED_ELEMENTS = {}
+
+class KeyIndex():
+    """
+    Maps each key found at any level of a DataModelDict to the path lists,
+    containers and values of the matching subelements.  The entries are
+    dropped whenever an element of the tree is modified and rebuilt on the
+    next lookup.
+    """
+    
+    def __init__(self, root:dict):
+        """
+        Parameters
+        ----------
+        root : DataModelDict
+            The DataModelDict to index.
+        """
+        self.root = weakref.ref(root, self.__release)
+        self.rootid = id(root)
+        self.entries = None
+        self.elements = []
+    
+    def build(self):
+        """Walks the tree and collects the entries for all keys."""
+        self.invalidate()
+        root = self.root()
+        entries = {}
+        elements = [id(root)]
+        for path, parent, k, v in walk_items(root):
+            if isinstance(v, list):
+                matches = entries.setdefault(k, [])
+                for i in range(len(v)):
+                    matches.append((path + [k, i], v, v[i]))
+                    if isinstance(v[i], dict):
+                        elements.append(id(v[i]))
+            else:
+                entries.setdefault(k, []).append((path + [k], parent, v))
+                if isinstance(v, dict):
+                    elements.append(id(v))
+        
+        for element in elements:
+            INDEXED_ELEMENTS.setdefault(element, set()).add(self)
+        self.elements = elements
+        self.entries = entries
+    
+    def invalidate(self):
+        """Drops the entries until the next build."""
+        for element in self.elements:
+            indexes = INDEXED_ELEMENTS.get(element)
+            if indexes is not None:
+                indexes.discard(self)
+                if len(indexes) == 0:
+                    del INDEXED_ELEMENTS[element]
+        self.elements = []
+        self.entries = None
+    
+    def __release(self, ref):
+        """Removes the index once the indexed DataModelDict is deleted."""
+        self.invalidate()
+        if INDEXES.get(self.rootid) is self:
+            del INDEXES[self.rootid]
+
+def mark_modified(element:dict):
+    """
+    Marks the indexes of all indexed trees that element belongs to as
+    outdated.
+    
+    Parameters
+    ----------
+    element : dict
+        The element being changed.
+    """
+    if len(INDEXED_ELEMENTS) > 0:
+        indexes = INDEXED_ELEMENTS.get(id(element))
+        if indexes is not None:
+            for index in list(indexes):
+                index.invalidate()
+
+def resolve_parent(root:dict, path:list) -> tuple:
+    """
+    Walks a path list to the container of the element it leads to.
+    
+    Parameters
+    ----------
+    root : DataModelDict
+        The top-level element that path starts from.
+    path : list
+        The path list.
+    
+    Returns
+    -------
+    parent : dict or list
+        The container of the element.
+    holder : dict
+        The last dict on the path that contains parent, which is parent
+        itself if it is a dict.  Changes to list containers are marked on
+        holder so that any key index is kept current.
+    """
+    parent = holder = root
+    for k in path[:-1]:
+        parent = parent[k]
+        if isinstance(parent, dict):
+            holder = parent
+    return parent, holder
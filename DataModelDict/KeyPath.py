@@ -0,0 +1,110 @@
+"""KeyPath class for compiled paths to values within a DataModelDict."""
+
+# Standard Python libraries
+from functools import lru_cache
+from typing import Union, Iterator
+
+# Local imports
+from .parsepath import cached_parsepath, PATH_CACHE_SIZE
+from .joinpath import joinpath
+
+class KeyPath():
+    """
+    An immutable path of element keys and list indices that has been parsed
+    once, for use as a DataModelDict key in place of a path list.  Its
+    string form is built once when first needed.  Use compile_path() to get
+    KeyPaths for path strings from a cache.
+    """
+    __slots__ = ('__terms', '__delimiters', '__str', '__hash')
+
+    def __init__(self, path:Union[str, list, tuple, 'KeyPath'],
+                 delimiter:str='.', openbracket:str='[', closebracket:str=']'):
+        """
+        Parameters
+        ----------
+        path : str, list, tuple or KeyPath
+            The path, as a string that is parsed using parsepath(), or as a
+            sequence of str keys and int list indices.
+        delimiter : str
+            The delimiter between subsequent element names.
+        openbracket : str
+            The opening indicator of list indices.
+        closebracket : str
+            The closing indicator of list indices.
+        """
+        self.__delimiters = (delimiter, openbracket, closebracket)
+        if isinstance(path, str):
+            self.__terms = cached_parsepath(path, delimiter, openbracket, closebracket)
+        else:
+            self.__terms = tuple(path)
+            for term in self.__terms:
+                if not isinstance(term, (str, int)):
+                    raise TypeError('path fields limited to str names or int indices')
+        self.__str = None
+        self.__hash = None
+
+    @property
+    def terms(self) -> tuple:
+        """tuple: The str keys and int list indices of the path."""
+        return self.__terms
+
+    def aslist(self) -> list:
+        """Returns the path as a path list."""
+        return list(self.__terms)
+
+    def __str__(self) -> str:
+        if self.__str is None:
+            self.__str = joinpath(self.__terms, *self.__delimiters) if len(self.__terms) > 0 else ''
+        return self.__str
+
+    def __repr__(self) -> str:
+        return f'KeyPath({str(self)!r})'
+
+    def __iter__(self) -> Iterator[Union[str, int]]:
+        return iter(self.__terms)
+
+    def __len__(self) -> int:
+        return len(self.__terms)
+
+    def __getitem__(self, index:Union[int, slice]) -> Union[str, int, 'KeyPath']:
+        if isinstance(index, slice):
+            return KeyPath(self.__terms[index], *self.__delimiters)
+        return self.__terms[index]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, KeyPath):
+            return self.__terms == other.terms
+        elif isinstance(other, (list, tuple)):
+            return self.__terms == tuple(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        if self.__hash is None:
+            self.__hash = hash(self.__terms)
+        return self.__hash
+
+@lru_cache(maxsize=PATH_CACHE_SIZE)
+def compile_path(pathstr:str, delimiter:str='.', openbracket:str='[',
+                 closebracket:str=']') -> KeyPath:
+    """
+    Gives the KeyPath for a path string, keeping the most recently used
+    KeyPaths so that repeated paths are only parsed once.
+
+    Parameters
+    ----------
+    pathstr : str
+        The path string to parse.
+    delimiter : str
+        The delimiter between subsequent element names.
+    openbracket : str
+        The opening indicator of list indices.
+    closebracket : str
+        The closing indicator of list indices.
+
+    Returns
+    -------
+    KeyPath
+        The compiled path.  The same KeyPath is returned for each call with
+        the same arguments while it is cached.
+    """
+    return KeyPath(pathstr, delimiter, openbracket, closebracket)
@@ -0,0 +1,739 @@
+"""LazyDataModelDict class for reading parts of large JSON and XML content."""
+
+# Standard Python libraries
+import io
+import re
+import json
+import mmap
+from pathlib import Path
+from collections import OrderedDict
+from typing import Union, Optional, Any, Generator
+from xml.parsers import expat
+
+# https://github.com/martinblech/xmltodict
+import xmltodict
+
+# Local imports
+from .uber_open_rmode import uber_open_rmode, identify_compression
+from .DataModelDict import DataModelDict, xml_postprocessor
+from .Query import Query
+from . import json_backends
+
+# Patterns used to scan JSON content.  Objects and lists that contain no
+# other objects or lists are matched as a whole by JSON_LEAF.
+JSON_SPACE = re.compile(rb'[ \t\n\r]*')
+JSON_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"')
+JSON_LEAF = re.compile(rb'[\[{](?:[^"\[\]{}]|"[^"\\]*(?:\\.[^"\\]*)*")*[\]}]')
+JSON_FLAT = re.compile(rb'(?:[^"\[\]{}]|"[^"\\]*(?:\\.[^"\\]*)*"|' + JSON_LEAF.pattern + rb')*')
+JSON_SCALAR = re.compile(rb'[^ \t\n\r,:\[\]{}"]+')
+
+class StopScan(Exception):
+    """Raised by expat handlers to stop parsing once enough is known."""
+
+class LazyDataModelDict():
+    """
+    Read-only view of JSON or XML content that only builds the parts that are
+    accessed.  Where each subelement sits in the content is recorded as byte
+    offsets as the content is scanned, and a subelement is parsed and built
+    the first time it is accessed, then cached.  Subelements whose content is
+    larger than lazy_size are themselves returned as LazyDataModelDicts, so
+    accessing one value deep in a document only builds that value.
+    Everything else is built as DataModelDict.
+    """
+
+    def __init__(self, model:Union[str, bytes, Path, io.IOBase],
+                 format:Optional[str]=None, use_mmap:bool=False,
+                 lazy_size:int=65536, backend:Optional[str]=None):
+        """
+        Initializes a LazyDataModelDict by locating the top-level element.
+
+        Parameters
+        ----------
+        model : str, bytes, Path or file-like object
+            The XML or JSON content to read.  Any input supported by
+            uber_open_rmode is allowed.  The content is kept in memory, or
+            memory-mapped if use_mmap is True.  JSON content must be UTF-8.
+        format : str or None, optional
+            Allows for the format of the content to be explicitly stated
+            ('xml' or 'json').  If None (default), will try to determine which
+            format based on if the first character of model is '<' or '{'.
+        use_mmap : bool, optional
+            If True and model is a file path, the file is memory-mapped rather
+            than read into memory.  Compressed files are always decompressed
+            into memory.  Default value is False.
+        lazy_size : int, optional
+            Subelements with content of more than this number of bytes are
+            returned as LazyDataModelDicts rather than being built in full.
+            Default value is 65536.
+        backend : str or None, optional
+            The library used to decode JSON content.  See
+            DataModelDict.load().
+
+        Raises
+        ------
+        ValueError
+            If format is None and unable to identify XML/JSON content, if
+            format is not equal to 'xml' or 'json', or if the JSON content is
+            not an object.
+        """
+        content = read_content(model, use_mmap)
+
+        # If format is not specified, identify from first character
+        start = JSON_SPACE.match(content).end()
+        if format is None:
+            test = content[start:start + 1]
+            if test == b'{':
+                format = 'json'
+            elif test == b'<':
+                format = 'xml'
+            else:
+                raise ValueError('could not identify content - specify format')
+
+        source = {'content': content,
+                  'format': format.lower(),
+                  'lazy_size': lazy_size,
+                  'backend': backend,
+                  'encoding': None}
+
+        if source['format'] == 'json':
+            if content[start:start + 1] != b'{':
+                raise ValueError('JSON content must be an object')
+            self.__setup(source, start, len(content))
+
+        elif source['format'] == 'xml':
+            self.__setup(source, 0, len(content))
+            self.__scan_xml_document()
+
+        else:
+            raise ValueError(f"invalid format '{format}'")
+
+    @classmethod
+    def __subelement(cls, source:dict, start:int, end:int) -> 'LazyDataModelDict':
+        """Internal method that creates the view of a subelement."""
+        view = cls.__new__(cls)
+        view.__setup(source, start, end)
+        return view
+
+    def __setup(self, source:dict, start:int, end:int):
+        """Internal method that sets the initial state of a view."""
+        self.__source = source
+        self.__start = start
+        self.__end = end
+        self.__spans = OrderedDict()
+        self.__values = {}
+
+        # Position of the next unscanned JSON member, or the member whose
+        # end has yet to be found
+        self.__pos = start + 1
+        self.__pending = None
+        self.__scanned = False
+
+    def __repr__(self) -> str:
+        end = '?' if self.__end is None else self.__end
+        return (f'<LazyDataModelDict of {self.__source["format"]} bytes '
+                f'{self.__start}-{end}>')
+
+    @property
+    def format(self) -> str:
+        """str: The format of the content, 'json' or 'xml'."""
+        return self.__source['format']
+
+    @property
+    def span(self) -> tuple:
+        """tuple: The start and end byte offsets of the content viewed."""
+        self.__find_end()
+        return (self.__start, self.__end)
+
+    def __getitem__(self, key:Union[str, list]) -> Any:
+        """
+        Gets the value of a key, building it on first access.
+
+        Parameters
+        ----------
+        key : str or list
+            Dictionary key.  If key is a list, then subsequent keys down the
+            structure are accessed.
+
+        Returns
+        -------
+        any
+            The value.  Large dict values are returned as LazyDataModelDict.
+        """
+        # Handle path keys
+        if isinstance(key, list):
+            value = self
+            for k in key:
+                value = value[k]
+            return value
+
+        if key in self.__values:
+            return self.__values[key]
+
+        if key not in self.__spans:
+            self.__scan(key)
+            if key not in self.__spans:
+                raise KeyError(key)
+
+        value = self.__values[key] = self.__build(self.__spans[key])
+        return value
+
+    def __contains__(self, key:str) -> bool:
+        if key not in self.__spans:
+            self.__scan(key)
+        return key in self.__spans
+
+    def __iter__(self) -> Generator[str, None, None]:
+        self.__scan()
+        return iter(list(self.__spans.keys()))
+
+    def __len__(self) -> int:
+        self.__scan()
+        return len(self.__spans)
+
+    def keys(self) -> list:
+        """list: The keys of the element."""
+        self.__scan()
+        return list(self.__spans.keys())
+
+    def get(self, key:str, default:Any=None) -> Any:
+        """
+        Gets the value of a key if it exists.
+
+        Parameters
+        ----------
+        key : str
+            Dictionary key.
+        default : any, optional
+            The value to return if key does not exist.  Default value is
+            None.
+
+        Returns
+        -------
+        any
+            The value or default.
+        """
+        if key in self:
+            return self[key]
+        return default
+
+    def aslist(self, key:str) -> list:
+        """
+        Gets the value of a dictionary key as a list.  Useful for elements
+        whose values may or may not be lists.
+
+        Parameters
+        ----------
+        key : str
+            Dictionary key
+
+        Returns
+        -------
+        list
+            The dictionary's element value or [value] depending on if it
+            already is a list.
+        """
+        if key in self:
+            value = self[key]
+            if isinstance(value, list):
+                return list(value)
+            return [value]
+        return []
+
+    def find(self, key:Union[str, Query], yes:dict={}, no:dict={}) -> Any:
+        """
+        Return the value of a subelement at any level uniquely identified by
+        the specified conditions.  Only the parts of the content that contain
+        key are built.
+
+        Parameters
+        ----------
+        key : str or Query
+            Dictionary key to search for, or a query from
+            DataModelDict.compile_query() in which case yes and no must be
+            empty.
+        yes : dict
+            Key-value terms which the subelement must have to be considered a
+            match.
+        no : dict
+            Key-value terms which the subelement must not have to be
+            considered a match.
+
+        Returns
+        -------
+        any
+            The value of the uniquely identified subelement.
+
+        Raises
+        ------
+        ValueError
+            If exactly one matching subelement is not identified.
+        """
+        matching = self.finds(key, yes, no)
+
+        # Test length of matching
+        if len(matching) == 1:
+            return matching[0]
+        elif len(matching) == 0:
+            raise ValueError('No matching subelements found for key (and kwargs).')
+        else:
+            raise ValueError('Multiple matching subelements found for key (and kwargs).')
+
+    def finds(self, key:Union[str, Query], yes:dict={}, no:dict={}) -> list:
+        """
+        Finds the values of all subelements at any level identified by the
+        specified conditions.  Only the parts of the content that contain key
+        are built.
+
+        Parameters
+        ----------
+        key : str or Query
+            Dictionary key to search for, or a query from
+            DataModelDict.compile_query() in which case yes and no must be
+            empty.
+        yes : dict
+            Key-value terms which the subelement must have to be considered a
+            match.
+        no : dict
+            Key-value terms which the subelement must not have to be
+            considered a match.
+
+        Returns
+        -------
+        list
+            The values of any matching subelements.  Large dict values are
+            returned as LazyDataModelDict.
+        """
+        if isinstance(key, Query):
+            if len(yes) > 0 or len(no) > 0:
+                raise ValueError('yes and no cannot be given with a compiled query')
+            query = key
+        else:
+            query = Query(key, yes, no)
+
+        matching = []
+        for value in self.__gen_values(query.key, self.__key_pattern(query.key)):
+            if isinstance(value, LazyDataModelDict):
+                test = value.materialize()
+            else:
+                test = value
+            if query.match(test):
+                matching.append(value)
+        return matching
+
+    def materialize(self) -> DataModelDict:
+        """
+        Builds the entire element.
+
+        Returns
+        -------
+        DataModelDict
+            The element's content.
+        """
+        if self.format == 'json':
+            self.__find_end()
+            return self.__build_json(self.__start, self.__end, lazy=False)
+
+        model = DataModelDict()
+        for key in self:
+            value = self[key]
+            if isinstance(value, LazyDataModelDict):
+                value = value.materialize()
+            elif isinstance(value, list):
+                value = [v.materialize() if isinstance(v, LazyDataModelDict) else v
+                         for v in value]
+            model[key] = value
+        return model
+
+    def __gen_values(self, key:str, pattern) -> Generator[Any, None, None]:
+        """
+        Internal method that yields the values of key at any level in
+        document order, skipping members whose content does not match
+        pattern.
+        """
+        content = self.__source['content']
+        self.__scan()
+        for k, span in self.__spans.items():
+            if k != key and pattern is not None and not self.__span_matches(pattern, span):
+                continue
+
+            value = self[k]
+            if k == key:
+                if isinstance(value, list):
+                    yield from value
+                else:
+                    yield value
+
+            for v in value if isinstance(value, list) else (value,):
+                if isinstance(v, LazyDataModelDict):
+                    yield from v.__gen_values(key, pattern)
+                elif isinstance(v, dict):
+                    yield from v.iterfinds(key)
+
+    def __span_matches(self, pattern, span) -> bool:
+        """
+        Internal method that tests if pattern is found in a member's
+        content.
+        """
+        content = self.__source['content']
+        if isinstance(span, list):
+            return any(pattern.search(content, s, e) is not None for s, e in span)
+        elif isinstance(span, tuple):
+            return pattern.search(content, span[0], span[1]) is not None
+
+        # Attribute and text values
+        return False
+
+    def __key_pattern(self, key:str):
+        """
+        Internal method that compiles a pattern that any content containing
+        key must match, or returns None if the content cannot be filtered.
+        """
+        if not isinstance(key, str):
+            return None
+
+        if self.format == 'json':
+            # Keys containing escaped characters may be written differently
+            token = json.dumps(key)
+            if not key.isascii() or token[1:-1] != key:
+                return None
+            return re.compile(re.escape(token.encode()) + rb'[ \t\n\r]*:')
+
+        else:
+            # Attributes and text values are only found by building elements
+            if key[:1] in ('@', '#'):
+                return None
+            encoding = self.__source['encoding'] or 'UTF-8'
+            try:
+                name = key.encode(encoding)
+            except (UnicodeEncodeError, LookupError):
+                return None
+            return re.compile(rb'<' + re.escape(name) + rb'[ \t\n\r/>]')
+
+    def __scan(self, key:Optional[str]=None):
+        """
+        Internal method that scans the content of the element to record the
+        spans of its members.  JSON members are scanned only until key is
+        found.
+        """
+        if self.__scanned:
+            return
+        if self.format == 'json':
+            self.__scan_json(key)
+        else:
+            self.__scan_xml()
+
+    def __find_end(self):
+        """
+        Internal method that finds the end of a JSON view's content if it has
+        yet to be found.
+        """
+        if self.__end is None:
+            self.__end = skip_json(self.__source['content'], self.__start)
+
+    def __build(self, span):
+        """Internal method that builds the value of a member."""
+        if self.format == 'json':
+            return self.__build_json(*span)
+
+        # XML children with repeated names are lists
+        if isinstance(span, list):
+            if len(span) == 1:
+                return self.__build_xml(*span[0])
+            return [self.__build_xml(*s) for s in span]
+
+        # XML attribute and text values are stored already converted
+        return span.value
+
+    def __scan_json(self, key:Optional[str]=None):
+        """
+        Internal method that scans the members of a JSON object until key is
+        found, or to the end if key is None.
+        """
+        source = self.__source
+        content = source['content']
+
+        # Find the end of a large member left unfinished by the last scan
+        if self.__pending is not None:
+            start = self.__spans[self.__pending][0]
+            self.__pos = skip_json(content, start)
+            self.__spans[self.__pending] = (start, self.__pos)
+            self.__pending = None
+
+        pos = self.__pos
+        while True:
+            pos = JSON_SPACE.match(content, pos).end()
+            char = content[pos:pos + 1]
+            if char == b'}':
+                self.__end = pos + 1
+                self.__scanned = True
+                break
+            if len(self.__spans) > 0:
+                if char != b',':
+                    raise ValueError(f'invalid JSON content at byte {pos}')
+                pos = JSON_SPACE.match(content, pos + 1).end()
+
+            # Read the member's name
+            match = JSON_STRING.match(content, pos)
+            if match is None:
+                raise ValueError(f'invalid JSON content at byte {pos}')
+            name = json.loads(match.group())
+            pos = JSON_SPACE.match(content, match.end()).end()
+            if content[pos:pos + 1] != b':':
+                raise ValueError(f'invalid JSON content at byte {pos}')
+
+            # Skip over the member's value.  Where a large value is the key
+            # sought, finding its end is left until needed.
+            start = JSON_SPACE.match(content, pos + 1).end()
+            if name == key:
+                pos = skip_json(content, start, start + source['lazy_size'] + 1)
+            else:
+                pos = skip_json(content, start)
+            self.__values.pop(name, None)
+            if pos is None:
+                self.__spans[name] = (start, None)
+                self.__pending = name
+                pos = start
+                break
+            self.__spans[name] = (start, pos)
+            if name == key:
+                break
+        self.__pos = pos
+
+    def __build_json(self, start:int, end:int, lazy:bool=True) -> Any:
+        """
+        Internal method that builds a JSON value, returning views of large
+        objects.
+        """
+        source = self.__source
+        content = source['content']
+        if end is None:
+            if content[start:start + 1] == b'{':
+                return self.__subelement(source, start, None)
+            end = skip_json(content, start)
+
+        if lazy and end - start > source['lazy_size']:
+            char = content[start:start + 1]
+            if char == b'{':
+                return self.__subelement(source, start, end)
+
+            # Only lists containing objects are built item by item
+            elif char == b'[' and content.find(b'{', start, end) != -1:
+                values = []
+                pos = JSON_SPACE.match(content, start + 1).end()
+                if content[pos:pos + 1] == b']':
+                    return values
+                while True:
+                    itemend = skip_json(content, pos)
+                    values.append(self.__build_json(pos, itemend))
+                    pos = JSON_SPACE.match(content, itemend).end()
+                    if content[pos:pos + 1] == b']':
+                        return values
+                    if content[pos:pos + 1] != b',':
+                        raise ValueError(f'invalid JSON content at byte {pos}')
+                    pos = JSON_SPACE.match(content, pos + 1).end()
+
+        return json_backends.loads(bytes(content[start:end]),
+                                   dict_constructor = DataModelDict,
+                                   backend = source['backend'])
+
+    def __scan_xml_document(self):
+        """
+        Internal method that locates the root element of XML content.
+        """
+        source = self.__source
+        content = source['content']
+        parser = expat.ParserCreate()
+        root = {}
+
+        def xml_decl(version, encoding, standalone):
+            source['encoding'] = encoding
+
+        def start_element(name, attrs):
+            root['name'] = name
+            root['start'] = parser.CurrentByteIndex
+            raise StopScan()
+
+        parser.XmlDeclHandler = xml_decl
+        parser.StartElementHandler = start_element
+        try:
+            for chunk in iter_chunks(content, 0, len(content)):
+                parser.Parse(chunk, False)
+            parser.Parse(b'', True)
+        except StopScan:
+            pass
+        if 'name' not in root:
+            raise ValueError('no root element found')
+
+        self.__spans[root['name']] = [(root['start'], len(content))]
+        self.__scanned = True
+
+    def __scan_xml(self):
+        """
+        Internal method that records the spans of an XML element's children,
+        along with its converted attribute and text values.
+        """
+        source = self.__source
+        content = source['content']
+        start = self.__start
+        parser = expat.ParserCreate(source['encoding'])
+        postprocessor = xml_postprocessor()
+        spans = OrderedDict()
+        attributes = []
+        text = []
+        depth = 0
+        child = None
+        just_started = False
+
+        def start_element(name, attrs):
+            nonlocal depth, child, just_started
+            depth += 1
+            if depth == 1:
+                attributes.extend(attrs.items())
+            elif depth == 2:
+                child = (name, start + parser.CurrentByteIndex)
+            just_started = True
+
+        def end_element(name):
+            nonlocal depth, just_started
+            if depth == 2:
+                index = start + parser.CurrentByteIndex
+
+                # Empty elements end right after their start tag's '/>'
+                if just_started and content[index - 2:index] == b'/>':
+                    end = index
+                else:
+                    end = content.find(b'>', index) + 1
+                spans.setdefault(child[0], []).append((child[1], end))
+            depth -= 1
+            just_started = False
+
+        def character_data(data):
+            nonlocal just_started
+            if depth == 1:
+                text.append(data)
+            just_started = False
+
+        parser.StartElementHandler = start_element
+        parser.EndElementHandler = end_element
+        parser.CharacterDataHandler = character_data
+        parser.buffer_text = True
+        for chunk in iter_chunks(content, self.__start, self.__end):
+            parser.Parse(chunk, False)
+        parser.Parse(b'', True)
+
+        # Order members like xmltodict: attributes, children then text
+        for name, value in attributes:
+            key, value = postprocessor(None, '@' + name, value)
+            self.__spans[key] = XMLValue(value)
+        self.__spans.update(spans)
+        text = ''.join(text).strip()
+        if text != '':
+            key, value = postprocessor(None, '#text', text)
+            self.__spans[key] = XMLValue(value)
+        self.__scanned = True
+
+    def __build_xml(self, start:int, end:int) -> Any:
+        """
+        Internal method that builds an XML element's value, returning views
+        of large elements that have child elements.
+        """
+        source = self.__source
+        if end - start > source['lazy_size']:
+            view = self.__subelement(source, start, end)
+            view.__scan_xml()
+            if any(isinstance(span, list) for span in view.__spans.values()):
+                return view
+
+        model = xmltodict.parse(bytes(source['content'][start:end]),
+                                encoding = source['encoding'],
+                                postprocessor = xml_postprocessor(),
+                                dict_constructor = DataModelDict)
+        return next(iter(model.values()))
+
+class XMLValue():
+    """Holds an XML attribute or text value recorded during a scan."""
+    __slots__ = ['value']
+
+    def __init__(self, value:Any):
+        self.value = value
+
+def read_content(model:Union[str, bytes, Path, io.IOBase], use_mmap:bool):
+    """
+    Reads content to be accessed lazily.  Buffers are used in place, and file
+    paths are memory-mapped if use_mmap is True and they are not compressed.
+    """
+    if isinstance(model, (bytes, bytearray, mmap.mmap)):
+        return model
+    elif isinstance(model, memoryview):
+        return model.cast('B')
+
+    if use_mmap:
+        try:
+            is_file = isinstance(model, (str, Path)) and Path(model).is_file()
+        except (OSError, ValueError):
+            is_file = False
+        if is_file:
+            with open(model, 'rb') as f:
+                try:
+                    content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    content = None
+
+            # Compressed files are decompressed into memory
+            if content is not None:
+                if identify_compression(content[:6], model) is None:
+                    return content
+                content.close()
+
+    with uber_open_rmode(model) as f:
+        return f.read()
+
+def skip_json(content, pos:int, limit:Optional[int]=None) -> Optional[int]:
+    """
+    Finds the end of the JSON value starting at pos without decoding it.  If
+    limit is given, None is returned for objects and lists that extend past
+    limit.
+    """
+    char = content[pos:pos + 1]
+    if char == b'"':
+        match = JSON_STRING.match(content, pos)
+        if match is not None:
+            return match.end()
+
+    elif char == b'{' or char == b'[':
+        match = JSON_LEAF.match(content, pos)
+        if match is not None:
+            return match.end()
+
+        # Only brackets of nested objects and lists are handled one at a time
+        if limit is None:
+            limit = len(content)
+        depth = 0
+        while pos < limit:
+            if char == b'{' or char == b'[':
+                depth += 1
+            elif char == b'}' or char == b']':
+                depth -= 1
+                if depth == 0:
+                    return pos + 1
+            else:
+                break
+            pos = JSON_FLAT.match(content, pos + 1, limit).end()
+            char = content[pos:pos + 1]
+
+        # Content cut off by limit is checked when skipped in full
+        if limit < len(content):
+            return None
+
+    else:
+        match = JSON_SCALAR.match(content, pos)
+        if match is not None:
+            return match.end()
+
+    raise ValueError(f'invalid JSON content at byte {pos}')
+
+def iter_chunks(content, start:int, end:int, chunksize:int=65536
+                ) -> Generator[bytes, None, None]:
+    """Yields content from start to end in chunks."""
+    for pos in range(start, end, chunksize):
+        yield bytes(content[pos:min(pos + chunksize, end)])
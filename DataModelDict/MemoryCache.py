@@ -0,0 +1,328 @@
+"""MemoryCache class for reusing loaded files within a process."""
+
+# Standard Python libraries
+import sys
+import copy
+import threading
+from pathlib import Path
+from functools import partial
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Union, Optional, Any, Callable
+
+# Local imports
+from .DataModelDict import DataModelDict
+from .flatpickle import flatten, unflatten
+
+class MemoryCache():
+    """
+    A least recently used cache of loaded files kept in memory, for services
+    that load the same files over and over.  Each entry is checked against
+    the file's current size and modification time, so edited files are
+    loaded again.  Entries are kept as flattened snapshots (see flatten())
+    that independent copies are rebuilt from quickly, and read-only views of
+    a single shared copy can be asked for instead.  The cache is limited by
+    the number of entries and/or their estimated size in bytes, and counts
+    hits, misses and evictions for monitoring.  It can be shared by threads.
+    """
+
+    def __init__(self, max_entries:Optional[int]=128,
+                 max_size:Optional[int]=None):
+        """
+        Initializes a MemoryCache.
+
+        Parameters
+        ----------
+        max_entries : int or None, optional
+            The number of entries to keep.  If None, the number is not
+            limited.  Default value is 128.
+        max_size : int or None, optional
+            The estimated total size in bytes of the entries to keep.  If
+            None (default), the size is not limited.
+        """
+        self.__max_entries = max_entries
+        self.__max_size = max_size
+        self.__entries = OrderedDict()
+        self.__size = 0
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def __repr__(self) -> str:
+        return (f'MemoryCache(max_entries={self.max_entries}, '
+                f'max_size={self.max_size})')
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    @property
+    def max_entries(self) -> Optional[int]:
+        """int or None: The number of entries to keep."""
+        return self.__max_entries
+
+    @property
+    def max_size(self) -> Optional[int]:
+        """int or None: The estimated total size in bytes of the entries to keep."""
+        return self.__max_size
+
+    @property
+    def size(self) -> int:
+        """int: The estimated total size in bytes of the entries."""
+        return self.__size
+
+    @property
+    def stats(self) -> dict:
+        """dict: The numbers of hits, misses and evictions, entries and size."""
+        with self.__lock:
+            return {'hits': self.__hits,
+                    'misses': self.__misses,
+                    'evictions': self.__evictions,
+                    'entries': len(self.__entries),
+                    'size': self.__size}
+
+    def load(self, path:Union[str, Path], parse:Optional[Callable[[], Any]]=None,
+             options:tuple=(), readonly:bool=False) -> Any:
+        """
+        Returns the cached value for a file, or calls parse and caches the
+        value if there is no entry or the file has changed.
+
+        Parameters
+        ----------
+        path : str or Path
+            The file that parse reads.
+        parse : callable or None, optional
+            Called with no arguments to parse the file.  If None (default),
+            the file is loaded as a DataModelDict, sharing the entry with
+            DataModelDict.load() given this cache without format or types.
+        options : tuple, optional
+            Any options that parse depends on.  Values parsed with different
+            options are cached separately.
+        readonly : bool, optional
+            If False (default), an independent copy of the value is returned
+            that can be changed freely.  If True, a ReadOnlyView of a copy
+            shared by all readonly loads is returned, which avoids copying.
+
+        Returns
+        -------
+        any
+            The parsed value, as a copy or ReadOnlyView.
+        """
+        path = Path(path).resolve()
+        if parse is None:
+            parse = partial(DataModelDict, path)
+        key = (str(path), options)
+        stat = path.stat()
+
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry.matches(stat):
+                self.__entries.move_to_end(key)
+                self.__hits += 1
+            else:
+                entry = None
+                self.__misses += 1
+
+        # Parse outside of the lock so other files can be read meanwhile
+        if entry is None:
+            entry = CacheEntry(parse(), stat)
+            with self.__lock:
+                old = self.__entries.pop(key, None)
+                if old is not None:
+                    self.__size -= old.size
+                self.__entries[key] = entry
+                self.__size += entry.size
+                self.__evict()
+
+        if readonly:
+            return entry.view()
+        return entry.copy()
+
+    def clear(self):
+        """Removes all entries.  The counters are kept."""
+        with self.__lock:
+            self.__entries.clear()
+            self.__size = 0
+
+    def __evict(self):
+        """
+        Internal method that removes the least recently used entries while
+        either limit is exceeded.  The newest entry is always kept.
+        """
+        while len(self.__entries) > 1:
+            if self.max_entries is not None and len(self.__entries) > self.max_entries:
+                pass
+            elif self.max_size is not None and self.__size > self.max_size:
+                pass
+            else:
+                break
+            key, entry = self.__entries.popitem(last=False)
+            self.__size -= entry.size
+            self.__evictions += 1
+
+class CacheEntry():
+    """Holds a cached value along with the file state it was loaded from."""
+    __slots__ = ['file_size', 'mtime', 'snapshot', 'value', 'size', '__weakref__']
+
+    def __init__(self, value:Any, stat):
+        self.file_size = stat.st_size
+        self.mtime = stat.st_mtime_ns
+
+        # Keep a flattened snapshot when possible, and otherwise the value
+        self.snapshot = flatten(value) if isinstance(value, dict) else None
+        if self.snapshot is not None:
+            self.value = None
+            self.size = estimate_size(self.snapshot)
+        else:
+            self.value = value
+            self.size = estimate_size(value)
+
+    def matches(self, stat) -> bool:
+        """Checks if the file is unchanged."""
+        return stat.st_size == self.file_size and stat.st_mtime_ns == self.mtime
+
+    def copy(self) -> Any:
+        """Returns an independent copy of the value."""
+        if self.snapshot is None:
+            return copy.deepcopy(self.value)
+        args = list(self.snapshot)
+        args[-2] = list(args[-2])
+        return unflatten(*args)
+
+    def view(self) -> 'ReadOnlyView':
+        """Returns a read-only view of a value shared by all views."""
+        if self.value is None:
+            self.value = self.copy()
+        return readonly(self.value)
+
+def estimate_size(var:Any) -> int:
+    """
+    Estimates the memory used by var and the containers and values in it.
+    Objects found more than once are counted once.
+    """
+    seen = set()
+    total = 0
+    stack = [var]
+    while len(stack) > 0:
+        var = stack.pop()
+        if id(var) in seen:
+            continue
+        seen.add(id(var))
+        total += sys.getsizeof(var)
+        if isinstance(var, dict):
+            stack.extend(var.keys())
+            stack.extend(var.values())
+        elif isinstance(var, (list, tuple)):
+            stack.extend(var)
+    return total
+
+def readonly(value:Any) -> Any:
+    """
+    Wraps dicts in ReadOnlyViews and lists in tuples so that value cannot be
+    changed.  Other values are returned as is.
+    """
+    if isinstance(value, dict):
+        return ReadOnlyView(value)
+    elif isinstance(value, list):
+        return tuple(readonly(v) for v in value)
+    return value
+
+def plainpaths(name:str, result:Any) -> Any:
+    """
+    Converts the PathCursors returned by a path method of DataModelDict to
+    plain path lists.
+
+    Parameters
+    ----------
+    name : str
+        The name of the method.
+    result : any
+        The method's result.
+
+    Returns
+    -------
+    any
+        The result with each PathCursor given as a list.
+    """
+    if name == 'path':
+        return list(result)
+    elif name == 'paths':
+        return [list(path) for path in result]
+    elif name == 'iterpaths':
+        return (list(path) for path in result)
+    return {key: [list(path) for path in paths] for key, paths in result.items()}
+
+class ReadOnlyView(Mapping):
+    """
+    A read-only view of a DataModelDict.  Values are returned as
+    ReadOnlyViews and lists as tuples, and the search and output methods of
+    DataModelDict are available.  Use copy() to get a DataModelDict that can
+    be changed.
+    """
+
+    # DataModelDict methods whose results are made read-only
+    VALUE_METHODS = ('find', 'finds', 'aslist', 'finds_many')
+    VALUE_GENERATORS = ('iterfinds', 'iteraslist')
+    PATH_VALUE_GENERATORS = ('select',)
+
+    # DataModelDict methods whose PathCursors are given as plain path lists,
+    # as cursors can change the cached element through value
+    PATH_METHODS = ('path', 'paths', 'iterpaths', 'paths_many')
+
+    # DataModelDict methods whose results do not need to be
+    SAFE_METHODS = ('json', 'xml', 'build_index')
+
+    def __init__(self, model:dict):
+        """
+        Parameters
+        ----------
+        model : DataModelDict
+            The element to view.
+        """
+        self.__model = model
+
+    def __repr__(self) -> str:
+        return f'ReadOnlyView({self.__model!r})'
+
+    def __getitem__(self, key:Union[str, list]) -> Any:
+        return readonly(self.__model[key])
+
+    def __iter__(self):
+        return iter(self.__model)
+
+    def __len__(self) -> int:
+        return len(self.__model)
+
+    def __contains__(self, key:Any) -> bool:
+        return key in self.__model
+
+    def __eq__(self, other:Any) -> bool:
+        if isinstance(other, ReadOnlyView):
+            other = other.__model
+        return self.__model == other
+
+    def __ne__(self, other:Any) -> bool:
+        return not self == other
+
+    __hash__ = None
+
+    def __getattr__(self, name:str) -> Any:
+        if name in self.VALUE_METHODS:
+            method = getattr(self.__model, name)
+            return lambda *args, **kwargs: readonly(method(*args, **kwargs))
+        elif name in self.VALUE_GENERATORS:
+            method = getattr(self.__model, name)
+            return lambda *args, **kwargs: (readonly(v) for v in method(*args, **kwargs))
+        elif name in self.PATH_VALUE_GENERATORS:
+            method = getattr(self.__model, name)
+            return lambda *args, **kwargs: ((p, readonly(v)) for p, v in method(*args, **kwargs))
+        elif name in self.PATH_METHODS:
+            method = getattr(self.__model, name)
+            return lambda *args, **kwargs: plainpaths(name, method(*args, **kwargs))
+        elif name in self.SAFE_METHODS:
+            return getattr(self.__model, name)
+        raise AttributeError(f"'ReadOnlyView' object has no attribute '{name}'")
+
+    def copy(self) -> DataModelDict:
+        """Returns a deep copy of the element that can be changed."""
+        return copy.deepcopy(self.__model)
@@ -0,0 +1,135 @@
+"""PathCursor class for repeated access to one location in a DataModelDict."""
+
+# Standard Python libraries
+from typing import Union, Any
+
+# Local imports
+from .parsepath import parsepath
+from .KeyIndex import mark_modified, resolve_parent
+
+class PathCursor(list):
+    """
+    A path list that also holds a direct reference to the container of the
+    element it leads to.  Reading and writing through value does not walk
+    the path again.  As a list, a PathCursor can be used anywhere a path list
+    is accepted.
+    """
+
+    def __init__(self, root:dict, path:Union[str, list],
+                 parent:Union[dict, list, None]=None):
+        """
+        Initializes a PathCursor by resolving path once.
+
+        Parameters
+        ----------
+        root : DataModelDict
+            The top-level element that path starts from.
+        path : str or list
+            The path list, or a path string that is parsed using parsepath().
+        parent : dict, list or None, optional
+            The container of the element, if it is already known.  If given,
+            it is used as is rather than resolving path.
+
+        Raises
+        ------
+        ValueError
+            If path is empty.
+        KeyError, IndexError
+            If path does not lead to an existing element.
+        """
+        if isinstance(path, str):
+            path = parsepath(path)
+        list.__init__(self, path)
+        if len(self) == 0:
+            raise ValueError('path cannot be empty')
+
+        self.__root = root
+        if parent is not None:
+            self.__parent = parent
+        else:
+            self.__parent = self.__resolve()
+
+            # Check that the element exists
+            self.__parent[self[-1]]
+
+    def __resolve(self):
+        """Walks the path from root and returns the parent container."""
+        parent = self.__root
+        for k in self[:-1]:
+            parent = parent[k]
+        return parent
+
+    @property
+    def root(self) -> dict:
+        """DataModelDict: The top-level element that the path starts from."""
+        return self.__root
+
+    @property
+    def parent(self) -> Union[dict, list]:
+        """dict or list: The container holding the element."""
+        return self.__parent
+
+    @property
+    def key(self) -> Union[str, int]:
+        """str or int: The element's key or index in parent."""
+        return self[-1]
+
+    @property
+    def value(self) -> Any:
+        """any: The element's value, accessed directly from parent."""
+        return self.__parent[self[-1]]
+
+    @value.setter
+    def value(self, value:Any):
+        # Changes to lists are marked on the dict holding them to keep any
+        # key index current
+        if isinstance(self.__parent, list):
+            parent, holder = resolve_parent(self.__root, self)
+            mark_modified(holder)
+        self.__parent[self[-1]] = value
+
+    def is_stale(self) -> bool:
+        """
+        Checks if the path no longer leads from root to the same parent
+        container, i.e. if the tree has been changed above the element.
+
+        Returns
+        -------
+        bool
+            True if the cursor no longer refers to the element at path.
+        """
+        try:
+            parent = self.__resolve()
+            parent[self[-1]]
+        except (KeyError, IndexError, TypeError):
+            return True
+        return parent is not self.__parent
+
+    def refresh(self):
+        """
+        Resolves the path again from root.
+
+        Raises
+        ------
+        KeyError, IndexError
+            If path does not lead to an existing element.
+        """
+        parent = self.__resolve()
+        parent[self[-1]]
+        self.__parent = parent
+
+    def __copy__(self) -> 'PathCursor':
+        """Copies of a cursor refer to the same tree."""
+        cursor = list.__new__(type(self))
+        list.__init__(cursor, self)
+        cursor.__root = self.__root
+        cursor.__parent = self.__parent
+        return cursor
+
+    def __deepcopy__(self, memo:dict) -> 'PathCursor':
+        """Deep copies of a cursor copy the path but refer to the same tree."""
+        return self.__copy__()
+
+    def __reduce__(self):
+        """Cursors are pickled as plain path lists."""
+        return (list, (list(self),))
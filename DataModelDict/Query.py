@@ -0,0 +1,160 @@
+"""Query class for compiled DataModelDict search conditions."""
+
+# Standard Python libraries
+import operator
+from itertools import chain, repeat
+from typing import Any, Generator
+
+# Marks keys that are missing from an element
+MISSING = object()
+
+class Query():
+    """
+    Search conditions compiled by DataModelDict.compile_query().  The yes and
+    no terms are grouped by key so that all of them are checked during one
+    walk of each candidate subelement.
+    """
+    
+    def __init__(self, key:str, yes:dict={}, no:dict={}):
+        """
+        Parameters
+        ----------
+        key : str
+            Dictionary key to search for.
+        yes : dict
+            Key-value terms which the subelement must have to be considered a
+            match.
+        no : dict
+            Key-value terms which the subelement must not have to be
+            considered a match.
+        """
+        self.key = key
+        self.yes = dict(yes)
+        self.no = dict(no)
+        
+        # Map condition keys to their yes and no values
+        self.__conditions = {}
+        for k in chain(self.yes, self.no):
+            self.__conditions[k] = (self.yes.get(k, MISSING), self.no.get(k, MISSING))
+    
+    def __repr__(self) -> str:
+        return f'Query({self.key!r}, yes={self.yes!r}, no={self.no!r})'
+    
+    def match(self, subelement:Any) -> bool:
+        """
+        Tests if a subelement meets the yes and no conditions.
+        
+        Parameters
+        ----------
+        subelement : any
+            The subelement to test.
+        
+        Returns
+        -------
+        bool
+            True if every yes term and no no term is found at any level of
+            subelement.
+        """
+        conditions = self.__conditions
+        if len(conditions) == 0:
+            return True
+        if not isinstance(subelement, dict):
+            return len(self.yes) == 0
+        
+        # Walk the dicts one level at a time, only looking up the condition
+        # keys that can still change the result in each
+        keys = list(conditions)
+        missing = len(self.yes)
+        decided = len(self.no) == 0
+        level = [subelement]
+        while len(level) > 0 and len(keys) > 0:
+            children = []
+            for element in level:
+                for k in keys:
+                    v = dict.get(element, k, MISSING)
+                    if v is MISSING:
+                        continue
+                    yes_value, no_value = conditions[k]
+                    
+                    # Any no match fails the subelement
+                    if no_value is not MISSING:
+                        if isinstance(v, list):
+                            if any(map(operator.eq, v, repeat(no_value))):
+                                return False
+                        elif v == no_value:
+                            return False
+                    
+                    # Found yes terms are not looked for again
+                    if yes_value is not MISSING:
+                        if isinstance(v, list):
+                            found = any(map(operator.eq, v, repeat(yes_value)))
+                        else:
+                            found = v == yes_value
+                        if found:
+                            conditions = dict(conditions)
+                            conditions[k] = (MISSING, no_value)
+                            if no_value is MISSING:
+                                keys = [key for key in keys if key != k]
+                            missing -= 1
+                            
+                            # Stop once all yes terms are found if there are no no terms
+                            if decided and missing == 0:
+                                return True
+                
+                # The next level is the dicts in the values and in list values
+                for v in dict.values(element):
+                    if isinstance(v, dict):
+                        children.append(v)
+                    elif isinstance(v, list):
+                        children.extend([item for item in v if isinstance(item, dict)])
+            level = children
+        
+        return missing == 0
+    
+    def run(self, model:'DataModelDict') -> list:
+        """
+        Finds the values of all matching subelements in a model.
+        
+        Parameters
+        ----------
+        model : DataModelDict
+            The model to search.
+        
+        Returns
+        -------
+        list
+            The values of any matching subelements.
+        """
+        return model.finds(self)
+    
+    def iterrun(self, model:'DataModelDict') -> Generator[Any, None, None]:
+        """
+        Iterates over the values of all matching subelements in a model.
+        
+        Parameters
+        ----------
+        model : DataModelDict
+            The model to search.
+        
+        Yields
+        ------
+        any
+            The values of any matching subelements.
+        """
+        yield from model.iterfinds(self)
+    
+    def paths(self, model:'DataModelDict') -> list:
+        """
+        Finds the path lists of all matching subelements in a model.
+        
+        Parameters
+        ----------
+        model : DataModelDict
+            The model to search.
+        
+        Returns
+        -------
+        list
+            The path lists for any matching subelements.
+        """
+        return model.paths(self)
@@ -0,0 +1,200 @@
+"""Selector class for wildcard path patterns within a DataModelDict."""
+
+# Standard Python libraries
+from functools import lru_cache
+from typing import Any, Generator, Tuple
+
+# Local imports
+from .parsepath import PATH_CACHE_SIZE
+from .KeyPath import KeyPath
+
+# Step kinds of a compiled pattern
+KEY = 0
+ANY_KEY = 1
+INDEX = 2
+ANY_INDEX = 3
+ANY_DEPTH = 4
+
+# Marks keys that are missing from an element
+MISSING = object()
+
+class Selector():
+    """
+    A wildcard path pattern for DataModelDict.select().  Patterns use the
+    same syntax as parsepath(), with three wildcards:
+
+    - '*' in place of a key matches every key of an element.
+    - '[*]' in place of a list index matches every item of a list.  Like
+      aslist(), a value that is not a list is matched as its only item.
+    - '**' in place of a key matches any number of levels, including none,
+      of keys and list items.
+
+    The pattern is compiled into steps so that only the branches of a model
+    that can match are walked.
+    """
+
+    def __init__(self, pattern:str, delimiter:str='.', openbracket:str='[',
+                 closebracket:str=']'):
+        """
+        Parameters
+        ----------
+        pattern : str
+            The path pattern.
+        delimiter : str
+            The delimiter between subsequent element names.
+        openbracket : str
+            The opening indicator of list indices.
+        closebracket : str
+            The closing indicator of list indices.
+
+        Raises
+        ------
+        ValueError
+            If pattern is empty or has an index that is not an int or '*'.
+        """
+        self.pattern = pattern
+        self.__delimiters = (delimiter, openbracket, closebracket)
+
+        steps = []
+        for field in pattern.split(delimiter):
+
+            # Split the name from any bracketed indices
+            name, *indices = field.split(openbracket)
+            if name == '**':
+                if len(steps) == 0 or steps[-1][0] != ANY_DEPTH:
+                    steps.append((ANY_DEPTH, None))
+            elif name == '*':
+                steps.append((ANY_KEY, None))
+            else:
+                steps.append((KEY, name))
+
+            for index in indices:
+                if index[-len(closebracket):] != closebracket:
+                    raise ValueError(f'invalid pattern {pattern!r}: unclosed index')
+                index = index[:-len(closebracket)]
+                if index == '*':
+                    steps.append((ANY_INDEX, None))
+                else:
+                    try:
+                        steps.append((INDEX, int(index)))
+                    except ValueError:
+                        raise ValueError(f'invalid pattern {pattern!r}: index {index!r} is not an int or *') from None
+
+        if pattern == '':
+            raise ValueError('pattern cannot be empty')
+        self.__steps = tuple(steps)
+
+        # Values can be reached more than one way after '**' if it is
+        # followed by another '**' or by '[*]', which also matches non-lists
+        kinds = [step[0] for step in steps]
+        self.__unique = (ANY_DEPTH in kinds and
+                         (ANY_DEPTH in kinds[kinds.index(ANY_DEPTH)+1:] or
+                          ANY_INDEX in kinds[kinds.index(ANY_DEPTH)+1:]))
+
+        # Values that are not dicts or lists can only match the steps after
+        # '**' if the rest of the steps are all wildcards that match them
+        self.__leaves = tuple(all(kind in (ANY_INDEX, ANY_DEPTH) for kind in kinds[i+1:])
+                              for i in range(len(kinds)))
+
+    def __repr__(self) -> str:
+        return f'Selector({self.pattern!r})'
+
+    def iterrun(self, model:dict) -> Generator[Tuple[KeyPath, Any], None, None]:
+        """
+        Iterates over the values in a model that match the pattern, in the
+        order they appear in the model.
+
+        Parameters
+        ----------
+        model : DataModelDict
+            The model to search.
+
+        Yields
+        ------
+        tuple
+            The KeyPath of each matching value and the value.
+        """
+        steps = self.__steps
+        nsteps = len(steps)
+        delimiters = self.__delimiters
+        leaves = self.__leaves
+        seen = set() if self.__unique else None
+
+        # Each state is a value, its path terms and the next step to match
+        stack = [(model, (), 0)]
+        while len(stack) > 0:
+            value, terms, i = stack.pop()
+
+            if i == nsteps:
+                # Values reached more than one way are given once
+                if seen is not None:
+                    if terms in seen:
+                        continue
+                    seen.add(terms)
+                yield KeyPath(terms, *delimiters), value
+                continue
+
+            kind, arg = steps[i]
+            if kind == KEY:
+                if isinstance(value, dict):
+                    child = dict.get(value, arg, MISSING)
+                    if child is not MISSING:
+                        stack.append((child, terms + (arg,), i + 1))
+
+            elif kind == ANY_KEY:
+                if isinstance(value, dict):
+                    stack.extend([(child, terms + (k,), i + 1)
+                                  for k, child in reversed(value.items())])
+
+            elif kind == INDEX:
+                if isinstance(value, list) and -len(value) <= arg < len(value):
+                    stack.append((value[arg], terms + (arg,), i + 1))
+
+            elif kind == ANY_INDEX:
+                if isinstance(value, list):
+                    stack.extend([(value[j], terms + (j,), i + 1)
+                                  for j in range(len(value) - 1, -1, -1)])
+                else:
+                    stack.append((value, terms, i + 1))
+
+            else:
+                # Descend one more level, after matching the rest here
+                if isinstance(value, dict):
+                    if leaves[i]:
+                        stack.extend([(child, terms + (k,), i)
+                                      for k, child in reversed(value.items())])
+                    else:
+                        stack.extend([(child, terms + (k,), i)
+                                      for k, child in reversed(value.items())
+                                      if isinstance(child, (dict, list))])
+                elif isinstance(value, list):
+                    stack.extend([(value[j], terms + (j,), i)
+                                  for j in range(len(value) - 1, -1, -1)
+                                  if leaves[i] or isinstance(value[j], (dict, list))])
+                stack.append((value, terms, i + 1))
+
+    def run(self, model:dict) -> list:
+        """
+        Finds the values in a model that match the pattern.
+
+        Parameters
+        ----------
+        model : DataModelDict
+            The model to search.
+
+        Returns
+        -------
+        list
+            The KeyPath of each matching value and the value.
+        """
+        return list(self.iterrun(model))
+
+@lru_cache(maxsize=PATH_CACHE_SIZE)
+def compile_selector(pattern:str, delimiter:str='.', openbracket:str='[',
+                     closebracket:str=']') -> Selector:
+    """
+    Gives the Selector for a path pattern, keeping the most recently used
+    Selectors so that repeated patterns are only compiled once.  See
+    Selector.
+    """
+    return Selector(pattern, delimiter, openbracket, closebracket)
@@ -1,6 +1,7 @@
 # coding: utf-8
 from importlib import resources
-__all__ = ['DataModelDict', 'uber_open_rmode', 'parsepath', 'joinpath']
+__all__ = ['DataModelDict', 'CompactDataModelDict', 'LazyDataModelDict', 'PathCursor', 'KeyPath', 'compile_path', 'Selector', 'compile_selector', 'DiskCache', 'MemoryCache', 'ReadOnlyView', 'uber_open_rmode', 'parsepath', 'joinpath',
+           'available_json_backends', 'get_json_backend', 'set_json_backend']
 
 # Read version from VERSION file
 if hasattr(resources, 'files'):
@@ -12,4 +13,11 @@ else:
 from .uber_open_rmode import uber_open_rmode
 from .parsepath import parsepath
 from .joinpath import joinpath
-from .DataModelDict import DataModelDict
\ No newline at end of file
+from .PathCursor import PathCursor
+from .KeyPath import KeyPath, compile_path
+from .Selector import Selector, compile_selector
+from .DiskCache import DiskCache
+from .json_backends import available_json_backends, get_json_backend, set_json_backend
+from .DataModelDict import DataModelDict, CompactDataModelDict
+from .LazyDataModelDict import LazyDataModelDict
+from .MemoryCache import MemoryCache, ReadOnlyView
\ No newline at end of file
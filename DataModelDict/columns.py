@@ -0,0 +1,301 @@
+"""Functions for converting repeated subelements to and from NumPy columns."""
+
+# Standard Python libraries
+import math
+from collections import deque
+from functools import partial
+from itertools import repeat, starmap
+from typing import Any, Callable
+
+# https://numpy.org
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Local imports
+from .parsepath import parsepath
+from .json_backends import base_setitem
+
+# Marks values that are missing from an element
+MISSING = object()
+
+def require_numpy():
+    """
+    Checks that NumPy is installed.
+
+    Raises
+    ------
+    ImportError
+        If NumPy is not installed.
+    """
+    if np is None:
+        raise ImportError('NumPy is required for columns: pip install numpy')
+
+def field_paths(fields:dict) -> dict:
+    """
+    Gives the path lists for column fields.
+
+    Parameters
+    ----------
+    fields : dict
+        Maps column names to the paths of values within each element, as
+        path lists, or path strings that are parsed using parsepath().
+
+    Returns
+    -------
+    dict
+        Maps column names to path lists.
+    """
+    paths = {}
+    for name, path in fields.items():
+        if isinstance(path, str):
+            path = parsepath(path)
+        elif not isinstance(path, (list, tuple)):
+            raise TypeError(f'path for field {name!r} must be a str or list')
+        paths[name] = list(path)
+    return paths
+
+def field_getter(path:list, fill:Any=None) -> Callable[[Any], Any]:
+    """
+    Compiles a path into a function that gets the value at path in an
+    element, using dict.get() and list indexing directly.
+
+    Parameters
+    ----------
+    path : list
+        The path list of keys and list indices within each element.
+    fill : any, optional
+        The value returned if the path is missing.  Default value is None.
+
+    Returns
+    -------
+    function
+        Takes an element and returns the value at path or fill.
+    """
+    # Single keys, the most common field, are looked up directly
+    if len(path) == 1 and not isinstance(path[0], int):
+        key = path[0]
+        def get(element):
+            if isinstance(element, dict):
+                return dict.get(element, key, fill)
+            return fill
+        return get
+
+    # Paths of keys chain dict.get() calls, which fail for values that are
+    # not dicts, including MISSING
+    if not any(isinstance(key, int) for key in path):
+        path = tuple(path)
+        def get(element):
+            try:
+                for key in path:
+                    element = dict.get(element, key, MISSING)
+            except TypeError:
+                return fill
+            if element is MISSING:
+                return fill
+            return element
+        return get
+
+    path = tuple(path)
+    def get(element):
+        value = element
+        for key in path:
+            if isinstance(key, int):
+                if isinstance(value, list) and -len(value) <= key < len(value):
+                    value = value[key]
+                else:
+                    return fill
+            elif isinstance(value, dict):
+                value = dict.get(value, key, MISSING)
+                if value is MISSING:
+                    return fill
+            else:
+                return fill
+        return value
+    return get
+
+def column_values(elements:list, path:list) -> list:
+    """
+    Gets the values at path in each element, one level of the path at a
+    time for all elements.  Values that are missing are given as MISSING.
+
+    Parameters
+    ----------
+    elements : list
+        The elements to get values from.
+    path : list
+        The path list of keys and list indices within each element.
+
+    Returns
+    -------
+    list
+        The value for each element.
+    """
+    values = elements
+    for key in path:
+        if isinstance(key, int):
+            values = [v[key] if isinstance(v, list) and -len(v) <= key < len(v) else MISSING
+                      for v in values]
+        else:
+            values = [dict.get(v, key, MISSING) if isinstance(v, dict) else MISSING
+                      for v in values]
+    return values
+
+def column_array(values:list, dtype:Any=None, fill:Any=MISSING) -> 'np.ndarray':
+    """
+    Builds a NumPy array from column values.
+
+    Parameters
+    ----------
+    values : list
+        The column values, with MISSING for missing values.
+    dtype : data-type or None, optional
+        The array's dtype.  If None (default), bool, int, float or str is
+        used if all values have that type, float if they are ints and
+        floats, and object otherwise.
+    fill : any, optional
+        The value that missing values are replaced with.  If not given,
+        missing values are NaN if all other values are numbers and the
+        dtype is not given, and None otherwise.
+
+    Returns
+    -------
+    numpy.ndarray
+        The column.
+    """
+    nmissing = values.count(MISSING) if len(values) > 0 else 0
+    kinds = set(map(type, values))
+    kinds.discard(type(MISSING))
+
+    # Infer the dtype from the types of the values
+    if dtype is None:
+        if len(kinds) == 0:
+            dtype = float if fill is MISSING else object
+        elif kinds == {bool}:
+            dtype = bool
+        elif kinds == {int}:
+            dtype = int
+        elif kinds <= {int, float}:
+            dtype = float
+        elif kinds == {str}:
+            dtype = str
+        else:
+            dtype = object
+
+        # Missing numbers are NaN unless a fill is given
+        if nmissing > 0 and fill is MISSING:
+            if dtype is int or dtype is float:
+                dtype = float
+                fill = math.nan
+            else:
+                dtype = object
+
+        # Missing values or fills of another type need object columns
+        elif nmissing > 0 and dtype is not object and type(fill) not in kinds:
+            if not (dtype is float and type(fill) in (int, float)):
+                dtype = object
+
+    if nmissing > 0:
+        if fill is MISSING:
+            fill = None
+        values = [fill if v is MISSING else v for v in values]
+
+    # Build the array, or an object array if ints are out of range
+    if np.dtype(dtype) != object:
+        try:
+            return np.array(values, dtype=dtype)
+        except OverflowError:
+            if dtype is not int:
+                raise
+
+    # Object arrays are filled item by item so list values are kept as is
+    return np.fromiter(values, dtype=object, count=len(values))
+
+def structured_array(columns:dict) -> 'np.ndarray':
+    """
+    Combines equal-length column arrays into a structured array.
+
+    Parameters
+    ----------
+    columns : dict
+        Maps field names to arrays.
+
+    Returns
+    -------
+    numpy.ndarray
+        The structured array.
+    """
+    length = len(next(iter(columns.values()))) if len(columns) > 0 else 0
+    array = np.empty(length, dtype=[(name, column.dtype) for name, column in columns.items()])
+    for name, column in columns.items():
+        array[name] = column
+    return array
+
+def build_records(cls:type, fields:dict) -> list:
+    """
+    Builds one element for each row of columns of values.  All elements of
+    each level of the fields' paths are created and filled together rather
+    than one element at a time.
+
+    Parameters
+    ----------
+    cls : type
+        The DataModelDict class to build the elements with.
+    fields : dict
+        Maps the path of each field within the elements, as a tuple of keys
+        or a path string that is parsed using parsepath(), to a list or
+        array of its values.  Arrays are converted to Python values with
+        tolist().
+
+    Returns
+    -------
+    list
+        The elements.
+
+    Raises
+    ------
+    ValueError
+        If the columns differ in length, a path is empty or has list
+        indices, or a path is given twice or inside another field.
+    """
+    new = partial(cls.__new__, cls)
+    setitem = base_setitem(cls)
+
+    # Check the paths and columns
+    columns = []
+    length = None
+    for path, values in fields.items():
+        if isinstance(path, str):
+            path = parsepath(path)
+        if len(path) == 0 or any(not isinstance(key, str) for key in path):
+            raise ValueError(f'invalid field path {path!r}: paths must be keys')
+        if hasattr(values, 'tolist'):
+            values = values.tolist()
+        elif not isinstance(values, list):
+            values = list(values)
+        if length is None:
+            length = len(values)
+        elif len(values) != length:
+            raise ValueError('all columns must have the same length')
+        columns.append((tuple(path), values))
+    if length is None:
+        return []
+
+    # Create the elements, then each field's parents and value in turn
+    records = list(starmap(new, repeat((), length)))
+    parents = {(): records}
+    leaves = set()
+    for path, values in columns:
+        if path in parents or path in leaves:
+            raise ValueError(f'field path {list(path)} overlaps another field')
+        leaves.add(path)
+        for i in range(1, len(path)):
+            if path[:i] in leaves:
+                raise ValueError(f'field path {list(path)} overlaps another field')
+            if path[:i] not in parents:
+                children = list(starmap(new, repeat((), length)))
+                deque(map(setitem, parents[path[:i-1]], repeat(path[i-1]), children), 0)
+                parents[path[:i]] = children
+        deque(map(setitem, parents[path[:-1]], repeat(path[-1]), values), 0)
+    return records
@@ -18,22 +18,23 @@ def joinpath(path:list, delimiter:str='.', openbracket:str='[',
     -------
     The path as a delimited string.
     """
-    # Start str as first element of path list
-    pathstr = path[0]
+    # Start with the first element of path list
+    terms = [path[0]]
     
     # Loop over subsequent list elements
-    for i in range(1, len(path)):
+    for term in path[1:]:
         
         # Append str element names using the delimiter
-        if isinstance(path[i], str):
-            pathstr += f'{delimiter}{path[i]}'
+        if isinstance(term, str):
+            terms.append(delimiter)
+            terms.append(term)
             
         # Append int index terms inside the specified brackets
-        elif isinstance(path[i], int):
-            pathstr += f'{openbracket}{path[i]}{closebracket}'
+        elif isinstance(term, int):
+            terms.append(f'{openbracket}{term}{closebracket}')
         
         # Raise error for other element tyles
         else:
             raise TypeError('path fields limited to str names or int indices')
             
-    return pathstr
\ No newline at end of file
+    return ''.join(terms)
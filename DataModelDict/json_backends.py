@@ -0,0 +1,311 @@
+"""Selection of the library used to decode and encode JSON content."""
+
+# Standard Python libraries
+import io
+import re
+import json
+import math
+import codecs
+from functools import partial
+from collections import OrderedDict
+from typing import Optional, Any
+
+# https://github.com/ijl/orjson
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# The backend used when none is given
+JSON_BACKEND = 'json'
+
+# Runs of 19+ digits may be integers outside of the 64-bit range, e.g. below
+# -9223372036854775808, which orjson parses as floats
+LONG_DIGITS = re.compile(rb'[0-9]{19}')
+
+def available_json_backends() -> list:
+    """
+    Lists the JSON backends that can be used.
+
+    Returns
+    -------
+    list of str
+        The names of the installed backends.  'json' is Python's json
+        module and is always available.
+    """
+    backends = ['json']
+    if orjson is not None:
+        backends.append('orjson')
+    return backends
+
+def get_json_backend() -> str:
+    """
+    Returns
+    -------
+    str
+        The name of the JSON backend used when none is given.
+    """
+    return JSON_BACKEND
+
+def set_json_backend(backend:str):
+    """
+    Sets the JSON backend used by DataModelDict.load() and
+    DataModelDict.json() when none is given.
+
+    Parameters
+    ----------
+    backend : str
+        The name of the backend: 'json' for Python's json module or
+        'orjson'.
+
+    Raises
+    ------
+    ValueError
+        If backend is unknown or not installed.
+    """
+    global JSON_BACKEND
+    JSON_BACKEND = resolve_backend(backend)
+
+def resolve_backend(backend:Optional[str]=None) -> str:
+    """
+    Identifies the backend to use.
+
+    Parameters
+    ----------
+    backend : str or None, optional
+        The name of the backend, or None (default) for the value set with
+        set_json_backend().
+
+    Returns
+    -------
+    str
+        The name of an installed backend.
+
+    Raises
+    ------
+    ValueError
+        If backend is unknown or not installed.
+    """
+    if backend is None:
+        return JSON_BACKEND
+    if backend not in ('json', 'orjson'):
+        raise ValueError(f"unknown JSON backend '{backend}'")
+    if backend not in available_json_backends():
+        raise ValueError(f"JSON backend '{backend}' is not installed")
+    return backend
+
+def loads(content:bytes, dict_constructor:type=OrderedDict,
+          backend:Optional[str]=None) -> Any:
+    """
+    Decodes JSON content.  All backends give the same result: objects are
+    built with dict_constructor with their keys in order, integers are
+    parsed as int and decimals as float.  Content that orjson cannot decode
+    identically, such as NaN or integers beyond 64 bits, is decoded with
+    Python's json module.
+
+    Parameters
+    ----------
+    content : bytes, str or bytes-like object
+        The JSON content.  orjson decodes bytearrays and memoryviews in
+        place, while Python's json module is given a bytes copy of a
+        memoryview.
+    dict_constructor : type, optional
+        The dict or OrderedDict subclass to create for each JSON object.
+        Objects are created with __new__() only, and values are set using
+        the dict or OrderedDict base class, so any __init__() and
+        __setitem__() extensions are skipped.  Default value is OrderedDict.
+    backend : str or None, optional
+        The name of the backend to use.  If None (default), the value set
+        with set_json_backend() is used.
+
+    Returns
+    -------
+    any
+        The decoded content.
+    """
+    new = partial(dict_constructor.__new__, dict_constructor)
+    setitem = base_setitem(dict_constructor)
+
+    if resolve_backend(backend) == 'orjson':
+        if isinstance(content, str):
+            data = content.encode('UTF-8', 'surrogatepass')
+        else:
+            data = content
+        if LONG_DIGITS.search(data) is None:
+            try:
+                if dict_constructor is dict:
+                    return orjson.loads(data)
+                return from_plain(orjson.loads(data), new, setitem)
+            except orjson.JSONDecodeError:
+                pass
+
+    def object_pairs_hook(pairs):
+        obj = new()
+        for k, v in pairs:
+            setitem(obj, k, v)
+        return obj
+
+    # Python's json module only takes str, bytes and bytearray
+    if isinstance(content, memoryview):
+        content = content.tobytes()
+
+    return json.loads(content,
+                      object_pairs_hook = object_pairs_hook,
+                      parse_int = int,
+                      parse_float = float)
+
+def dumps(obj:Any, *args, backend:Optional[str]=None, **kwargs) -> str:
+    """
+    Encodes content as JSON.  orjson is only used if no args are given
+    and kwargs are limited to sort_keys and indent of None or 2.  Its
+    output differs from Python's json module in whitespace and in writing
+    non-ASCII characters directly, but decodes to the same content.
+    Content that orjson cannot encode identically, such as NaN or integers
+    beyond 64 bits, is encoded with Python's json module.
+
+    Parameters
+    ----------
+    obj : any
+        The content to encode.
+    *args : any
+        Any other positional arguments accepted by json.dumps.
+    backend : str or None, optional
+        The name of the backend to use.  If None (default), the value set
+        with set_json_backend() is used.
+    **kwargs : any
+        Any other keyword arguments accepted by json.dumps.
+
+    Returns
+    -------
+    str
+        The JSON content.
+    """
+    content = orjson_dumps(obj, args, kwargs, backend)
+    if content is not None:
+        return content.decode('UTF-8')
+    return json.dumps(obj, *args, **kwargs)
+
+def dump(obj:Any, fp:io.IOBase, *args, backend:Optional[str]=None,
+         **kwargs):
+    """
+    Encodes content as JSON to an open file.  See dumps().
+
+    Parameters
+    ----------
+    obj : any
+        The content to encode.
+    fp : file-like object
+        The open file to write to.
+    *args : any
+        Any other positional arguments accepted by json.dump.
+    backend : str or None, optional
+        The name of the backend to use.  If None (default), the value set
+        with set_json_backend() is used.
+    **kwargs : any
+        Any other keyword arguments accepted by json.dump.
+    """
+    content = orjson_dumps(obj, args, kwargs, backend)
+    if content is None:
+        json.dump(obj, fp, *args, **kwargs)
+    elif isinstance(fp, (io.TextIOBase, codecs.StreamWriter)):
+        fp.write(content.decode('UTF-8'))
+    else:
+        fp.write(content)
+
+def orjson_dumps(obj:Any, args:tuple, kwargs:dict,
+                 backend:Optional[str]) -> Optional[bytes]:
+    """
+    Encodes content with orjson if selected and able to, otherwise returns
+    None.
+    """
+    if resolve_backend(backend) != 'orjson' or len(args) > 0:
+        return None
+
+    # Check that all options are supported
+    option = 0
+    for key, value in kwargs.items():
+        if key == 'sort_keys':
+            if value:
+                option |= orjson.OPT_SORT_KEYS
+        elif key == 'indent' and value in (None, 2):
+            if value == 2:
+                option |= orjson.OPT_INDENT_2
+        else:
+            return None
+
+    try:
+        content = orjson.dumps(obj, option=option)
+    except orjson.JSONEncodeError:
+        return None
+
+    # orjson writes NaN and infinity as null
+    if b'null' in content and has_nonfinite(obj):
+        return None
+    return content
+
+def base_setitem(dict_constructor:type):
+    """
+    Returns the __setitem__ of the dict or OrderedDict base of
+    dict_constructor.
+    """
+    for base in dict_constructor.__mro__:
+        if base is OrderedDict or base is dict:
+            return base.__setitem__
+    raise TypeError('dict_constructor must be a dict subclass')
+
+def from_plain(var:Any, new, setitem) -> Any:
+    """
+    Replaces the dicts in decoded content with objects created by new().
+    Lists are updated in place.
+    """
+    if var.__class__ is dict:
+        root = new()
+        stack = [(root, var)]
+    elif var.__class__ is list:
+        root = var
+        stack = [(var, var)]
+    else:
+        return var
+
+    while len(stack) > 0:
+        target, source = stack.pop()
+        if source.__class__ is dict:
+            for k, v in source.items():
+                cls = v.__class__
+                if cls is dict:
+                    obj = new()
+                    stack.append((obj, v))
+                    v = obj
+                elif cls is list:
+                    stack.append((v, v))
+                setitem(target, k, v)
+        else:
+            for i, v in enumerate(source):
+                cls = v.__class__
+                if cls is dict:
+                    obj = new()
+                    stack.append((obj, v))
+                    source[i] = obj
+                elif cls is list:
+                    stack.append((v, v))
+    return root
+
+def has_nonfinite(var:Any) -> bool:
+    """Checks if var contains any NaN or infinite float values."""
+    stack = [var]
+    while len(stack) > 0:
+        var = stack.pop()
+        if isinstance(var, dict):
+            values = var.values()
+        else:
+            values = var
+        for v in values:
+            cls = v.__class__
+            if cls is str or v is None or cls is int or cls is bool:
+                continue
+            elif isinstance(v, float):
+                if not math.isfinite(v):
+                    return True
+            elif isinstance(v, (dict, list, tuple)):
+                stack.append(v)
+    return False
@@ -1,7 +1,14 @@
+# Standard Python libraries
+from functools import lru_cache
+
+# The number of parsed path strings to keep
+PATH_CACHE_SIZE = 4096
+
 def parsepath(pathstr: str, delimiter:str='.', openbracket:str='[',
               closebracket:str=']') -> list:
     """
-    Takes a path as a string and parses it into a list of terms.
+    Takes a path as a string and parses it into a list of terms.  Parsed
+    paths are cached, so repeated paths are only parsed once.
     
     Parameters
     ----------
@@ -19,9 +26,30 @@ def parsepath(pathstr: str, delimiter:str='.', openbracket:str='[',
     list
         The path as a list.
     """
+    return list(cached_parsepath(pathstr, delimiter, openbracket, closebracket))
+
+@lru_cache(maxsize=PATH_CACHE_SIZE)
+def cached_parsepath(pathstr: str, delimiter:str='.', openbracket:str='[',
+                     closebracket:str=']') -> tuple:
+    """
+    Parses a path string into a tuple of terms, keeping the most recently
+    used results.  See parsepath().
+    """
+    return tuple(parse_terms(pathstr, delimiter, openbracket, closebracket))
+
+def parse_terms(pathstr: str, delimiter:str='.', openbracket:str='[',
+                closebracket:str=']') -> list:
+    """
+    Parses a path string into a list of terms without caching.  See
+    parsepath().
+    """
     # Split by delimiter
     path = pathstr.split(delimiter)
     
+    # Paths without list indices are done
+    if openbracket not in pathstr:
+        return path
+    
     # Search for bracketed index values and their insertion positions
     positions = []
     values = []
@@ -67,4 +95,4 @@ def parsepath(pathstr: str, delimiter:str='.', openbracket:str='[',
     for position, value in zip(reversed(positions), reversed(values)):
         path.insert(position, value)
         
-    return path
\ No newline at end of file
+    return path
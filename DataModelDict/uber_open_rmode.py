@@ -1,18 +1,206 @@
 from pathlib import Path
-from typing import Union
+from typing import Union, Optional
 import io
+import mmap
+import gzip
+import bz2
+import lzma
 from contextlib import contextmanager
 
+# Leading magic bytes and file extensions of supported compression formats
+COMPRESSIONS = {
+    'gzip': (b'\x1f\x8b', ['.gz', '.gzip']),
+    'bz2': (b'BZh', ['.bz2']),
+    'xz': (b'\xfd7zXZ\x00', ['.xz']),
+    'lzma': (None, ['.lzma']),
+}
+
+def identify_compression(head:bytes, name:Optional[str]=None) -> Optional[str]:
+    """
+    Identifies the compression format of content from its leading bytes or,
+    for formats without magic bytes, the file name's extension.
+
+    Parameters
+    ----------
+    head : bytes
+        The first bytes of the content.  At least 6 bytes are needed to
+        identify all formats.
+    name : str or None, optional
+        The file name of the content, if any.
+
+    Returns
+    -------
+    str or None
+        'gzip', 'bz2', 'xz' or 'lzma', or None if the content is not
+        identified as compressed.
+    """
+    for compression, (magic, extensions) in COMPRESSIONS.items():
+        if magic is not None and head.startswith(magic):
+            return compression
+    
+    # Fall back on the extension if the content could not be checked
+    if isinstance(name, (str, Path)):
+        suffix = Path(name).suffix.lower()
+        for compression, (magic, extensions) in COMPRESSIONS.items():
+            if suffix in extensions and (magic is None or len(head) == 0):
+                return compression
+    return None
+
+def decompressor(f:io.IOBase, compression:str) -> io.BufferedIOBase:
+    """
+    Returns a reader that decompresses the content of f as it is read.
+    Closing the reader does not close f.
+    """
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=f, mode='rb')
+    elif compression == 'bz2':
+        return bz2.BZ2File(f, mode='rb')
+    elif compression == 'xz':
+        return lzma.LZMAFile(f, mode='rb', format=lzma.FORMAT_XZ)
+    elif compression == 'lzma':
+        return lzma.LZMAFile(f, mode='rb', format=lzma.FORMAT_ALONE)
+    else:
+        raise ValueError(f"unsupported compression '{compression}'")
+
+class BufferReader(io.RawIOBase):
+    """
+    Read-only, seekable raw stream over any object supporting the buffer
+    protocol.  The content is accessed through a memoryview, so the
+    underlying buffer is never copied as a whole.
+    """
+    
+    def __init__(self, buffer):
+        """
+        Parameters
+        ----------
+        buffer : bytes, bytearray, memoryview, mmap.mmap or buffer object
+            The content to read.
+        """
+        self.__view = memoryview(buffer).cast('B')
+        self.__pos = 0
+    
+    def readable(self) -> bool:
+        return True
+    
+    def seekable(self) -> bool:
+        return True
+    
+    def readinto(self, b) -> int:
+        """Copies up to len(b) bytes from the current position into b."""
+        self._checkClosed()
+        end = min(self.__pos + len(b), len(self.__view))
+        n = end - self.__pos
+        memoryview(b).cast('B')[:n] = self.__view[self.__pos:end]
+        self.__pos = end
+        return n
+    
+    def getbuffer(self) -> memoryview:
+        """Returns a read-only view of the whole content without copying it."""
+        self._checkClosed()
+        return self.__view.toreadonly()
+    
+    def readall(self) -> bytes:
+        """Returns all remaining content in a single copy."""
+        self._checkClosed()
+        content = self.__view[self.__pos:].tobytes()
+        self.__pos = len(self.__view)
+        return content
+    
+    def seek(self, offset:int, whence:int=io.SEEK_SET) -> int:
+        self._checkClosed()
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self.__pos + offset
+        elif whence == io.SEEK_END:
+            pos = len(self.__view) + offset
+        else:
+            raise ValueError(f'invalid whence ({whence})')
+        if pos < 0:
+            raise ValueError(f'negative seek position {pos}')
+        self.__pos = pos
+        return pos
+    
+    def tell(self) -> int:
+        self._checkClosed()
+        return self.__pos
+    
+    def close(self):
+        """Closes the stream and releases the memoryview."""
+        if not self.closed:
+            self.__view.release()
+        super().close()
+
+@contextmanager
+def read_buffer(f:io.IOBase):
+    """
+    Gives the rest of the content of an open reader as one bytes-like object.
+    Content, buffers and memory maps opened by uber_open_rmode(), directly or
+    in a BufferedReader, are given as a memoryview of their content without
+    copying it.  Other readers, including decompressing readers, are read
+    into bytes.
+    
+    Parameters
+    ----------
+    f : file-like object
+        The open reader, in a bytes mode.
+    
+    Yields
+    ------
+    bytes or memoryview
+        The content from the current position of f on.  A memoryview is
+        released once the block ends, so it must not be kept.
+    """
+    # BytesIO objects share their bytes through getvalue() until written to
+    raw = getattr(f, 'raw', f)
+    if isinstance(raw, BufferReader):
+        view = raw.getbuffer()
+    elif isinstance(raw, io.BytesIO):
+        view = memoryview(raw.getvalue())
+    else:
+        yield f.read()
+        return
+    
+    try:
+        with view[f.tell():] as content:
+            yield content
+    finally:
+        view.release()
+    
+    # Leave f at the end of the content, as reading it would
+    f.seek(0, io.SEEK_END)
+
 @contextmanager
-def uber_open_rmode(data:Union[str, bytes, Path, io.IOBase]) -> io.IOBase:
+def uber_open_rmode(data:Union[str, bytes, bytearray, memoryview, mmap.mmap,
+                               Path, io.IOBase],
+                    use_mmap:bool=False, peekable:bool=False,
+                    decompress:bool=True) -> io.IOBase:
     """
     Provides a uniform means of reading data from files, file-like objects,
     and string/bytes content.  
     
     Parameters
     ----------
-    data : file-like object, file path, or str/bytes file content
-        The data that will be opened for reading.
+    data : file-like object, file path, str/bytes file content or buffer
+        The data that will be opened for reading.  Buffer objects, i.e.
+        bytearray, memoryview and mmap.mmap, are read in place without being
+        copied.
+    use_mmap : bool, optional
+        If True and data is a file path, the file is memory-mapped and read
+        through a read-only view rather than a buffered file.  Default value
+        is False.
+    peekable : bool, optional
+        If True, the returned object is guaranteed to have a peek() method so
+        that the start of the content can be examined without seeking.
+        Objects without one are wrapped in a BufferedReader, which is
+        detached afterwards so that a given file-like object is left open.
+        This allows for non-seekable streams like pipes and sockets to be
+        identified.  Default value is False.
+    decompress : bool, optional
+        If True (default), gzip, bz2, xz and lzma compressed content is
+        identified by its leading magic bytes or file extension and is
+        decompressed as it is read.  The decompressed content is never held
+        in memory as a whole.
 
     Returns
     -------
@@ -20,15 +208,19 @@ def uber_open_rmode(data:Union[str, bytes, Path, io.IOBase]) -> io.IOBase:
         An open file-like object that is in a bytes read mode.  If a file-like
         object is given, it is passed through after checking that it is for
         bytes content.  If a file path is given, the file is opened in 'rb'
-        mode.  If bytes or string content is given, the content is returned
-        in a BytesIO object.
+        mode, or memory-mapped if use_mmap is True.  If bytes or string
+        content is given, the content is returned in a BytesIO object.  If a
+        buffer object is given, it is returned in a BufferedReader that reads
+        from it in place.  If peekable is True, objects without a peek()
+        method are returned in a BufferedReader.  Compressed content is
+        returned in a decompressing reader.
 
     Raises
     ------
     ValueError
         If a file-like object in text mode is given.
     TypeError
-        If data is not a file-like object, bytes, str or Path.
+        If data is not a file-like object, bytes, str, buffer or Path.
     FileNotFoundError
         If data is a pathlib.Path object and is not an existing file.
     """
@@ -41,6 +233,24 @@ def uber_open_rmode(data:Union[str, bytes, Path, io.IOBase]) -> io.IOBase:
         except:
             return False
     
+    # Define open_file function
+    def open_file(data):
+        """Opens a file path in 'rb' mode or as a read-only memory map"""
+        f = open(data, 'rb')
+        if not use_mmap:
+            return f, [f]
+        
+        # Empty files cannot be mapped
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return f, [f]
+        reader = io.BufferedReader(BufferReader(mm))
+        return reader, [reader, mm, f]
+    
+    # File name of data, if any
+    name = None
+    
     # Check if data is a file-like object
     if isinstance(data, io.IOBase):
         
@@ -49,45 +259,83 @@ def uber_open_rmode(data:Union[str, bytes, Path, io.IOBase]) -> io.IOBase:
             raise ValueError('open file-like objects need to be in a bytes mode not text mode')
         
         f = data
-        to_close = False
+        to_close = []
+        name = getattr(f, 'name', None)
+        if not isinstance(name, str):
+            name = None
 
     # Check if data is a str
     elif isinstance(data, str):
         
         # Check if str data is a file path
         if is_file(data):
-            f = open(data, 'rb')
-            to_close = True
+            f, to_close = open_file(data)
+            name = data
         
         # Encode to bytes and read using BytesIO
         else:
             f = io.BytesIO(data.encode())
-            to_close = True
+            to_close = [f]
     
     # Check if data is a Path    
     elif isinstance(data, Path):
         
         # Check if path is a file 
         if data.is_file():
-            f = open(data, 'rb')
-            to_close = True
+            f, to_close = open_file(data)
+            name = data
 
         else:
-            raise FileNotFoundError(f"no such file '{data.as_posix}'")
+            raise FileNotFoundError(f"no such file '{data.as_posix()}'")
 
-    # If data is bytes, read using BytesIO
+    # If data is bytes, read using BytesIO (which shares the bytes object)
     elif isinstance(data, bytes):
         f = io.BytesIO(data)
-        to_close = True
+        to_close = [f]
+    
+    # If data is another buffer, read it in place
+    elif isinstance(data, (bytearray, memoryview, mmap.mmap)):
+        f = io.BufferedReader(BufferReader(data))
+        to_close = [f]
 
     else:
-        raise TypeError('data must be a file-like object, str or bytes')
+        raise TypeError('data must be a file-like object, str, bytes or buffer')
+    
+    # Wrap given objects that can neither peek nor seek in a BufferedReader
+    wrapper = None
+    if decompress and not hasattr(f, 'peek') and not f.seekable():
+        wrapper = f = io.BufferedReader(f)
+    
+    # Check for compressed content
+    if decompress:
+        if hasattr(f, 'peek'):
+            head = f.peek(6)[:6]
+        else:
+            pos = f.tell()
+            head = f.read(6)
+            f.seek(pos)
+        compression = identify_compression(head, name)
+        if compression is not None:
+            f = decompressor(f, compression)
+            to_close.insert(0, f)
+    
+    # Wrap objects that cannot peek in a BufferedReader
+    if peekable and not hasattr(f, 'peek'):
+        f = io.BufferedReader(f)
+        
+        # Close wrappers of opened objects, but detach given ones
+        if len(to_close) > 0:
+            to_close.insert(0, f)
+        else:
+            wrapper = f
     
     # Return the open file-like object
     try:
         yield f
     
-    # Close the file-like object if needed
+    # Close the file-like object and any resources opened for it
     finally:
-        if to_close:
-            f.close()
\ No newline at end of file
+        for obj in to_close:
+            obj.close()
+        if wrapper is not None:
+            wrapper.detach()
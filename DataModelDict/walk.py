@@ -0,0 +1,126 @@
+"""Functions for walking the items of nested dicts and lists without recursion."""
+
+# Standard Python libraries
+from typing import Any, Generator, Container, Optional
+
+# The type of iterators over lists
+LIST_ITERATOR = type(iter([]))
+
+def walk_values(var:Any, key:Any) -> Generator[Any, None, None]:
+    """
+    Iterates depth-first over the values of all items with key at any level
+    of var, like walk_items() but without tracking paths and containers.
+    The values of list items are yielded one by one.
+    
+    Parameters
+    ----------
+    var : any
+        The structure to walk.  Nothing is yielded if it is not a dict.
+    key : any
+        The key of the items to yield the values of.
+    
+    Yields
+    ------
+    any
+        The matching values.
+    """
+    if not isinstance(var, dict):
+        return
+    
+    # Frames are iterators over dict items, or iterators over lists
+    stack = [iter(var.items())]
+    while len(stack) > 0:
+        items = stack[-1]
+        
+        # Descend into the next dict in a list
+        if items.__class__ is LIST_ITERATOR:
+            for v in items:
+                if isinstance(v, dict):
+                    stack.append(iter(v.items()))
+                    break
+            else:
+                stack.pop()
+            continue
+        
+        # Yield matching values and descend into dict and list values
+        for k, v in items:
+            if k == key:
+                if isinstance(v, list):
+                    yield from v
+                else:
+                    yield v
+            if isinstance(v, dict):
+                stack.append(iter(v.items()))
+                break
+            elif isinstance(v, list):
+                stack.append(iter(v))
+                break
+        else:
+            stack.pop()
+
+def walk_items(var:Any, keys:Optional[Container]=None
+               ) -> Generator[tuple, None, None]:
+    """
+    Iterates depth-first over the items of all dicts at any level of var,
+    including dicts inside lists, using an explicit stack so that the depth
+    is only limited by memory.  Each item is yielded before the contents of
+    its value.
+    
+    Parameters
+    ----------
+    var : any
+        The structure to walk.  Nothing is yielded if it is not a dict.
+    keys : container or None, optional
+        If given, only items with keys in keys are yielded.
+    
+    Yields
+    ------
+    tuple
+        The path list to the dict holding the item, the dict, the item's key
+        and the item's value.  The path list is updated in place as the walk
+        continues, so it must be copied if kept.
+    """
+    if not isinstance(var, dict):
+        return
+    
+    # Frames are iterators over dict items, or enumerate objects over lists
+    path = []
+    parents = [var]
+    stack = [iter(var.items())]
+    while len(stack) > 0:
+        items = stack[-1]
+        
+        # Descend into the next dict in a list
+        if items.__class__ is enumerate:
+            for i, v in items:
+                if isinstance(v, dict):
+                    path.append(i)
+                    parents.append(v)
+                    stack.append(iter(v.items()))
+                    break
+            else:
+                stack.pop()
+                parents.pop()
+                path.pop()
+            continue
+        
+        # Yield dict items and descend into dict and list values
+        parent = parents[-1]
+        for k, v in items:
+            if keys is None or k in keys:
+                yield path, parent, k, v
+            if isinstance(v, dict):
+                path.append(k)
+                parents.append(v)
+                stack.append(iter(v.items()))
+                break
+            elif isinstance(v, list):
+                path.append(k)
+                parents.append(v)
+                stack.append(enumerate(v))
+                break
+        else:
+            stack.pop()
+            parents.pop()
+            if len(stack) > 0:
+                path.pop()
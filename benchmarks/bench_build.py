@@ -0,0 +1,79 @@
+"""
+Compares building a model with many measurement records one append() at a
+time against extend() with the same records and from_columns() with the
+records' fields as columns.  Garbage collection is left enabled while
+timing, as in normal use.
+
+    python benchmarks/bench_build.py
+"""
+# Standard Python libraries
+import gc
+import timeit
+
+from DataModelDict import DataModelDict as DM
+from DataModelDict import CompactDataModelDict
+
+def build_append(cls:type, nrecords:int) -> DM:
+    """Builds the model one record at a time"""
+    model = cls()
+    model['root'] = cls()
+    for i in range(nrecords):
+        record = cls()
+        record['key'] = f'id-{i}'
+        record['temperature'] = cls()
+        record['temperature']['value'] = i * 0.5
+        record['temperature']['unit'] = 'K'
+        record['length'] = cls()
+        record['length']['value'] = i * 0.25
+        record['length']['unit'] = 'm'
+        model['root'].append('measurement', record)
+    return model
+
+def build_extend(cls:type, nrecords:int) -> DM:
+    """Builds the same records, then adds them at once"""
+    model = cls()
+    model['root'] = cls()
+    records = []
+    for i in range(nrecords):
+        record = cls()
+        record['key'] = f'id-{i}'
+        record['temperature'] = cls()
+        record['temperature']['value'] = i * 0.5
+        record['temperature']['unit'] = 'K'
+        record['length'] = cls()
+        record['length']['value'] = i * 0.25
+        record['length']['unit'] = 'm'
+        records.append(record)
+    model['root'].extend('measurement', records)
+    return model
+
+def build_columns(cls:type, nrecords:int) -> DM:
+    """Builds the records from columns"""
+    model = cls()
+    model['root'] = cls()
+    model['root'].from_columns('measurement', {
+        'key': [f'id-{i}' for i in range(nrecords)],
+        'temperature.value': [i * 0.5 for i in range(nrecords)],
+        'temperature.unit': ['K'] * nrecords,
+        'length.value': [i * 0.25 for i in range(nrecords)],
+        'length.unit': ['m'] * nrecords})
+    return model
+
+def best(function) -> float:
+    return min(timeit.repeat(function, setup=gc.enable, number=1, repeat=5))
+
+def main():
+    for nrecords in [1000, 20000, 100000]:
+        print(f'{nrecords} records')
+        for cls in [DM, CompactDataModelDict]:
+            model = build_append(cls, nrecords)
+            assert build_extend(cls, nrecords) == model
+            assert build_columns(cls, nrecords) == model
+            old = best(lambda: build_append(cls, nrecords))
+            print(f'  {cls.__name__:>20} {"append":>12} {old*1000:8.1f} ms')
+            for name, build in [('extend', build_extend), ('from_columns', build_columns)]:
+                new = best(lambda: build(cls, nrecords))
+                print(f'  {cls.__name__:>20} {name:>12} {new*1000:8.1f} ms {old/new:6.2f}x')
+
+if __name__ == '__main__':
+    main()
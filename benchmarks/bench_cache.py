@@ -0,0 +1,62 @@
+"""
+Compares loading large XML and JSON files without a cache, the first load
+with a DiskCache which parses the file and writes the entry, and later
+loads that use the entry, including after the file is touched so that its
+content hash is checked.
+
+    python benchmarks/bench_cache.py
+"""
+# Standard Python libraries
+import os
+import time
+import tempfile
+from pathlib import Path
+
+from DataModelDict import DataModelDict as DM
+from DataModelDict import DiskCache
+
+def build_model(nrecords:int) -> DM:
+    """Builds a model with many measurement records"""
+    model = DM()
+    model['root'] = DM()
+    model['root']['measurement'] = []
+    for i in range(nrecords):
+        record = DM()
+        record['key'] = f'id-{i}'
+        record['temperature'] = DM([('value', i * 0.5), ('unit', 'K')])
+        record['length'] = DM([('value', i * 0.25), ('unit', 'm')])
+        model['root']['measurement'].append(record)
+    return model
+
+def timed(function) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+def main():
+    model = build_model(50000)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = DiskCache(Path(tmpdir, 'cache'))
+        for fmt in ['xml', 'json']:
+            path = Path(tmpdir, f'model.{fmt}')
+            with open(path, 'w') as f:
+                if fmt == 'xml':
+                    model.xml(fp=f)
+                else:
+                    model.json(fp=f)
+            print(f'{fmt}: {path.stat().st_size/1e6:.1f} MB')
+
+            old = timed(lambda: DM(path))
+            print(f'  {"no cache":>14} {old*1000:9.1f} ms')
+            new = timed(lambda: DM(path, cache=cache))
+            print(f'  {"first load":>14} {new*1000:9.1f} ms {old/new:6.2f}x')
+            new = timed(lambda: DM(path, cache=cache))
+            print(f'  {"cached":>14} {new*1000:9.1f} ms {old/new:6.2f}x')
+            os.utime(path)
+            new = timed(lambda: DM(path, cache=cache))
+            print(f'  {"touched":>14} {new*1000:9.1f} ms {old/new:6.2f}x')
+            assert DM(path, cache=cache) == model
+        print(f'cache size: {cache.size/1e6:.1f} MB')
+
+if __name__ == '__main__':
+    main()
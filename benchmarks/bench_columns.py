@@ -0,0 +1,61 @@
+"""
+Compares collecting fields of repeated elements into NumPy arrays with
+to_columns() against finds() with a Python loop over the elements, with
+and without a key index.
+
+    python benchmarks/bench_columns.py
+"""
+# Standard Python libraries
+import timeit
+
+import numpy as np
+
+from DataModelDict import DataModelDict as DM
+
+FIELDS = {'key': ['key'],
+          'T': ['temperature', 'value'],
+          'L': ['length', 'value'],
+          'unit': ['length', 'unit']}
+
+def build_model(nrecords:int) -> DM:
+    """Builds a model with many measurement records"""
+    model = DM()
+    model['root'] = DM()
+    model['root']['measurement'] = []
+    for i in range(nrecords):
+        record = DM()
+        record['key'] = f'id-{i}'
+        record['temperature'] = DM([('value', i * 0.5), ('unit', 'K')])
+        record['length'] = DM([('value', i * 0.25), ('unit', 'm')])
+        model['root']['measurement'].append(record)
+    return model
+
+def loop_columns(model:DM) -> dict:
+    """Collects the fields as done without to_columns()"""
+    columns = {name: [] for name in FIELDS}
+    for measurement in model.finds('measurement'):
+        for name, path in FIELDS.items():
+            columns[name].append(measurement[path])
+    return {name: np.array(values) for name, values in columns.items()}
+
+def best(function) -> float:
+    return min(timeit.repeat(function, number=1, repeat=5))
+
+def main():
+    for nrecords in [1000, 20000, 100000]:
+        model = build_model(nrecords)
+        old = loop_columns(model)
+        new = model.to_columns('measurement', FIELDS)
+        for name in FIELDS:
+            assert np.array_equal(old[name], new[name])
+        
+        for name in ['search', 'index']:
+            if name == 'index':
+                model.build_index()
+            old = best(lambda: loop_columns(model))
+            new = best(lambda: model.to_columns('measurement', FIELDS))
+            print(f'{nrecords:>7} records {name:>7}: loop {old*1000:8.1f} ms'
+                  f' to_columns {new*1000:8.1f} ms {old/new:5.2f}x')
+
+if __name__ == '__main__':
+    main()
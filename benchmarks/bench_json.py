@@ -0,0 +1,57 @@
+"""
+Compares the JSON backends for loading and writing large models, along with
+loading using json.loads and DataModelDict as the object_pairs_hook as done
+before backends could be selected.  Writing is compared for models with and
+without null values, as orjson output containing null has to be checked for
+NaN and infinite values.
+
+    python benchmarks/bench_json.py
+"""
+# Standard Python libraries
+import json
+import timeit
+
+from DataModelDict import DataModelDict as DM
+from DataModelDict import available_json_backends
+
+def build_content(nrecords:int, note:str=None) -> bytes:
+    """Builds JSON content with many measurement records"""
+    model = DM()
+    model['root'] = DM()
+    model['root']['measurement'] = []
+    for i in range(nrecords):
+        record = DM()
+        record['key'] = f'id-{i}'
+        record['temperature'] = DM([('value', i * 0.5), ('unit', 'K')])
+        record['counts'] = [i, i + 1, i + 2]
+        record['valid'] = i % 2 == 0
+        record['note'] = note
+        record['sample'] = DM([('name', f'sample {i}'),
+                               ('composition', [DM([('element', 'Al'), ('fraction', 0.25)]),
+                                                DM([('element', 'Ni'), ('fraction', 0.75)])])])
+        model['root']['measurement'].append(record)
+    return model.json().encode('UTF-8')
+
+def main():
+    for nrecords in [1000, 20000, 100000]:
+        content = build_content(nrecords)
+        model = DM(content)
+        print(f'{nrecords} records, {len(content) / 1e6:.1f} MB')
+
+        old = lambda: DM(json.loads(content, object_pairs_hook=DM))
+        old = min(timeit.repeat(old, number=1, repeat=3))
+        print(f'  {"load":>7} {"hook":>8} {old*1000:9.2f} ms')
+        for backend in available_json_backends():
+            assert DM(content, backend=backend) == model
+            new = min(timeit.repeat(lambda: DM(content, backend=backend), number=1, repeat=3))
+            print(f'  {"load":>7} {backend:>8} {new*1000:9.2f} ms {old/new:7.2f}x')
+
+        for name, model in [('json', model), ('no null', DM(build_content(nrecords, 'none')))]:
+            old = min(timeit.repeat(lambda: json.dumps(model), number=1, repeat=3))
+            for backend in available_json_backends():
+                assert DM(model.json(backend=backend)) == model
+                new = min(timeit.repeat(lambda: model.json(backend=backend), number=1, repeat=3))
+                print(f'  {name:>7} {backend:>8} {new*1000:9.2f} ms {old/new:7.2f}x')
+
+if __name__ == '__main__':
+    main()
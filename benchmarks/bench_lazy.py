@@ -0,0 +1,86 @@
+"""
+Compares loading large JSON and XML files in full against reading a few
+fields with LazyDataModelDict, for the time taken and peak memory.
+
+    python benchmarks/bench_lazy.py
+"""
+# Standard Python libraries
+import time
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from DataModelDict import DataModelDict as DM
+from DataModelDict import LazyDataModelDict
+
+def build_model(nrecords:int) -> DM:
+    """Builds a model with a few header fields followed by many records"""
+    model = DM()
+    model['root'] = DM()
+    model['root']['name'] = 'big'
+    model['root']['units'] = DM([('temperature', 'K'), ('length', 'm')])
+    model['root']['measurement'] = []
+    for i in range(nrecords):
+        record = DM()
+        record['key'] = f'id-{i}'
+        record['temperature'] = DM([('value', i * 0.5), ('unit', 'K')])
+        record['length'] = DM([('value', i * 0.25), ('unit', 'm')])
+        record['sample'] = DM([('name', f'sample {i}'), ('mass', i)])
+        model['root']['measurement'].append(record)
+    model['root']['summary'] = DM([('count', nrecords)])
+    return model
+
+def measure(function):
+    """
+    Returns the time and peak memory of calling function.  These are measured
+    by separate calls as tracing memory slows down scanning a lot.
+    """
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+def report(name, elapsed, peak):
+    print(f'  {name:<34} {elapsed*1000:10.1f} ms {peak/1e6:10.1f} MB')
+
+def main():
+    model = build_model(50000)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for fmt in ['json', 'xml']:
+            fname = Path(tmpdir, f'model.{fmt}')
+            with open(fname, 'w') as f:
+                if fmt == 'json':
+                    model.json(fp=f)
+                else:
+                    model.xml(fp=f)
+            print(f'{fmt}: {fname.stat().st_size/1e6:.1f} MB')
+
+            def full():
+                doc = DM(fname)
+                assert doc['root']['name'] == 'big'
+                assert doc['root']['units']['length'] == 'm'
+                assert doc['root']['summary']['count'] == 50000
+            report('full load', *measure(full))
+
+            def first():
+                doc = LazyDataModelDict(fname, use_mmap=True)
+                assert doc['root']['name'] == 'big'
+                assert doc['root']['units']['length'] == 'm'
+            report('lazy, fields before records', *measure(first))
+
+            def last():
+                doc = LazyDataModelDict(fname, use_mmap=True)
+                assert doc['root']['summary']['count'] == 50000
+            report('lazy, field after records', *measure(last))
+
+            def find():
+                doc = LazyDataModelDict(fname, use_mmap=True)
+                assert doc.find('units')['length'] == 'm'
+            report('lazy, find', *measure(find))
+
+if __name__ == '__main__':
+    main()
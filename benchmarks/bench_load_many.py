@@ -0,0 +1,59 @@
+"""
+Compares loading a directory of small XML and JSON records one at a time
+against DataModelDict.load_many() with different numbers of workers.
+
+    python benchmarks/bench_load_many.py
+"""
+# Standard Python libraries
+import os
+import time
+import tempfile
+from pathlib import Path
+
+from DataModelDict import DataModelDict as DM
+
+def build_record(i:int) -> DM:
+    """Builds a small record"""
+    record = DM()
+    record['record'] = DM()
+    record['record']['key'] = f'id-{i}'
+    record['record']['measurement'] = []
+    for j in range(20):
+        record['record']['measurement'].append(DM([('temperature', DM([('value', j * 0.5), ('unit', 'K')])),
+                                                  ('length', DM([('value', j), ('unit', 'm')]))]))
+    return record
+
+def main():
+    nfiles = 4000
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for fmt in ['xml', 'json']:
+            paths = []
+            for i in range(nfiles):
+                path = Path(tmpdir, f'record{i}.{fmt}')
+                with open(path, 'w') as f:
+                    if fmt == 'xml':
+                        build_record(i).xml(fp=f)
+                    else:
+                        build_record(i).json(fp=f)
+                paths.append(path)
+            print(f'{nfiles} {fmt} files')
+
+            start = time.perf_counter()
+            models = [DM(path) for path in paths]
+            old = time.perf_counter() - start
+            print(f'  {"loop":>12} {old:8.2f} s')
+
+            for workers in sorted({1, 2, 4, os.cpu_count()}):
+                for ordered in [True, False]:
+                    start = time.perf_counter()
+                    results = list(DM.load_many(paths, workers=workers, ordered=ordered, chunksize=64))
+                    new = time.perf_counter() - start
+                    assert len(results) == nfiles
+                    name = f'{workers} {"ordered" if ordered else "unordered"}'
+                    print(f'  {name:>12} {new:8.2f} s {old/new:6.2f}x')
+                    if workers == 1:
+                        break
+            assert dict(results)[paths[10]] == models[10]
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Compares the memory used per element by DataModelDict and
+CompactDataModelDict for models loaded from JSON and XML content.
+
+    python benchmarks/bench_memory.py
+"""
+# Standard Python libraries
+import gc
+import tracemalloc
+
+from DataModelDict import DataModelDict as DM
+from DataModelDict import CompactDataModelDict
+
+def build_model(nrecords:int) -> DM:
+    """Builds a model with many small value-unit elements"""
+    model = DM()
+    model['root'] = DM()
+    model['root']['measurement'] = []
+    for i in range(nrecords):
+        record = DM()
+        record['temperature'] = DM([('value', i), ('unit', 'K')])
+        record['pressure'] = DM([('value', i), ('unit', 'GPa')])
+        record['length'] = DM([('value', i), ('unit', 'm')])
+        model['root']['measurement'].append(record)
+    return model
+
+def count_elements(model:DM) -> int:
+    """Counts the dict elements in a model"""
+    return 1 + sum(1 + len(record) for record in model['root']['measurement'])
+
+def measure(load, content) -> int:
+    """Returns the bytes allocated by load(content) that are still in use"""
+    gc.collect()
+    tracemalloc.start()
+    model = load(content)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del model
+    return size
+
+def main():
+    model = build_model(50000)
+    nelements = count_elements(model)
+    print(f'{nelements} elements')
+    for fmt, content in [('json', model.json()), ('xml', model.xml())]:
+        old = measure(DM, content)
+        new = measure(CompactDataModelDict, content)
+        print(f'{fmt:>5} {"DataModelDict":>21} {old/nelements:8.1f} bytes/element')
+        print(f'{fmt:>5} {"CompactDataModelDict":>21} {new/nelements:8.1f} bytes/element {new/old:6.2f}')
+
+if __name__ == '__main__':
+    main()
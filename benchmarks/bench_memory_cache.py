@@ -0,0 +1,59 @@
+"""
+Compares loading a large JSON file without a cache with loads through a
+MemoryCache that return independent copies or read-only views, and reports
+the estimated size of the entry.
+
+    python benchmarks/bench_memory_cache.py
+"""
+# Standard Python libraries
+import time
+import tempfile
+from pathlib import Path
+
+from DataModelDict import DataModelDict as DM
+from DataModelDict import MemoryCache
+
+def build_model(nrecords:int) -> DM:
+    """Builds a model with many measurement records"""
+    model = DM()
+    model['root'] = DM()
+    model['root']['measurement'] = []
+    for i in range(nrecords):
+        record = DM()
+        record['key'] = f'id-{i}'
+        record['temperature'] = DM([('value', i * 0.5), ('unit', 'K')])
+        record['length'] = DM([('value', i * 0.25), ('unit', 'm')])
+        model['root']['measurement'].append(record)
+    return model
+
+def timed(function) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+def main():
+    model = build_model(50000)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir, 'model.json')
+        with open(path, 'w') as f:
+            model.json(fp=f)
+        print(f'json: {path.stat().st_size/1e6:.1f} MB')
+
+        cache = MemoryCache()
+        old = timed(lambda: DM(path))
+        print(f'  {"no cache":>14} {old*1000:9.1f} ms')
+        new = timed(lambda: cache.load(path))
+        print(f'  {"first load":>14} {new*1000:9.1f} ms {old/new:8.2f}x')
+        new = timed(lambda: cache.load(path))
+        print(f'  {"copy":>14} {new*1000:9.1f} ms {old/new:8.2f}x')
+        new = timed(lambda: cache.load(path, readonly=True))
+        print(f'  {"first view":>14} {new*1000:9.1f} ms {old/new:8.2f}x')
+        new = timed(lambda: cache.load(path, readonly=True))
+        print(f'  {"view":>14} {new*1000:9.1f} ms {old/new:8.2f}x')
+        assert cache.load(path) == model
+        assert cache.load(path, readonly=True) == model
+        print(f'entry size: {cache.size/1e6:.1f} MB')
+        print(cache.stats)
+
+if __name__ == '__main__':
+    main()
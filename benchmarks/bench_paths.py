@@ -0,0 +1,106 @@
+"""
+Compares parsing and joining path strings, and getting values by path, with
+the original parsepath() and joinpath() against the cached KeyPaths given by
+compile_path().
+
+    python benchmarks/bench_paths.py
+"""
+# Standard Python libraries
+import timeit
+
+from DataModelDict import DataModelDict as DM
+from DataModelDict import parsepath, joinpath, KeyPath, compile_path
+from DataModelDict.parsepath import parse_terms
+
+def original_parsepath(pathstr:str, delimiter:str='.', openbracket:str='[',
+                       closebracket:str=']') -> list:
+    """parsepath() before paths were cached"""
+    path = pathstr.split(delimiter)
+    positions = []
+    values = []
+    for i in range(len(path)):
+        if path[i][-len(closebracket):] == closebracket:
+            s = 0
+            cropindex = None
+            while True:
+                try:
+                    index = path[i][s:].index(openbracket)
+                except:
+                    break
+                else:
+                    if cropindex is None:
+                        cropindex = index
+                    s = index + len(openbracket) + s
+                e = path[i][s:].index(closebracket) + s
+                values.append(int(path[i][s:e]))
+                positions.append(i+1)
+                if cropindex is None:
+                    cropindex = s - len(openbracket) + 1
+                s = e
+            path[i] = path[i][:cropindex]
+    for position, value in zip(reversed(positions), reversed(values)):
+        path.insert(position, value)
+    return path
+
+def original_joinpath(path:list, delimiter:str='.', openbracket:str='[',
+                      closebracket:str=']') -> str:
+    """joinpath() before terms were joined at once"""
+    pathstr = path[0]
+    for term in path[1:]:
+        if isinstance(term, str):
+            pathstr += delimiter + term
+        elif isinstance(term, int):
+            pathstr += f'{openbracket}{term}{closebracket}'
+        else:
+            raise TypeError('path fields limited to str names or int indices')
+    return pathstr
+
+def build_model(nrecords:int) -> DM:
+    model = DM()
+    model['root'] = DM()
+    for i in range(nrecords):
+        model['root'].append('measurement', DM([('temperature', DM([('value', i), ('unit', 'K')]))]))
+    return model
+
+def best(function, number:int) -> float:
+    """Best time per call in microseconds"""
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e6
+
+def report(name:str, old:float, new:float):
+    print(f'  {name:>28} {new:8.3f} us {old/new:6.2f}x')
+
+def main():
+    number = 20000
+    pathstrs = ['root.measurement[17].temperature.value',
+                'my-data-model.process.Instrument.Name',
+                'a[1][2].b']
+    for pathstr in pathstrs:
+        path = original_parsepath(pathstr)
+        assert parsepath(pathstr) == parse_terms(pathstr) == path
+        assert compile_path(pathstr) == path
+        assert joinpath(path) == original_joinpath(path) == str(KeyPath(path)) == pathstr
+
+        print(pathstr)
+        old = best(lambda: original_parsepath(pathstr), number)
+        print(f'  {"original parsepath":>28} {old:8.3f} us')
+        report('parse_terms (uncached)', old, best(lambda: parse_terms(pathstr), number))
+        report('parsepath (cached)', old, best(lambda: parsepath(pathstr), number))
+        report('compile_path (cached)', old, best(lambda: compile_path(pathstr), number))
+
+        old = best(lambda: original_joinpath(path), number)
+        print(f'  {"original joinpath":>28} {old:8.3f} us')
+        report('joinpath', old, best(lambda: joinpath(path), number))
+        keypath = compile_path(pathstr)
+        report('str(KeyPath) (cached)', old, best(lambda: str(keypath), number))
+
+    model = build_model(100)
+    pathstr = pathstrs[0]
+    print('get value by path')
+    old = best(lambda: model[original_parsepath(pathstr)], number)
+    print(f'  {"model[parsepath(pathstr)]":>28} {old:8.3f} us')
+    report('model[compile_path(pathstr)]', old, best(lambda: model[compile_path(pathstr)], number))
+    keypath = compile_path(pathstr)
+    report('model[keypath]', old, best(lambda: model[keypath], number))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Compares pickling large models as flat buffers with the default element by
+element reduction inherited from OrderedDict and dict, for the time to
+pickle and unpickle, the size of the pickles, and the time to send a model
+to a worker process and back.  Garbage collection is left enabled while
+timing, as in normal use.
+
+    python benchmarks/bench_pickle.py
+"""
+# Standard Python libraries
+import gc
+import pickle
+import timeit
+from concurrent.futures import ProcessPoolExecutor
+
+from DataModelDict import DataModelDict as DM
+from DataModelDict import CompactDataModelDict
+
+class DefaultDataModelDict(DM):
+    """DataModelDict pickled element by element"""
+    __reduce_ex__ = object.__reduce_ex__
+
+class DefaultCompactDataModelDict(CompactDataModelDict):
+    """CompactDataModelDict pickled element by element"""
+    __slots__ = ()
+    __reduce_ex__ = object.__reduce_ex__
+
+def build_content(nrecords:int) -> str:
+    """Builds JSON content with many measurement records"""
+    model = DM()
+    model['root'] = DM()
+    model['root']['measurement'] = []
+    for i in range(nrecords):
+        record = DM()
+        record['key'] = f'id-{i}'
+        record['temperature'] = DM([('value', i * 0.5), ('unit', 'K')])
+        record['counts'] = [i, i + 1, i + 2]
+        record['sample'] = DM([('name', f'sample {i}'),
+                               ('composition', [DM([('element', 'Al'), ('fraction', 0.25)]),
+                                                DM([('element', 'Ni'), ('fraction', 0.75)])])])
+        model['root']['measurement'].append(record)
+    return model.json()
+
+def echo(model):
+    """Returns model, so that it is sent to a process and back"""
+    return model
+
+def best(function) -> float:
+    return min(timeit.repeat(function, setup=gc.enable, number=1, repeat=3))
+
+def main():
+    with ProcessPoolExecutor(1) as pool:
+        for nrecords in [1000, 20000, 100000]:
+            content = build_content(nrecords)
+            print(f'{nrecords} records')
+            for cls, default in [(DM, DefaultDataModelDict),
+                                 (CompactDataModelDict, DefaultCompactDataModelDict)]:
+                for name, model in [('default', default(content)), ('flat', cls(content))]:
+                    data = pickle.dumps(model, pickle.HIGHEST_PROTOCOL)
+                    assert pickle.loads(data) == model
+                    dump = best(lambda: pickle.dumps(model, pickle.HIGHEST_PROTOCOL))
+                    load = best(lambda: pickle.loads(data))
+                    send = best(lambda: pool.submit(echo, model).result())
+                    print(f'  {cls.__name__:>20} {name:>7} {len(data)/1e6:7.2f} MB'
+                          f' dumps {dump*1000:8.1f} ms loads {load*1000:8.1f} ms'
+                          f' round trip {send*1000:8.1f} ms')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Compares finds() with yes/no conditions, which compiles them into a single
+pass over each candidate subelement, against the finds() it replaced, which
+walked each candidate once per yes/no term.
+
+    python benchmarks/bench_query.py
+"""
+# Standard Python libraries
+import timeit
+
+from DataModelDict import DataModelDict as DM
+
+def build_model(nrecords:int=2000, width:int=20, depth:int=4) -> DM:
+    """Builds a model with wide, deep measurement records"""
+    def branch(level, i):
+        node = DM()
+        for j in range(width):
+            node[f'field{j}'] = i * j
+        if level < depth:
+            node['child'] = branch(level + 1, i)
+        return node
+
+    model = DM()
+    model['root'] = DM()
+    model['root']['measurement'] = []
+    for i in range(nrecords):
+        record = DM()
+        record['temperature'] = DM([('value', i % 10), ('unit', 'K')])
+        record['data'] = branch(0, i)
+        model['root']['measurement'].append(record)
+    return model
+
+def gen_dict_value(key, var):
+    """Recursive value search used by finds() before compiled queries"""
+    if isinstance(var, dict):
+        for k, v in var.items():
+            if k == key:
+                if isinstance(v, list):
+                    for d in v:
+                        yield d
+                else:
+                    yield v
+            if isinstance(v, dict):
+                for result in gen_dict_value(key, v):
+                    yield result
+            elif isinstance(v, list):
+                for d in v:
+                    for result in gen_dict_value(key, d):
+                        yield result
+
+def old_finds(model, key, yes={}, no={}):
+    """finds() before compiled queries"""
+    def iterfinds():
+        for subelement in gen_dict_value(key, model):
+            match = True
+            for yes_key, yes_value in yes.items():
+                key_match = False
+                for value in gen_dict_value(yes_key, subelement):
+                    if value == yes_value:
+                        key_match = True
+                        break
+                if not key_match:
+                    match = False
+                    break
+            if match:
+                for no_key, no_value in no.items():
+                    key_match = False
+                    for value in gen_dict_value(no_key, subelement):
+                        if value == no_value:
+                            key_match = True
+                            break
+                    if key_match:
+                        match = False
+                        break
+            if match:
+                yield subelement
+    return [val for val in iterfinds()]
+
+def main():
+    model = build_model()
+    cases = [
+        ('one yes', {'unit': 'K'}, {}),
+        ('two yes', {'unit': 'K', 'value': 4}, {}),
+        ('one deep yes', {'field3': 0}, {}),
+        ('three yes', {'unit': 'K', 'field3': 0, 'value': 4}, {}),
+        ('one no', {}, {'value': 4}),
+        ('three no', {}, {'value': 4, 'field19': -1, 'missing': 1}),
+        ('one yes, two no', {'unit': 'K'}, {'field19': -1, 'missing': 1}),
+        ('four yes, three no', {'unit': 'K', 'value': 0, 'field1': 0, 'field2': 0},
+         {'field19': -1, 'field18': -1, 'missing': 1}),
+    ]
+
+    print(f'{"conditions":<22} {"old finds":>12} {"new finds":>12} {"speedup":>8}')
+    for name, yes, no in cases:
+        assert model.finds('measurement', yes, no) == old_finds(model, 'measurement', yes, no)
+        old = min(timeit.repeat(lambda: old_finds(model, 'measurement', yes, no),
+                                number=1, repeat=10))
+        new = min(timeit.repeat(lambda: model.finds('measurement', yes, no),
+                                number=1, repeat=10))
+        print(f'{name:<22} {old*1000:>9.2f} ms {new*1000:>9.2f} ms {old/new:>7.2f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Compares getting the temperature values of every measurement by searching
+the whole model with paths() and filtering the paths, against select() with
+a wildcard pattern, which only walks the branches that can match.
+
+    python benchmarks/bench_select.py
+"""
+# Standard Python libraries
+import timeit
+
+from DataModelDict import DataModelDict as DM
+
+def build_model(nrecords:int) -> DM:
+    model = DM()
+    model['my-data-model'] = DM()
+    model['my-data-model']['process'] = DM([('method', 'By the book')])
+    for i in range(nrecords):
+        model['my-data-model'].append('measurement', DM([
+            ('temperature', DM([('value', i * 0.5), ('unit', 'K')])),
+            ('length', DM([('value', i * 0.25), ('unit', 'm')])),
+            ('sample', DM([('name', f'sample-{i}'), ('mass', DM([('value', 1.0), ('unit', 'g')]))]))]))
+    return model
+
+def scan_filter(model:DM) -> list:
+    """Searches every value key and keeps the matching paths"""
+    results = []
+    for path in model.iterpaths('value'):
+        if (len(path) == 5 and path[0] == 'my-data-model' and path[1] == 'measurement'
+            and path[3] == 'temperature'):
+            results.append((path, path.value))
+    return results
+
+def select(model:DM) -> list:
+    return list(model.select('my-data-model.measurement[*].temperature.value'))
+
+def select_deep(model:DM) -> list:
+    return list(model.select('**.temperature.value'))
+
+def best(function) -> float:
+    return min(timeit.repeat(function, number=1, repeat=5))
+
+def main():
+    for nrecords in [1000, 20000, 100000]:
+        model = build_model(nrecords)
+        expected = scan_filter(model)
+        print(f'{nrecords} records')
+        old = best(lambda: scan_filter(model))
+        print(f'  {"paths() and filter":>24} {old*1000:8.1f} ms')
+        for name, function in [('select', select), ('select **', select_deep)]:
+            assert [(list(p), v) for p, v in function(model)] == [(list(p), v) for p, v in expected]
+            new = best(lambda: function(model))
+            print(f'  {name:>24} {new*1000:8.1f} ms {old/new:6.2f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Compares the explicit-stack traversal used by the search methods against the
+recursive generators it replaced, called the way the old finds() and paths()
+called them, for models of increasing depth.
+
+    python benchmarks/bench_traversal.py
+"""
+# Standard Python libraries
+import timeit
+
+from DataModelDict import DataModelDict as DM
+
+def build_model(depth:int, nchains:int=200) -> DM:
+    """Builds a model of chains of nested elements with a value at each level"""
+    model = DM()
+    model['root'] = DM()
+    model['root']['chain'] = []
+    for i in range(nchains):
+        chain = node = DM()
+        for level in range(depth):
+            node['value'] = level
+            node['unit'] = 'K'
+            node['child'] = DM()
+            node = node['child']
+        model['root']['chain'].append(chain)
+    return model
+
+def recursive_values(key, var):
+    """Recursive value search used before the explicit-stack traversal"""
+    if isinstance(var, dict):
+        for k, v in var.items():
+            if k == key:
+                if isinstance(v, list):
+                    for d in v:
+                        yield d
+                else:
+                    yield v
+            if isinstance(v, dict):
+                for result in recursive_values(key, v):
+                    yield result
+            elif isinstance(v, list):
+                for d in v:
+                    for result in recursive_values(key, d):
+                        yield result
+
+def recursive_paths(key, var):
+    """Recursive path search used before the explicit-stack traversal"""
+    if isinstance(var, dict):
+        for k, v in var.items():
+            if k == key:
+                if isinstance(v, list):
+                    for i in range(len(v)):
+                        yield [k, i]
+                else:
+                    yield [k]
+            if isinstance(v, dict):
+                for result in recursive_paths(key, v):
+                    yield [k] + result
+            elif isinstance(v, list):
+                for i in range(len(v)):
+                    for result in recursive_paths(key, v[i]):
+                        yield [k, i] + result
+
+def recursive_finds(model, key, yes={}, no={}):
+    """finds() before the explicit-stack traversal, without conditions"""
+    def iterfinds():
+        for subelement in recursive_values(key, model):
+            match = True
+            for yes_key, yes_value in yes.items():
+                pass
+            if match:
+                for no_key, no_value in no.items():
+                    pass
+            if match:
+                yield subelement
+    return [val for val in iterfinds()]
+
+def recursive_paths_method(model, key, yes={}, no={}):
+    """paths() before the explicit-stack traversal, without conditions"""
+    def iterpaths():
+        for path in recursive_paths(key, model):
+            subelement = model[path]
+            match = True
+            for yes_key, yes_value in yes.items():
+                pass
+            if match:
+                for no_key, no_value in no.items():
+                    pass
+            if match:
+                yield path
+    return [val for val in iterpaths()]
+
+def main():
+    print(f'{"depth":>6} {"search":>7} {"recursive":>12} {"stack":>12} {"speedup":>8}')
+    for depth in [1, 2, 5, 10, 50, 100, 200]:
+        model = build_model(depth)
+        assert model.finds('value') == list(recursive_values('value', model))
+        assert model.paths('value') == list(recursive_paths('value', model))
+
+        cases = [('finds', lambda: recursive_finds(model, 'value'),
+                           lambda: model.finds('value')),
+                 ('paths', lambda: recursive_paths_method(model, 'value'),
+                           lambda: model.paths('value'))]
+        for name, old, new in cases:
+            old = min(timeit.repeat(old, number=1, repeat=3))
+            new = min(timeit.repeat(new, number=1, repeat=3))
+            print(f'{depth:>6} {name:>7} {old*1000:>9.2f} ms {new*1000:>9.2f} ms {old/new:>7.2f}x')
+
+    # Depths beyond the recursion limit
+    model = build_model(5000, nchains=1)
+    try:
+        list(recursive_values('value', model))
+    except RecursionError:
+        print('depth 5000: recursive search raises RecursionError')
+    print(f"depth 5000: stack search finds {len(model.finds('value'))} values")
+
+if __name__ == '__main__':
+    main()
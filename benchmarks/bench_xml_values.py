@@ -0,0 +1,117 @@
+"""
+Compares the XML value conversion done by xml_postprocessor() with the
+conversion done before values were classified with patterns, for text-heavy
+and number-heavy documents.  Both the conversion of the values alone and
+the loading of the documents are timed, and the results are checked to be
+identical.
+
+    python benchmarks/bench_xml_values.py
+"""
+# Standard Python libraries
+import math
+import timeit
+from itertools import starmap
+
+# https://github.com/martinblech/xmltodict
+import xmltodict
+
+from DataModelDict import DataModelDict as DM
+from DataModelDict.DataModelDict import xml_postprocessor
+
+parse_constant = {'': None,
+                  'True': True,
+                  'False': False,
+                  'true': True,
+                  'false': False,
+                  '-Infinity': float('-Inf'),
+                  'Infinity': float('Inf'),
+                  'NaN': float('NaN')}
+
+def old_postprocessor(path, key, value):
+    """The conversion done before values were classified with patterns"""
+    if not isinstance(value, str):
+        return key, value
+    else:
+        value = value.replace('\\n', '\n')
+        value = value.replace('\\t', '\t')
+        value = value.replace('\\r', '\r')
+    if value in parse_constant:
+        return key, parse_constant[value]
+    try:
+        intval = int(value)
+    except ValueError:
+        try:
+            return key, float(value)
+        except ValueError:
+            return key, value
+    else:
+        if str(intval) == value:
+            return key, intval
+        else:
+            return key, value
+
+def build_text(nrecords:int) -> str:
+    """Builds XML content where most values are text"""
+    model = DM()
+    model['root'] = DM()
+    model['root']['entry'] = []
+    for i in range(nrecords):
+        record = DM()
+        record['key'] = f'id-{i}'
+        record['title'] = f'Entry number {i}'
+        record['author'] = 'Somebody Else'
+        record['element'] = ['Al', 'Ni', 'Cu']
+        record['note'] = 'multiple\nlines' if i % 10 == 0 else 'none given'
+        record['index'] = i
+        model['root']['entry'].append(record)
+    return model.xml()
+
+def build_numbers(nrecords:int) -> str:
+    """Builds XML content where most values are numbers"""
+    model = DM()
+    model['root'] = DM()
+    model['root']['measurement'] = []
+    for i in range(nrecords):
+        record = DM()
+        record['index'] = i
+        record['value'] = [i * 0.5, i * 1.25e-7, -i / 3]
+        record['count'] = [i, -i, i * 1000]
+        record['valid'] = i % 2 == 0
+        model['root']['measurement'].append(record)
+    return model.xml()
+
+def same(a, b) -> bool:
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, float) and math.isnan(a):
+        return math.isnan(b)
+    return a == b
+
+def best(function) -> float:
+    return min(timeit.repeat(function, number=1, repeat=3))
+
+def main():
+    new_postprocessor = xml_postprocessor()
+    for name, content in [('text', build_text(30000)), ('numbers', build_numbers(30000))]:
+        values = []
+        def collect(path, key, value):
+            if isinstance(value, str):
+                values.append((path, key, value))
+            return key, value
+        xmltodict.parse(content, postprocessor=collect)
+        print(f'{name}: {len(content)/1e6:.1f} MB, {len(values)} values')
+        
+        old = list(starmap(old_postprocessor, values))
+        new = list(starmap(new_postprocessor, values))
+        assert all(starmap(same, zip((v for k, v in old), (v for k, v in new))))
+        
+        old = best(lambda: list(starmap(old_postprocessor, values)))
+        new = best(lambda: list(starmap(new_postprocessor, values)))
+        print(f'  {"values":>8} old {old*1000:8.1f} ms new {new*1000:8.1f} ms {old/new:5.2f}x')
+        
+        old = best(lambda: xmltodict.parse(content, postprocessor=old_postprocessor, dict_constructor=DM))
+        new = best(lambda: xmltodict.parse(content, postprocessor=new_postprocessor, dict_constructor=DM))
+        print(f'  {"load":>8} old {old*1000:8.1f} ms new {new*1000:8.1f} ms {old/new:5.2f}x')
+
+if __name__ == '__main__':
+    main()
@@ -37,5 +37,9 @@ setup(name = 'DataModelDict',
       install_requires=[
         'xmltodict'
       ],
+      extras_require={
+        'orjson': ['orjson'],
+        'numpy': ['numpy']
+      },
       package_data={'': ['*']},
       )
\ No newline at end of file
@@ -3,11 +3,16 @@
 # Standard Python libraries
 from pathlib import Path
 import io
+import mmap
+import gzip
+import bz2
+import lzma
 
 # https://docs.pytest.org/
 from pytest import raises
 
 from DataModelDict import uber_open_rmode
+from DataModelDict.uber_open_rmode import read_buffer
 
 class Test_uber_open_rmode():
 
@@ -65,6 +70,78 @@ class Test_uber_open_rmode():
             with uber_open_rmode(badpath) as f:
                 content = f.read()
 
+    def test_mmap(self, tmpdir):
+        """Test that files can be read through a memory map"""
+
+        # Save content to a file in a temp directory
+        filepath = Path(str(tmpdir), 'content.txt')
+        with open(filepath, 'wb') as f:
+            f.write(self.content)
+        
+        # Test reading, seeking and line reads from the mapped file
+        with uber_open_rmode(filepath, use_mmap=True) as f:
+            assert f.readline() == self.content
+            f.seek(8)
+            content = f.read()
+        
+        # Check value of content and that f is closed
+        assert content == self.content[8:]
+        assert f.closed
+
+        # Check that empty files fall back to a regular read
+        emptypath = Path(str(tmpdir), 'empty.txt')
+        emptypath.touch()
+        with uber_open_rmode(emptypath, use_mmap=True) as f:
+            assert f.read() == b''
+
+    def test_buffers(self, tmpdir):
+        """Test that buffer objects are read in place"""
+        
+        # Test bytearray and memoryview content
+        for data in [bytearray(self.content), memoryview(self.content)]:
+            with uber_open_rmode(data) as f:
+                assert f.read(4) == self.content[:4]
+                content = f.read()
+            assert content == self.content[4:]
+            assert f.closed
+        
+        # Test that a given mmap is left open and can be closed afterwards
+        filepath = Path(str(tmpdir), 'content.txt')
+        with open(filepath, 'wb') as f:
+            f.write(self.content)
+        with open(filepath, 'rb') as openf:
+            mm = mmap.mmap(openf.fileno(), 0, access=mmap.ACCESS_READ)
+            with uber_open_rmode(mm) as f:
+                content = f.read()
+            assert content == self.content
+            assert not mm.closed
+            mm.close()
+
+    def test_read_buffer(self, tmpdir):
+        """Test that the rest of the content is given without copying buffers"""
+        filepath = Path(str(tmpdir), 'content.txt')
+        with open(filepath, 'wb') as f:
+            f.write(self.content)
+        for data in [bytearray(self.content), memoryview(self.content), self.content,
+                     self.content.decode(), io.BytesIO(self.content)]:
+            with uber_open_rmode(data, peekable=True) as f:
+                assert f.read(4) == self.content[:4]
+                with read_buffer(f) as content:
+                    assert isinstance(content, memoryview)
+                    assert content == self.content[4:]
+                with raises(ValueError):
+                    content.tobytes()
+                assert f.read() == b''
+        with uber_open_rmode(filepath, use_mmap=True) as f:
+            with read_buffer(f) as content:
+                assert isinstance(content, memoryview)
+                assert content == self.content
+
+        # Other readers are read into bytes
+        with uber_open_rmode(gzip.compress(self.content)) as f:
+            with read_buffer(f) as content:
+                assert content == self.content and isinstance(content, bytes)
+
     def test_stream_objs(self):
         """Test that BytesIO objects are passed through"""
         
@@ -85,6 +162,55 @@ class Test_uber_open_rmode():
             with uber_open_rmode(tstream) as f:
                 content = f.read()
 
+    def test_peekable(self):
+        """Test that peekable wraps objects without peek and leaves them open"""
+        
+        # Test that content can be peeked at without being read
+        bstream = io.BytesIO(self.content)
+        with uber_open_rmode(bstream, peekable=True) as f:
+            assert f.peek()[:4] == self.content[:4]
+            content = f.read()
+        assert content == self.content
+        assert not bstream.closed
+        
+        # Test that objects with peek are passed through
+        with uber_open_rmode(self.content, peekable=True) as f:
+            assert f.peek()[:4] == self.content[:4]
+            assert f.read() == self.content
+        assert f.closed
+
+    def test_compressed(self, tmpdir):
+        """Test that compressed content is decompressed while read"""
+        compressed = {'.gz': gzip.compress(self.content),
+                      '.bz2': bz2.compress(self.content),
+                      '.xz': lzma.compress(self.content),
+                      '.lzma': lzma.compress(self.content, format=lzma.FORMAT_ALONE)}
+        for ext, data in compressed.items():
+            
+            # Save compressed content to a file
+            filepath = Path(str(tmpdir), 'content.txt' + ext)
+            with open(filepath, 'wb') as f:
+                f.write(data)
+            
+            # Test reading from paths, memory maps and open files
+            for use_mmap in [False, True]:
+                with uber_open_rmode(filepath, use_mmap=use_mmap) as f:
+                    assert f.read() == self.content
+                assert f.closed
+            with open(filepath, 'rb') as openf:
+                with uber_open_rmode(openf) as f:
+                    assert f.read() == self.content
+                assert not openf.closed
+            
+            # Formats with magic bytes are identified from content alone
+            if ext != '.lzma':
+                with uber_open_rmode(data) as f:
+                    assert f.read() == self.content
+            
+            # Test that decompression can be turned off
+            with uber_open_rmode(filepath, decompress=False) as f:
+                assert f.read() == data
+
     def test_file_objs(self, tmpdir):
         """Test that file objects in rb mode are passed through"""
         
@@ -1,5 +1,5 @@
 from ast import parse
-from DataModelDict import parsepath, joinpath
+from DataModelDict import parsepath, joinpath, KeyPath, compile_path
 
 def test_path_manipulations():
     path1 = ['my-data-model', 1, 'measurement', 9, 7, 'length', 'unit']
@@ -9,4 +9,23 @@ def test_path_manipulations():
     pathstr2 = joinpath(path2)
 
     assert path1 == path2
-    assert pathstr1 == pathstr2
\ No newline at end of file
+    assert pathstr1 == pathstr2
+
+def test_KeyPath():
+    path = KeyPath('my-data-model[1].measurement[9][7].length')
+    assert path.terms == ('my-data-model', 1, 'measurement', 9, 7, 'length')
+    assert path == ['my-data-model', 1, 'measurement', 9, 7, 'length']
+    assert path.aslist() == parsepath(str(path))
+    assert str(path) == 'my-data-model[1].measurement[9][7].length'
+    assert str(KeyPath(['a', 0, 'b'], delimiter='/')) == 'a[0]/b'
+    assert path[:2] == KeyPath(['my-data-model', 1]) and path[-1] == 'length'
+    assert len({path, KeyPath(path.terms)}) == 1
+
+    # Compiled paths are cached
+    assert compile_path('a.b[2]') is compile_path('a.b[2]')
+    assert compile_path('a/b<2>', '/', '<', '>') == ['a', 'b', 2]
+    assert compile_path('a.b[2]') is not compile_path('a/b<2>', '/', '<', '>')
+
+    # Lists returned by parsepath are not shared
+    parsepath('a.b').append('c')
+    assert parsepath('a.b') == ['a', 'b']
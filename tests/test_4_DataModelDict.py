@@ -1,8 +1,18 @@
 # coding: utf-8
-from pytest import raises
+from pytest import raises, importorskip
 from pathlib import Path
+import io
+import sys
+import copy
+import pickle
+import gzip
+import bz2
+import lzma
+import subprocess
 
 from DataModelDict import DataModelDict as DM
+from DataModelDict import CompactDataModelDict
+from DataModelDict import PathCursor, KeyPath, compile_selector
 
 class TestDataModelDict():
 
@@ -116,6 +126,176 @@ class TestDataModelDict():
         with open(xmlfile) as f:
             assert f.read() == self.xmlindent
 
+        with open(xmlfile, 'wb') as f:
+            model.xml(fp=f)
+        with open(xmlfile) as f:
+            assert f.read() == self.xmlcompact
+
+    def test_stream(self):
+        """Test loading from pipes and other non-seekable streams"""
+        for content in [self.jsoncompact, self.xmlindent]:
+            
+            # Read from a subprocess pipe
+            script = f'import sys; sys.stdout.write({content!r})'
+            with subprocess.Popen([sys.executable, '-c', script],
+                                  stdout=subprocess.PIPE) as process:
+                model = DM(process.stdout)
+            assert model == self.model
+
+            # Read from a raw stream that cannot seek or peek
+            class Stream(io.RawIOBase):
+                def __init__(self, content):
+                    self.content = io.BytesIO(content)
+                def readable(self):
+                    return True
+                def readinto(self, b):
+                    return self.content.readinto(b)
+            stream = Stream(('\n' * 100000 + content).encode())
+            assert DM(stream) == self.model
+            assert not stream.closed
+
+        with raises(ValueError):
+            DM(Stream(b' \n '))
+
+    def test_compressed(self, tmpdir):
+        """Test loading compressed files"""
+        for ext, compress in [('.gz', gzip.compress), ('.bz2', bz2.compress),
+                              ('.xz', lzma.compress)]:
+            for fmt, content in [('json', self.jsoncompact), ('xml', self.xmlindent)]:
+                filepath = Path(tmpdir, f'model.{fmt}{ext}')
+                with open(filepath, 'wb') as f:
+                    f.write(compress(content.encode()))
+                assert DM(filepath) == self.model
+                assert DM(str(filepath), use_mmap=True) == self.model
+
+    def test_load_many(self, tmpdir):
+        """Test loading many files in parallel"""
+        paths = []
+        for i in range(20):
+            path = Path(tmpdir, f'model{i}.json' if i % 2 == 0 else f'model{i}.xml')
+            with open(path, 'w') as f:
+                if i % 2 == 0:
+                    self.model.json(fp=f)
+                else:
+                    self.model.xml(fp=f)
+            paths.append(path)
+        badpath = Path(tmpdir, 'bad.json')
+        with open(badpath, 'w') as f:
+            f.write('{"a": ')
+        paths.insert(5, badpath)
+
+        for workers in [1, 2]:
+            results = list(DM.load_many(paths, workers=workers, chunksize=3))
+            assert [path for path, model in results] == paths
+            for path, model in results:
+                if path == badpath:
+                    assert isinstance(model, ValueError)
+                else:
+                    assert isinstance(model, DM)
+                    assert model == self.model
+
+        results = dict(CompactDataModelDict.load_many(paths, workers=2, ordered=False))
+        assert set(results.keys()) == set(paths)
+        assert isinstance(results[paths[0]]['my-data-model'], CompactDataModelDict)
+        assert results[paths[0]] == self.model
+
+    def test_pickle(self):
+        """Test pickling and copying models"""
+        for cls in [DM, CompactDataModelDict]:
+            model = cls(self.jsoncompact)
+            model['my-data-model']['other'] = [1, [2, cls()], None, float('inf'), (3, 4), DM(a=1)]
+            for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+                loaded = pickle.loads(pickle.dumps(model, protocol))
+                assert loaded == model
+                assert isinstance(loaded['my-data-model']['measurement'][2], cls)
+                assert isinstance(loaded['my-data-model']['other'][4], tuple)
+                assert type(loaded['my-data-model']['other'][5]) is DM
+            
+            # Shared and recursive elements are kept
+            shared = cls(a=1)
+            model['my-data-model']['other'] = [shared, shared, model]
+            loaded = pickle.loads(pickle.dumps(model))
+            assert loaded['my-data-model']['other'][0] is loaded['my-data-model']['other'][1]
+            assert loaded['my-data-model']['other'][2] is loaded
+
+            # Test shallow and deep copies
+            model = cls(self.jsoncompact)
+            assert copy.copy(model)['my-data-model'] is model['my-data-model']
+            deep = copy.deepcopy(model)
+            assert deep == model
+            assert deep['my-data-model'] is not model['my-data-model']
+
+            # Elements also referred to from outside keep their identity
+            leaf = [1, 2]
+            model['my-data-model']['leaf'] = leaf
+            both = copy.deepcopy([model, leaf])
+            assert both[0]['my-data-model']['leaf'] is both[1]
+            assert both[0] == model
+
+        # Instance attributes are kept
+        model = DM(self.jsoncompact)
+        model.note = 'checked'
+        model['my-data-model'].note = 'nested'
+        for loaded in [pickle.loads(pickle.dumps(model)), copy.copy(model), copy.deepcopy(model)]:
+            assert loaded == model
+            assert loaded.note == 'checked'
+            assert loaded['my-data-model'].note == 'nested'
+        del model['my-data-model'].note
+        loaded = pickle.loads(pickle.dumps(model))
+        assert loaded.note == 'checked' and not hasattr(loaded['my-data-model'], 'note')
+
+    def test_xml_unchanged(self):
+        """Test that xml() does not change the model's values"""
+        model = DM([('a', DM([('@x', None), ('b', None), ('c', [True, float('nan')])])),
+                    ('d', None)])
+        json = model.json()
+        assert model.xml(full_document=False) == '<a x="None"><b></b><c>true</c><c>NaN</c></a><d>None</d>'
+        assert model.json() == json
+
+    def test_xml_values(self):
+        """Test the conversion of XML values"""
+        values = {'0': 0, '-12': -12, '2.5': 2.5, '-.5e-3': -0.0005, '1E5': 1e5,
+                  '-0': '-0', '007': '007', '+5': '+5', '1_000': '1_000',
+                  '1_0.5': 10.5, '٣.٥': 3.5, '+inf': float('inf'),
+                  '1' * 5000: float('inf'), '.': '.', 'e5': 'e5', 'nine': 'nine',
+                  'True': True, 'false': False, 'x\\ty': 'x\ty', '\\n5': '\n5'}
+        content = ''.join(f'<v>{value}</v>' for value in values)
+        model = DM(f'<a>{content}</a>')
+        for value, converted in zip(values.values(), model['a']['v']):
+            assert converted == value
+            assert type(converted) is type(value)
+
+    def test_xml_types(self):
+        """Test loading XML values with given types"""
+        content = ('<root><id>007</id><code>1e5</code><flag>True</flag><note>a\\nb</note>'
+                   '<item key="5"><id>12</id><value>2.5</value></item>'
+                   '<item key="6"><id>13</id><value>3</value></item></root>')
+
+        # Keys match anywhere and paths take precedence
+        model = DM(content, types={'id': str, 'code': str, 'flag': bool,
+                                   'root.item.id': int, ('root', 'item', '@key'): str,
+                                   'value': lambda v: float(v) * 2})
+        assert model['root']['id'] == '007'
+        assert model['root']['code'] == '1e5'
+        assert model['root']['flag'] is True
+        assert model['root']['note'] == 'a\nb'
+        assert model.finds('id') == ['007', 12, 13]
+        assert model.finds('@key') == ['5', '6']
+        assert model.finds('value') == [5.0, 6.0]
+
+        # A single converter is used for all values
+        model = DM(content, types=str)
+        assert model['root']['flag'] == 'True'
+        assert model['root']['note'] == 'a\nb'
+        assert model.finds('value') == ['2.5', '3']
+
+        # JSON values are not changed
+        assert DM('{"id": 7}', types={'id': str})['id'] == 7
+        with raises(ValueError):
+            DM(content, types={'flag': int})
+        with raises(TypeError):
+            DM(content, types={'flag': 'int'})
+
     def test_getset(self):
         model = self.model
 
@@ -132,7 +312,49 @@ class TestDataModelDict():
         model['my-data-model']['process']['Instrument']['Name'] = 'Shiny Thing'
         assert model['my-data-model']['process']['Instrument']['Name'] == 'Shiny Thing'
         assert model[path] == 'Shiny Thing'
-    
+
+    def test_getset_paths(self):
+        model = self.model
+        path = KeyPath('my-data-model.measurement[1].length.value')
+        assert model[path] == 1.25
+        model[path] = 1.5
+        assert model['my-data-model']['measurement'][1]['length']['value'] == 1.5
+        assert model.get(path) == 1.5
+        assert model.get(KeyPath('my-data-model.measurement[9]'), 'none') == 'none'
+        assert model.get(['my-data-model', 'name', 'x']) is None
+        del model[path]
+        assert 'value' not in model['my-data-model']['measurement'][1]['length']
+
+        # Path strings are only used when enabled
+        with raises(KeyError):
+            model['my-data-model.name']
+        assert model.get('my-data-model.name') is None
+
+        class PathDataModelDict(DM):
+            string_paths = True
+        model = PathDataModelDict(self.jsoncompact)
+        assert model['my-data-model.measurement[2].temperature.value'] == 300
+        assert model['my-data-model']['measurement[2].length'] == {'value': 1.26, 'unit': 'm'}
+        assert model.get('my-data-model.missing.value', 0) == 0
+
+        # Keys are set and deleted as given
+        model['my-data-model.process.method'] = 'Guesswork'
+        assert model['my-data-model']['process']['method'] == 'By the book'
+        assert list(model.keys())[-1] == 'my-data-model.process.method'
+        assert model['my-data-model.process.method'] == 'Guesswork'
+        del model['my-data-model.process.method']
+        assert 'my-data-model.process.method' not in model
+        with raises(KeyError):
+            del model['my-data-model.process.method']
+
+        # Dotted element names are loaded as keys
+        model = PathDataModelDict('<r><a><b>1</b></a><a.b>2</a.b></r>')
+        assert model == {'r': {'a': {'b': 1}, 'a.b': 2}}
+        assert model['r.a.b'] == 1 and model['r']['a.b'] == 2
+        model = next(PathDataModelDict.iterload(io.BytesIO(b'<r><a><b>1</b></a><a.b>2</a.b></r>'), 'r'))
+        assert model == {'a': {'b': 1}, 'a.b': 2}
+        assert PathDataModelDict('{"x.y": {"z": 1}}')['x.y']['z'] == 1
+
     def test_find(self):
         model = self.model
         assert model.find('Name') == 'Shiny Thing'
@@ -189,4 +411,324 @@ class TestDataModelDict():
         # Append a value and check again
         model['test'].append('ordinal', 'third')
         assert model['test'].get('ordinal', None) == ['first', 'second', 'third']
-        assert model['test'].aslist('ordinal') == ['first', 'second', 'third']
\ No newline at end of file
+        assert model['test'].aslist('ordinal') == ['first', 'second', 'third']
+
+    def test_extend(self):
+        # extend gives the same result as appending each value
+        for start in [[], ['a'], [['a']], ['a', 'b']]:
+            for values in [[], ['x'], ['x', 'y'], [['x'], 'y'], [DM([('v', 1)])]]:
+                old = DM()
+                new = DM()
+                for value in start:
+                    old.append('key', copy.deepcopy(value))
+                    new.append('key', copy.deepcopy(value))
+                for value in values:
+                    old.append('key', copy.deepcopy(value))
+                new.extend('key', (copy.deepcopy(value) for value in values))
+                assert new == old
+
+    def test_from_columns(self):
+        model = DM()
+        model['my-data-model'] = DM()
+        model['my-data-model']['measurement'] = self.model['my-data-model']['measurement'][0]
+        model['my-data-model'].from_columns('measurement', {
+            ('temperature', 'value'): [200, 300, 400, 500],
+            'temperature.unit': ['K'] * 4,
+            'length.value': [1.25, 1.26, 1.28, 1.29],
+            'length.unit': ['m'] * 4})
+        assert model['my-data-model']['measurement'] == self.model['my-data-model']['measurement']
+        assert isinstance(model['my-data-model']['measurement'][1]['length'], DM)
+
+        for cls in [DM, CompactDataModelDict]:
+            model = cls()
+            model.from_columns('row', {'a': range(3), 'b.c': iter('xyz')})
+            assert model == DM([('row', [DM([('a', i), ('b', DM([('c', c)]))])
+                                         for i, c in zip(range(3), 'xyz')])])
+            assert isinstance(model['row'][0]['b'], cls)
+
+        with raises(ValueError):
+            DM().from_columns('row', {'a': [1, 2], 'b': [1]})
+        with raises(ValueError):
+            DM().from_columns('row', {'a': [1], 'a.b': [1]})
+        with raises(ValueError):
+            DM().from_columns('row', {'a[0]': [1]})
+
+        np = importorskip('numpy')
+        model = DM()
+        model.from_columns('row', {'a': np.arange(2), 'b': np.array([0.5, 1.5])})
+        assert model['row'][1] == {'a': 1, 'b': 1.5}
+        assert type(model['row'][1]['a']) is int
+
+    def test_iterload(self):
+        model = DM(self.xmlindent)
+        measurements = model.finds('measurement')
+
+        # Records match the loaded values regardless of chunk boundaries
+        for chunksize in [16, 65536]:
+            records = list(DM.iterload(self.xmlindent, 'my-data-model.measurement',
+                                       chunksize=chunksize))
+            assert records == measurements
+            assert isinstance(records[0], DM)
+
+        records = list(DM.iterload(self.xmlcompact, ['my-data-model', 'name']))
+        assert records == ['Demo']
+
+        with raises(ValueError):
+            list(DM.iterload(self.xmlcompact, ['my-data-model', 0]))
+
+    def test_iterload_json(self):
+        model = DM(self.jsonindent)
+        measurements = model.finds('measurement')
+
+        # Records match the loaded values regardless of chunk boundaries
+        for chunksize in [1, 7, 65536]:
+            records = list(DM.iterload(self.jsonindent, 'my-data-model.measurement',
+                                       chunksize=chunksize))
+            assert records == measurements
+            assert isinstance(records[0], DM)
+
+        # Paths with indices and top-level arrays
+        records = list(DM.iterload(self.jsoncompact, 'my-data-model.measurement[2].length'))
+        assert records == [measurements[2]['length']]
+        records = list(DM.iterload(b'[1, 2.5, "a\\"]", {"b": null}]', [], chunksize=3))
+        assert records == [1, 2.5, 'a"]', DM([('b', None)])]
+
+        # Missing paths yield nothing
+        assert list(DM.iterload(self.jsoncompact, ['my-data-model', 'missing'])) == []
+
+    def test_index(self):
+        model = self.model
+        model.build_index()
+        assert model.find('Name') == 'Shiny Thing'
+        assert model.paths('value') == self.model.paths('value')
+
+        temp = DM([('value', 200), ('unit', 'K')])
+        assert len(model.finds('measurement', no={'temperature':temp})) == 4
+
+        # Changes to nested elements are picked up
+        model['my-data-model']['process']['Instrument']['Name'] = 'Scuffed-Up Thing'
+        assert model.find('Name') == 'Scuffed-Up Thing'
+        model['my-data-model'].append('measurement', DM([('temperature', temp)]))
+        assert len(model.finds('measurement')) == 6
+        del model[['my-data-model', 'process', 'Instrument']]
+        assert model.finds('Name') == []
+
+        # Changes to list items are picked up
+        model[['my-data-model', 'measurement', 0]] = DM([('x', 99)])
+        assert model.finds('x') == [99]
+        del model[['my-data-model', 'measurement', 0]]
+        assert model.finds('x') == []
+        assert len(model.finds('measurement')) == 5
+        cursor = model.paths('measurement')[0]
+        cursor.value = DM([('x', 98)])
+        assert model.finds('x') == [98]
+
+        model.drop_index()
+        assert len(model.finds('measurement')) == 5
+
+        # Changes to elements shared by indexed trees are picked up by each
+        shared = DM([('k', 1)])
+        tree1 = DM([('x', shared)])
+        tree2 = DM([('y', shared)])
+        tree1.build_index()
+        tree2.build_index()
+        shared['k'] = 2
+        assert tree1.finds('k') == [2]
+        assert tree2.finds('k') == [2]
+        tree1.drop_index()
+        shared['k'] = 3
+        assert tree2.finds('k') == [3]
+
+    def test_compile_query(self):
+        model = self.model
+        temp = DM([('value', 200), ('unit', 'K')])
+
+        query = DM.compile_query('measurement', no={'temperature':temp})
+        assert query.run(model) == model.finds('measurement', no={'temperature':temp})
+        assert query.paths(model) == model.paths('measurement', no={'temperature':temp})
+        assert len(model.finds(query)) == 4
+
+        # Multiple terms on the same and different keys
+        query = DM.compile_query('measurement', yes={'unit':'K', 'value':1.26},
+                                 no={'value':200})
+        assert [m['temperature']['value'] for m in query.iterrun(model)] == [300]
+
+        with raises(ValueError):
+            model.finds(query, yes={'unit':'K'})
+
+    def test_cursor(self):
+        model = self.model
+
+        cursor = model.cursor('my-data-model.process.Instrument.Name')
+        assert cursor == ['my-data-model', 'process', 'Instrument', 'Name']
+        assert cursor.value == 'Shiny Thing'
+        cursor.value = 'Scuffed-Up Thing'
+        assert model['my-data-model']['process']['Instrument']['Name'] == 'Scuffed-Up Thing'
+        assert not cursor.is_stale()
+
+        # Paths returned by searches are cursors
+        path = model.path('Name')
+        assert isinstance(path, PathCursor)
+        assert model[path] is path.value
+        path = model.paths('measurement')[2]
+        assert path.value['temperature']['value'] == 300
+
+        # Replacing a container above the element makes the cursor stale
+        model['my-data-model']['process'] = DM([('Instrument', DM([('Name', 'New')]))])
+        assert cursor.is_stale()
+        cursor.refresh()
+        assert cursor.value == 'New'
+
+        del model['my-data-model']['process']
+        assert cursor.is_stale()
+        with raises(KeyError):
+            model.cursor(['my-data-model', 'process'])
+
+    def test_select(self):
+        model = self.model
+        results = list(model.select('my-data-model.measurement[*].temperature.value'))
+        assert [value for path, value in results] == [100, 200, 300, 400, 500]
+        assert results[1][0] == ['my-data-model', 'measurement', 1, 'temperature', 'value']
+        assert str(results[1][0]) == 'my-data-model.measurement[1].temperature.value'
+        for path, value in results:
+            assert model[path] == value
+
+        # Wildcard keys, indices and levels
+        assert [v for p, v in model.select('my-data-model.measurement[2].*.unit')] == ['K', 'm']
+        assert [v for p, v in model.select('my-data-model.process.*')] == [
+            model['my-data-model']['process']['Instrument'], 'By the book']
+        assert [str(p) for p, v in model.select('**.Name')] == [
+            'my-data-model.process.Instrument.Name']
+        assert [v for p, v in model.select('**.length.value')] == [1.24, 1.25, 1.26, 1.28, 1.29]
+        assert [v for p, v in model.select('my-data-model.**.measurement[-1].**.unit')] == ['K', 'm']
+        assert [p for p, v in model.select('**')][:2] == [[], ['my-data-model']]
+        paths = [p for p, v in model.select('**[*]')]
+        assert len(paths) == len(set(paths)) == len(list(model.select('**'))) - 1
+
+        # [*] also matches values that are not lists, like aslist()
+        assert [v for p, v in model.select('my-data-model.name[*]')] == ['Demo']
+        assert list(model.select('my-data-model.missing[*]')) == []
+        assert list(model.select('my-data-model.measurement.temperature')) == []
+
+        # Selectors are compiled once and can be given directly
+        selector = compile_selector('**.temperature.value')
+        assert selector is compile_selector('**.temperature.value')
+        assert [v for p, v in model.select(selector)] == [100, 200, 300, 400, 500]
+        assert selector.run(model) == list(model.select(selector))
+
+        with raises(ValueError):
+            compile_selector('measurement[x].value')
+        with raises(ValueError):
+            compile_selector('')
+
+    def test_finds_many(self):
+        model = self.model
+        temp = DM([('value', 200), ('unit', 'K')])
+        queries = {'measurement': ({}, {'temperature':temp}),
+                   'Name': None,
+                   'length': DM.compile_query('length', yes={'value':1.25})}
+
+        results = model.finds_many(queries)
+        assert list(results.keys()) == ['measurement', 'Name', 'length']
+        assert results['measurement'] == model.finds('measurement', no={'temperature':temp})
+        assert results['Name'] == ['Shiny Thing']
+        assert results['length'] == [DM([('value', 1.25), ('unit', 'm')])]
+
+        results = model.paths_many(queries)
+        assert results['measurement'] == model.paths('measurement', no={'temperature':temp})
+        assert results['Name'] == [['my-data-model', 'process', 'Instrument', 'Name']]
+
+    def test_to_columns(self):
+        np = importorskip('numpy')
+        model = self.model
+        fields = {'T': ['temperature', 'value'], 'L': 'length.value', 'unit': 'length.unit'}
+        columns = model.to_columns('measurement', fields)
+        assert list(columns.keys()) == ['T', 'L', 'unit']
+        assert columns['T'].dtype == int and columns['T'].tolist() == [100, 200, 300, 400, 500]
+        assert columns['L'].dtype == float and columns['L'].tolist() == [1.24, 1.25, 1.26, 1.28, 1.29]
+        assert columns['unit'].dtype.kind == 'U' and columns['unit'].tolist() == ['m'] * 5
+
+        # Missing values, fills, given dtypes and conditions
+        measurements = model['my-data-model']['measurement']
+        del measurements[1]['temperature']
+        measurements[2]['length']['value'] = [1, 2]
+        columns = model.to_columns('measurement', {'T': 'temperature.value', 'T2': 'temperature.value',
+                                                   'L': 'length.value', 'x': 'x', 'first': 'length.value[0]'},
+                                   dtypes={'T2': 'f4'}, fill={'T': -1})
+        assert columns['T'].tolist() == [100, -1, 300, 400, 500]
+        assert columns['T2'].dtype == np.float32 and np.isnan(columns['T2'][1])
+        assert columns['L'].dtype == object and columns['L'][2] == [1, 2]
+        assert np.isnan(columns['x']).all()
+        assert columns['first'][2] == 1 and np.isnan(columns['first']).sum() == 4
+        columns = model.to_columns('measurement', {'T': 'temperature.value'}, yes={'length': {'value': 1.28, 'unit': 'm'}})
+        assert columns['T'].tolist() == [400]
+
+        # Structured arrays
+        array = model.to_columns('measurement', fields, fill={'T': 0}, structured=True)
+        assert array.dtype.names == ('T', 'L', 'unit')
+        assert array['T'].tolist() == [100, 0, 300, 400, 500]
+
+    def test_iterrows(self):
+        model = self.model
+        measurements = model['my-data-model']['measurement']
+        del measurements[1]['temperature']
+        measurements[2]['length']['value'] = [1, 2]
+
+        rows = model.iterrows('measurement', ['temperature.value', ['length', 'unit'],
+                                              'length.value[1]', 'x.y'])
+        assert not isinstance(rows, list)
+        assert list(rows) == [(100, 'm', None, None), (None, 'm', None, None),
+                              (300, 'm', 2, None), (400, 'm', None, None),
+                              (500, 'm', None, None)]
+
+        rows = model.iterrows('measurement', {'T': 'temperature.value'}, fill=-1,
+                              no={'length': {'value': 1.24, 'unit': 'm'}})
+        assert list(rows) == [(-1,), (300,), (400,), (500,)]
+        assert list(model.iterrows('value', ['a'])) == [(None,)] * 10
+
+    def test_itervaluepaths(self):
+        model = self.model
+        paths = list(model.itervaluepaths())
+        assert paths[:3] == [['my-data-model', 'name'], ['my-data-model', 'author'],
+                             ['my-data-model', 'process', 'Instrument', 'Name']]
+        assert paths[-1] == ['my-data-model', 'measurement', 4, 'length', 'unit']
+        assert len(paths) == 25
+
+        # Lists mixing dicts and values end at their first value
+        model = DM([('a', [DM([('b', 1)]), DM([('c', 2)]), 3, DM([('d', 4)])]), ('e', 5)])
+        assert list(model.itervaluepaths()) == [['a', 0, 'b'], ['a', 1, 'c'], ['a'], ['e']]
+
+    def test_deep(self):
+        # Build a model deeper than the recursion limit
+        model = DM()
+        node = model
+        for i in range(5000):
+            node['value'] = i
+            node['child'] = DM()
+            node = node['child']
+        
+        assert len(model.finds('value')) == 5000
+        path = model.paths('value')[-1]
+        assert len(path) == 5000
+        assert path.value == 4999
+        assert len(list(model.itervaluepaths())) == 5000
+
+    def test_compact(self):
+        """Test CompactDataModelDict conversions and methods"""
+        model = CompactDataModelDict(self.jsoncompact)
+        assert isinstance(model['my-data-model']['measurement'][0], CompactDataModelDict)
+        assert not hasattr(model, '__dict__')
+        assert model.json() == self.jsoncompact
+        assert model.xml() == self.xmlcompact
+        assert CompactDataModelDict(self.xmlcompact).json() == self.jsoncompact
+        assert model == self.model
+
+        assert model.finds('value') == self.model.finds('value')
+        assert model.paths('value') == self.model.paths('value')
+        assert model.find('length', yes={'value':1.25}) == {'value':1.25, 'unit':'m'}
+        assert model[['my-data-model', 'name']] == 'Demo'
+
+        model.build_index()
+        model['my-data-model']['measurement'][0].update({'new': 1})
+        assert model.finds('new') == [1]
+        assert isinstance(model.copy(), CompactDataModelDict)
@@ -0,0 +1,103 @@
+# coding: utf-8
+
+# Standard Python libraries
+import io
+import math
+
+# https://docs.pytest.org/
+from pytest import raises
+
+from DataModelDict import DataModelDict as DM
+from DataModelDict import available_json_backends, get_json_backend, set_json_backend
+
+class Test_json_backends():
+
+    @property
+    def content(self):
+        """str: JSON content for testing"""
+        return ('{"name": "Demo", "z": 1, "a": [1, 2.0, -0, 1e5, 0.1], '
+                '"big": 9223372036854775807, "u64": 1844674407370955161, '
+                '"text": "caf\\u00e9 \\n", "none": null, "flags": [true, false], '
+                '"nested": [[{"b": {"c": []}}], {}], "a": "again"}')
+
+    def check(self, model):
+        """Checks that content was decoded like Python's json module does"""
+        assert isinstance(model, DM)
+        assert list(model.keys()) == ['name', 'z', 'a', 'big', 'u64', 'text',
+                                      'none', 'flags', 'nested']
+        assert model['a'] == 'again'
+        assert model['big'] == 9223372036854775807
+        assert model['u64'] == 1844674407370955161
+        assert model['text'] == 'café \n'
+        assert isinstance(model['nested'][0][0], DM)
+        assert isinstance(model['nested'][0][0]['b'], DM)
+        assert isinstance(model['nested'][1], DM)
+
+    def test_load(self):
+        """Test that all backends load identical values"""
+        for backend in available_json_backends():
+            model = DM(self.content, backend=backend)
+            self.check(model)
+            assert model == DM(self.content, backend='json')
+
+        content = ('{"a": [1, 2.0, -0, -0.0, 1e5, 0.1, 1E400, NaN], '
+                   '"big": [123456789012345678901234, 18446744073709551616]}')
+        for backend in available_json_backends():
+            model = DM(content, backend=backend)
+            assert model['big'] == [123456789012345678901234, 18446744073709551616]
+            assert [type(v) for v in model['big']] == [int, int]
+            values = model['a']
+            assert [type(v) for v in values] == [int, float, int, float,
+                                                 float, float, float, float]
+            assert values[:7] == [1, 2.0, 0, 0.0, 100000.0, 0.1, math.inf]
+            assert math.copysign(1, values[3]) == -1
+            assert math.isnan(values[7])
+
+        content = ('{"neg": [-9223372036854775808, -9223372036854775809, '
+                   '-9999999999999999999]}')
+        for backend in available_json_backends():
+            model = DM(content, backend=backend)
+            assert model['neg'] == [-9223372036854775808, -9223372036854775809,
+                                    -9999999999999999999]
+            assert [type(v) for v in model['neg']] == [int, int, int]
+
+    def test_load_buffers(self):
+        """Test that all backends load bytes-like and file-like content"""
+        content = self.content.encode()
+        expected = DM(self.content, backend='json')
+        for backend in available_json_backends():
+            for data in [bytearray(content), memoryview(content), io.BytesIO(content)]:
+                assert DM(data, backend=backend) == expected
+
+    def test_json(self):
+        """Test that all backends write content that loads identically"""
+        model = DM(self.content)
+        model['nan'] = [math.nan, math.inf]
+        for backend in available_json_backends():
+            for kwargs in [{}, {'indent': 2}, {'indent': 4}, {'sort_keys': True}]:
+                content = model.json(backend=backend, **kwargs)
+                newmodel = DM(content)
+                assert math.isnan(newmodel['nan'][0])
+                assert newmodel['nan'][1] == math.inf
+                expected = DM(model.json(backend='json', **kwargs))
+                assert list(newmodel.keys()) == list(expected.keys())
+                del newmodel['nan']
+                del expected['nan']
+                assert newmodel == expected
+
+            f = io.StringIO()
+            model.json(fp=f, backend=backend)
+            assert f.getvalue() == model.json(backend=backend)
+
+    def test_set_backend(self):
+        """Test the module-level backend setting"""
+        assert get_json_backend() == 'json'
+        with raises(ValueError):
+            set_json_backend('nojson')
+        try:
+            set_json_backend(available_json_backends()[-1])
+            assert get_json_backend() == available_json_backends()[-1]
+            self.check(DM(self.content))
+        finally:
+            set_json_backend('json')
+        assert get_json_backend() == 'json'
@@ -0,0 +1,99 @@
+# coding: utf-8
+
+# https://docs.pytest.org/
+from pytest import raises
+
+from DataModelDict import DataModelDict as DM
+from DataModelDict import LazyDataModelDict
+
+class Test_LazyDataModelDict():
+
+    @property
+    def model(self):
+        """DataModelDict: model for testing"""
+        model = DM()
+        model['root'] = DM()
+        model['root']['name'] = 'demo'
+        model['root']['units'] = DM([('length', 'm'), ('energy', 'eV')])
+        model['root']['measurement'] = []
+        for i in range(20):
+            record = DM()
+            record['key'] = f'id-{i}'
+            record['value'] = DM([('value', i * 0.5), ('unit', 'm')])
+            record['note'] = 'has [brackets] {and} "quotes"'
+            model['root']['measurement'].append(record)
+        model['root']['summary'] = DM([('count', 20), ('unit', 'none')])
+        return model
+
+    def test_access(self):
+        """Test that accessed values match those of a full load"""
+        model = self.model
+        for content in [model.json(), model.json(indent=2), model.xml()]:
+            for lazy_size in [0, 100, 65536]:
+                lazy = LazyDataModelDict(content.encode('UTF-8'), lazy_size=lazy_size)
+                assert lazy['root']['summary']['count'] == 20
+                assert lazy[['root', 'units', 'energy']] == 'eV'
+                assert list(lazy['root'].keys()) == list(model['root'].keys())
+                assert len(lazy['root']['measurement']) == 20
+                assert lazy['root']['measurement'][3]['value']['value'] == 1.5
+                assert lazy['root'].aslist('name') == ['demo']
+                assert lazy['root'].get('missing') is None
+                assert 'units' in lazy['root']
+                with raises(KeyError):
+                    lazy['root']['missing']
+
+                if lazy_size == 0:
+                    assert isinstance(lazy['root']['units'], LazyDataModelDict)
+                elif lazy_size == 65536:
+                    assert isinstance(lazy['root'], DM)
+
+    def test_finds(self):
+        """Test that finds gives the same values as DataModelDict.finds"""
+        model = self.model
+        for content in [model.json(), model.xml()]:
+            for lazy_size in [0, 65536]:
+                lazy = LazyDataModelDict(content, lazy_size=lazy_size)
+                assert lazy.finds('unit') == model.finds('unit')
+                assert lazy.finds('key') == model.finds('key')
+                assert lazy.find('value', yes={'value': 2.0})['unit'] == 'm'
+                assert lazy.finds('missing') == []
+                with raises(ValueError):
+                    lazy.find('unit')
+
+    def test_materialize(self):
+        """Test that materialize builds the same model as a full load"""
+        model = self.model
+        for content in [model.json(), model.xml()]:
+            for lazy_size in [0, 100, 65536]:
+                lazy = LazyDataModelDict(content, lazy_size=lazy_size)
+                assert lazy.materialize() == model
+
+                # Materializing after partial access
+                lazy = LazyDataModelDict(content, lazy_size=lazy_size)
+                lazy['root']['units']
+                assert lazy.materialize() == model
+
+    def test_file(self, tmpdir):
+        """Test loading from files with and without memory-mapping"""
+        model = self.model
+        for fmt in ['json', 'xml']:
+            fname = tmpdir.join(f'model.{fmt}')
+            with open(fname, 'w', encoding='UTF-8') as f:
+                if fmt == 'json':
+                    model.json(fp=f)
+                else:
+                    model.xml(fp=f)
+            for use_mmap in [False, True]:
+                lazy = LazyDataModelDict(str(fname), use_mmap=use_mmap, lazy_size=0)
+                assert lazy.format == fmt
+                assert lazy['root']['summary']['unit'] == 'none'
+                assert lazy.materialize() == model
+
+    def test_invalid(self):
+        """Test that invalid content raises errors"""
+        with raises(ValueError):
+            LazyDataModelDict('[1, 2]', format='json')
+        with raises(ValueError):
+            LazyDataModelDict('{"a": 1}', format='yaml')
+        with raises(ValueError):
+            LazyDataModelDict('{"a": 1 "b": 2}', lazy_size=0)['b']
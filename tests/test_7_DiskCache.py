@@ -0,0 +1,135 @@
+# coding: utf-8
+
+# Standard Python libraries
+import os
+import pickle
+from pathlib import Path
+from decimal import Decimal
+
+from DataModelDict import DataModelDict as DM
+from DataModelDict import CompactDataModelDict
+from DataModelDict import DiskCache
+
+class Test_DiskCache():
+
+    @property
+    def content(self):
+        """str: JSON content for testing"""
+        return '{"root": {"name": "demo", "value": [1, 2.5, null], "unit": {"a": "m"}}}'
+
+    def test_load(self, tmpdir):
+        """Test that entries are used only while files are unchanged"""
+        cache = DiskCache(Path(tmpdir, 'cache'))
+        path = Path(tmpdir, 'model.json')
+        path.write_text(self.content)
+        calls = []
+        def parse():
+            calls.append(1)
+            return DM(path)
+
+        # First load parses, second uses the entry
+        assert cache.load(path, parse) == DM(self.content)
+        assert cache.load(str(path), parse) == DM(self.content)
+        assert len(calls) == 1
+
+        # Files that are only touched are recognized by their hash, and
+        # their new mtime is recorded so they are not hashed again
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert cache.load(path, parse) == DM(self.content)
+        assert len(calls) == 1
+        entry, = Path(tmpdir, 'cache').glob('*.pkl')
+        with open(entry, 'rb') as f:
+            assert pickle.load(f)[2] == stat.st_mtime_ns + 10**9
+        assert cache.load(path, parse) == DM(self.content)
+        assert len(calls) == 1
+
+        # Changed files are parsed again
+        path.write_text(self.content.replace('demo', 'changed'))
+        assert cache.load(path, parse)['root']['name'] == 'changed'
+        assert len(calls) == 2
+
+        # Options are cached separately
+        cache.load(path, parse, options=('other',))
+        assert len(calls) == 3
+
+        # Unreadable entries are treated as missing
+        for entry in Path(tmpdir, 'cache').glob('*.pkl'):
+            entry.write_bytes(b'junk')
+        assert cache.load(path, parse)['root']['name'] == 'changed'
+        assert len(calls) == 4
+
+        cache.clear()
+        assert cache.size == 0
+
+    def test_evict(self, tmpdir):
+        """Test that the least recently used entries are removed"""
+        cache = DiskCache(Path(tmpdir, 'cache'), max_size=1000)
+        paths = []
+        for i in range(4):
+            path = Path(tmpdir, f'model{i}.json')
+            path.write_text(f'{{"value": "{i}{"x" * 300}"}}')
+            paths.append(path)
+
+            # Mark the first entry as used each time
+            cache.load(path, lambda: DM(path))
+            cache.load(paths[0], lambda: DM(paths[0]))
+            assert cache.size <= 1000
+
+        calls = []
+        cache.load(paths[0], lambda: calls.append(0))
+        cache.load(paths[1], lambda: calls.append(1))
+        assert calls == [1]
+
+        # Values larger than the cache are not kept
+        path = Path(tmpdir, 'big.json')
+        path.write_text(f'{{"value": "{"x" * 2000}"}}')
+        cache.load(path, lambda: DM(path))
+        assert cache.size <= 1000
+
+    def test_evict_existing(self, tmpdir):
+        """Test that a directory already over max_size is reduced when opened"""
+        cache = DiskCache(Path(tmpdir, 'cache'))
+        paths = []
+        for i in range(4):
+            path = Path(tmpdir, f'model{i}.json')
+            path.write_text(f'{{"value": "{i}{"x" * 300}"}}')
+            paths.append(path)
+            cache.load(path, lambda: DM(path))
+        assert cache.size > 1000
+
+        # Opening the directory with a lower max_size removes the oldest entries
+        cache = DiskCache(Path(tmpdir, 'cache'), max_size=1000)
+        assert 0 < cache.size <= 1000
+        calls = []
+        cache.load(paths[0], lambda: calls.append(0))
+        cache.load(paths[3], lambda: calls.append(3))
+        assert calls == [0]
+
+    def test_DataModelDict(self, tmpdir):
+        """Test loading with a cache"""
+        path = Path(tmpdir, 'model.json')
+        path.write_text(self.content)
+        cachedir = Path(tmpdir, 'cache')
+        for cls in [DM, CompactDataModelDict]:
+            for i in range(2):
+                model = cls(path, cache=cachedir)
+                assert model == DM(self.content)
+                assert isinstance(model['root'], cls)
+        assert len(list(cachedir.glob('*.pkl'))) == 2
+
+        # Content that is not a file path is not cached
+        assert DM(self.content, cache=cachedir) == DM(self.content)
+        assert len(list(cachedir.glob('*.pkl'))) == 2
+
+        # XML converters are cached by name, and unnamed ones are not cached
+        path = Path(tmpdir, 'model.xml')
+        path.write_text('<root><id>007</id><value>1.5</value></root>')
+        for i in range(2):
+            model = DM(path, cache=cachedir, types={'id': str, 'value': Decimal})
+            assert model['root']['id'] == '007'
+            assert model['root']['value'] == Decimal('1.5')
+        assert len(list(cachedir.glob('*.pkl'))) == 3
+        model = DM(path, cache=cachedir, types={'id': lambda v: v + '!'})
+        assert model['root']['id'] == '007!'
+        assert len(list(cachedir.glob('*.pkl'))) == 3
@@ -0,0 +1,154 @@
+# coding: utf-8
+
+# Standard Python libraries
+import os
+from pathlib import Path
+
+import pytest
+
+from DataModelDict import DataModelDict as DM
+from DataModelDict import CompactDataModelDict
+from DataModelDict import MemoryCache, ReadOnlyView
+
+class Test_MemoryCache():
+
+    @property
+    def content(self):
+        """str: JSON content for testing"""
+        return '{"root": {"name": "demo", "value": [1, 2.5, null], "unit": [{"a": "m"}, {"a": "s"}]}}'
+
+    def test_load(self, tmpdir):
+        """Test that entries are used only while files are unchanged"""
+        cache = MemoryCache()
+        path = Path(tmpdir, 'model.json')
+        path.write_text(self.content)
+        calls = []
+        def parse():
+            calls.append(1)
+            return DM(path)
+
+        # First load parses, second uses the entry
+        assert cache.load(path, parse) == DM(self.content)
+        assert cache.load(str(path), parse) == DM(self.content)
+        assert len(calls) == 1
+
+        # Copies are independent
+        model = cache.load(path, parse)
+        model['root']['unit'][0]['a'] = 'changed'
+        model['root']['value'].append(3)
+        assert cache.load(path, parse) == DM(self.content)
+        assert isinstance(model['root']['unit'][1], DM)
+
+        # Touched or changed files are parsed again
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        cache.load(path, parse)
+        assert len(calls) == 2
+        path.write_text(self.content.replace('demo', 'changed'))
+        assert cache.load(path, parse)['root']['name'] == 'changed'
+        assert len(calls) == 3
+
+        # Options are cached separately
+        cache.load(path, parse, options=('other',))
+        assert len(calls) == 4
+        assert cache.stats == {'hits': 3, 'misses': 4, 'evictions': 0,
+                               'entries': 2, 'size': cache.size}
+
+        # Values that cannot be flattened are deep copied
+        shared = DM([('a', DM([('b', 1)]))])
+        shared['c'] = shared['a']
+        copied = cache.load(path, lambda: shared, options=('shared',))
+        assert copied == shared and copied['a'] is not shared['a']
+        assert copied['a'] is copied['c']
+
+        cache.clear()
+        assert len(cache) == 0 and cache.size == 0
+
+    def test_evict(self, tmpdir):
+        """Test that the least recently used entries are removed"""
+        paths = []
+        for i in range(4):
+            path = Path(tmpdir, f'model{i}.json')
+            path.write_text(f'{{"value": "{i}{"x" * 300}"}}')
+            paths.append(path)
+
+        for cache in [MemoryCache(max_entries=2),
+                      MemoryCache(max_entries=None, max_size=5000)]:
+            for path in paths:
+                # Mark the first entry as used each time
+                cache.load(path)
+                cache.load(paths[0])
+                assert len(cache) <= 2
+            assert cache.stats['evictions'] == 2
+
+            calls = []
+            cache.load(paths[0], lambda: calls.append(0))
+            cache.load(paths[1], lambda: calls.append(1))
+            assert calls == [1]
+
+    def test_readonly(self, tmpdir):
+        """Test read-only views"""
+        cache = MemoryCache()
+        path = Path(tmpdir, 'model.json')
+        path.write_text(self.content)
+        for cls in [DM, CompactDataModelDict]:
+            view = cache.load(path, lambda: cls(path), options=(cls,), readonly=True)
+            assert isinstance(view, ReadOnlyView)
+            assert view == DM(self.content)
+            assert view == cache.load(path, options=(cls,), readonly=True)
+
+            # Values and search results are read-only
+            root = view['root']
+            assert isinstance(root, ReadOnlyView)
+            assert root['value'] == (1, 2.5, None)
+            assert isinstance(root['unit'][0], ReadOnlyView)
+            assert root.find('unit', yes={'a': 's'}) == {'a': 's'}
+            assert isinstance(root.finds('a'), tuple)
+            assert [unit['a'] for unit in root.iteraslist('unit')] == ['m', 's']
+            assert view[['root', 'name']] == 'demo'
+            assert [(str(p), v['a']) for p, v in root.select('unit[*]')] == [('unit[0]', 'm'), ('unit[1]', 's')]
+            assert isinstance(next(root.select('unit[*]'))[1], ReadOnlyView)
+            assert root.path('name') == ['name']
+
+            # Paths are plain lists, not cursors into the cached element
+            assert type(root.path('name')) is list
+            assert all(type(p) is list for p in root.paths('a'))
+            assert all(type(p) is list for p in root.iterpaths('a'))
+            assert all(type(p) is list for p in root.paths_many({'a': None})['a'])
+            with pytest.raises(AttributeError):
+                root.path('name').value = 'changed'
+            assert DM(view.json()) == DM(self.content)
+            with pytest.raises(TypeError):
+                root['name'] = 'changed'
+            with pytest.raises(AttributeError):
+                root.append('name', 'changed')
+            with pytest.raises(AttributeError):
+                root['unit'].append(3)
+
+            # Copies can be changed
+            model = view.copy()
+            assert isinstance(model, cls)
+            model['root']['name'] = 'changed'
+            assert view['root']['name'] == 'demo'
+
+    def test_DataModelDict(self, tmpdir):
+        """Test loading with a cache"""
+        path = Path(tmpdir, 'model.json')
+        path.write_text(self.content)
+        cache = MemoryCache()
+        for cls in [DM, CompactDataModelDict]:
+            for i in range(2):
+                model = cls(path, cache=cache)
+                assert model == DM(self.content)
+                assert isinstance(model['root'], cls)
+        assert cache.stats['hits'] == 2 and cache.stats['misses'] == 2
+
+        # Files loaded by the cache itself share entries with load()
+        view = cache.load(path, readonly=True)
+        assert isinstance(view, ReadOnlyView) and view == DM(self.content)
+        assert cache.stats['hits'] == 3 and cache.stats['misses'] == 2
+        path = Path(tmpdir, 'model2.json')
+        path.write_text(self.content)
+        cache.load(path)
+        assert DM(path, cache=cache) == DM(self.content)
+        assert cache.stats['hits'] == 4 and cache.stats['misses'] == 3